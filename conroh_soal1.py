@@ -4,8 +4,30 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import math
-from datetime import datetime, timedelta
+import json
+import uuid
+import time
+
+from optimasi.antrian import calculate_queue_metrics, calculate_queue_metrics_batch, capacity_plan
+from optimasi.cache import cache_stats, memoize
+from optimasi.data import BAHAN_BAKU, DEFAULT_ORDER_COST, PRODUCTION_LINE, PRODUCTS
+from optimasi.downsample import update_line_figure
+from optimasi.indeks import build_material_index
+from optimasi.jaringan import jackson_network, serial_routing, server_variants, station_table
+from optimasi.katalog import build_catalog
+from optimasi.pekerjaan import DONE, FAILED, JobManager, QueueFull
+from optimasi.pengadaan import DEFAULT_MAJOR_COST, DEFAULT_MINOR_COST, joint_inventory
+from optimasi.penyimpanan import ResultStore, configure_store
+from optimasi.penjadwalan import gantt_segments, jobs_from_plan, schedule_jobs, setup_matrix
+from optimasi.peramalan import reorder_schedule
+from optimasi.persediaan import calculate_eoq_batch
+from optimasi.produksi import optimize_production, optimize_production_plan
+from optimasi.profiling import Profiler
+from optimasi.riwayat import OrderHistory, inventory_from_history, monthly_efficiency, queue_from_history
+from optimasi.sensitivitas import run_sweep, sweep_slice
+from optimasi.simulasi_antrian import simulate_queue
+from optimasi.simulasi_persediaan import simulate_inventory
+from optimasi.terintegrasi import build_integrated_graph, material_plan, strategic_recommendations
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -25,111 +47,207 @@ menu = st.sidebar.selectbox(
     ["Dashboard Utama", "Optimasi Produksi", "Model Persediaan (EOQ & ROP)", "Model Antrian", "Analisis Terintegrasi"]
 )
 
-# Data produk dan bahan baku
-PRODUCTS = {
-    "Kecap Manis": {
-        "bahan_baku": {"Kedelai": 0.3, "Gula Aren": 0.2, "Garam": 0.05, "Air": 0.4},
-        "harga_jual": 15000,
-        "biaya_produksi": 8000,
-        "waktu_produksi": 2.5  # jam per unit
-    },
-    "Tepung Bogasari": {
-        "bahan_baku": {"Gandum": 0.8, "Pengawet": 0.02, "Vitamin": 0.01},
-        "harga_jual": 12000,
-        "biaya_produksi": 7000,
-        "waktu_produksi": 1.5
-    },
-    "Bumbu Racik": {
-        "bahan_baku": {"Bawang Merah": 0.25, "Bawang Putih": 0.15, "Cabai": 0.2, "Garam": 0.1, "Rempah": 0.3},
-        "harga_jual": 8000,
-        "biaya_produksi": 4500,
-        "waktu_produksi": 1.0
-    }
-}
+# Panel profiling tersembunyi: hanya muncul bila URL memuat ?profiling=1
+profiling_panel = st.sidebar.expander("🔬 Profiling", expanded=True) if st.query_params.get("profiling") == "1" else None
+if profiling_panel is not None:
+    with profiling_panel:
+        profiling_enabled = st.checkbox("Aktifkan profiling", value=True)
+        profiling_memory = st.checkbox("Snapshot memori (tracemalloc)", value=False)
+        profiling_cprofile = st.checkbox("cProfile", value=False)
+    profiler = Profiler(profiling_enabled, memory=profiling_memory, cprofile=profiling_cprofile,
+                        root=f"rerun: {menu}")
+else:
+    profiler = Profiler(enabled=False)
 
-BAHAN_BAKU = {
-    "Kedelai": {"harga": 8000, "lead_time": 7, "holding_cost": 0.15},
-    "Gula Aren": {"harga": 12000, "lead_time": 5, "holding_cost": 0.12},
-    "Garam": {"harga": 3000, "lead_time": 3, "holding_cost": 0.08},
-    "Air": {"harga": 500, "lead_time": 1, "holding_cost": 0.05},
-    "Gandum": {"harga": 6000, "lead_time": 14, "holding_cost": 0.18},
-    "Pengawet": {"harga": 25000, "lead_time": 21, "holding_cost": 0.25},
-    "Vitamin": {"harga": 50000, "lead_time": 30, "holding_cost": 0.30},
-    "Bawang Merah": {"harga": 15000, "lead_time": 2, "holding_cost": 0.20},
-    "Bawang Putih": {"harga": 18000, "lead_time": 3, "holding_cost": 0.22},
-    "Cabai": {"harga": 20000, "lead_time": 2, "holding_cost": 0.25},
-    "Rempah": {"harga": 35000, "lead_time": 10, "holding_cost": 0.28}
-}
+@st.cache_resource
+def shared_material_index():
+    """Indeks bahan/produk read-only, dibangun sekali per proses dan dibagi semua sesi"""
+    return build_material_index(PRODUCTS, BAHAN_BAKU)
 
-def calculate_eoq(demand, order_cost, holding_cost, unit_cost):
-    """Menghitung Economic Order Quantity"""
-    eoq = math.sqrt((2 * demand * order_cost) / (holding_cost * unit_cost))
-    return eoq
-
-def calculate_rop(demand_rate, lead_time, safety_stock=0):
-    """Menghitung Reorder Point"""
-    rop = (demand_rate * lead_time) + safety_stock
-    return rop
-
-def calculate_queue_metrics(arrival_rate, service_rate, servers=1):
-    """Menghitung metrik model antrian M/M/1 atau M/M/c"""
-    if servers == 1:
-        # M/M/1 model
-        rho = arrival_rate / service_rate
-        if rho >= 1:
-            return None  # Sistem tidak stabil
-        
-        l_q = (rho ** 2) / (1 - rho)  # Panjang antrian
-        l_s = rho / (1 - rho)  # Jumlah pelanggan dalam sistem
-        w_q = l_q / arrival_rate  # Waktu tunggu dalam antrian
-        w_s = l_s / arrival_rate  # Waktu tunggu dalam sistem
-        
-        return {
-            "utilization": rho,
-            "avg_queue_length": l_q,
-            "avg_system_length": l_s,
-            "avg_wait_time": w_q,
-            "avg_system_time": w_s
-        }
+material_index = shared_material_index()
+
+@st.cache_resource
+def result_store():
+    """Penyimpanan hasil di disk ($OPTIMASI_STORE_DIR), bertahan melewati restart server"""
+    return configure_store(ResultStore())
+
+@st.cache_resource
+def background_jobs():
+    """Pool proses bersama semua sesi untuk perhitungan berat (simulasi, kubus sensitivitas)"""
+    return JobManager(store=result_store())
+
+job_manager = background_jobs()
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+# Sesi yang lama tidak aktif (browser ditutup) melepas pekerjaan dan hasilnya
+job_manager.touch(session_id)
+job_manager.release_idle()
+
+def submit_job(func, *args, **kwargs):
+    """Kirim pekerjaan latar belakang; None (dengan peringatan) bila antrean bersama sedang penuh"""
+    try:
+        return job_manager.submit(func, *args, **kwargs)
+    except QueueFull:
+        st.warning("⏳ Server sedang sibuk (antrean pekerjaan penuh). Ubah input atau muat ulang "
+                   "halaman sebentar lagi untuk mencoba kembali.")
+        return None
+
+def job_ready(job, message, wait=0.3):
+    """True bila pekerjaan latar belakang selesai; selain itu tampilkan progres yang diperbarui otomatis"""
+    if job is None:
+        return False
+    if job.wait(wait):
+        if job.status == FAILED:
+            st.error(f"{message} gagal: {job.error}")
+        return job.status == DONE
+
+    @st.fragment(run_every=0.5)
+    def job_progress():
+        job_manager.poll(job)
+        job_manager.touch(session_id)
+        if job.finished:
+            st.rerun()  # rerun penuh agar hasil ditampilkan di tempatnya
+        st.progress(job.fraction or 0.0, text=f"⏳ {message} ({job.status}, {time.time() - job.submitted:.0f} detik)")
+
+    job_progress()
+    return False
+
+@memoize(maxsize=8)
+def build_product_table(products):
+    """Tabel ringkasan harga, biaya, profit dan waktu produksi per produk"""
+    return pd.DataFrame(build_catalog(products, BAHAN_BAKU).product_table())
+
+def profit_trace(financial):
+    """Grafik 1: Profit Analysis"""
+    return go.Bar(x=["Revenue", "Cost", "Profit"], 
+                  y=[financial["monthly_revenue"], 
+                     financial["monthly_cost"], 
+                     financial["monthly_profit"]],
+                  name="Financial",
+                  marker_color=['green', 'red', 'blue'])
+
+def inventory_traces(material):
+    """Grafik 2: Inventory Level (contoh untuk bahan utama)"""
+    materials = material["materials"]
+    if not len(materials["Bahan Baku"]):
+        return []
+    eoq = materials["EOQ (kg)"][0]
+    annual = materials["Kebutuhan Tahunan (kg)"][0]
+    days = list(range(1, 31))
+    inventory_sim = [max(0, eoq - (i * annual / 365)) for i in days]
+    return [
+        go.Scatter(x=days, y=inventory_sim, mode='lines+markers', 
+                   name="Inventory Level", line=dict(color='orange')),
+        # Add ROP line
+        go.Scatter(x=days, y=[materials["ROP (kg)"][0]] * len(days), 
+                   mode='lines', name="ROP", line=dict(dash='dash', color='red'))
+    ]
+
+def queue_trace(queue_metrics):
+    """Grafik 3: Queue Performance - Bar Chart"""
+    if not queue_metrics:
+        return None
+    queue_data = ['Utilisasi', 'Waktu Tunggu', 'Panjang Antrian']
+    queue_values = [
+        queue_metrics['utilization'] * 100,
+        queue_metrics.get('avg_wait_time', queue_metrics.get('avg_system_time', 0)) * 10,  # Scale for visibility
+        queue_metrics.get('avg_queue_length', queue_metrics.get('avg_system_length', 0)) * 20  # Scale for visibility
+    ]
+    return go.Bar(x=queue_data, y=queue_values, name="Queue Metrics",
+                  marker_color=['blue', 'orange', 'green'])
+
+def efficiency_traces(overall_efficiency, efficiency_history):
+    """Grafik 4: Overall Efficiency Trend (dari data historis order bila tersedia)"""
+    if efficiency_history and efficiency_history["month"]:
+        months = efficiency_history["month"]
+        efficiency_trend = efficiency_history["efficiency"]
     else:
-        # M/M/c model (simplified)
-        rho = arrival_rate / (servers * service_rate)
-        if rho >= 1:
-            return None
-        
-        # Simplified calculation for M/M/c
-        l_s = arrival_rate / (service_rate - arrival_rate/servers)
-        w_s = l_s / arrival_rate
-        
-        return {
-            "utilization": rho,
-            "avg_system_length": l_s,
-            "avg_system_time": w_s,
-            "servers": servers
-        }
-
-def optimize_production(products, constraints):
-    """Optimasi produksi sederhana menggunakan profit per unit waktu"""
-    results = []
-    
-    for product, data in products.items():
-        profit_per_unit = data["harga_jual"] - data["biaya_produksi"]
-        profit_per_hour = profit_per_unit / data["waktu_produksi"]
-        
-        results.append({
-            "Produk": product,
-            "Profit per Unit": profit_per_unit,
-            "Waktu Produksi (jam)": data["waktu_produksi"],
-            "Profit per Jam": profit_per_hour,
-            "Prioritas": len(results) + 1
-        })
-    
-    # Sorting berdasarkan profit per jam
-    results.sort(key=lambda x: x["Profit per Jam"], reverse=True)
-    for i, result in enumerate(results):
-        result["Prioritas"] = i + 1
-    
-    return results
+        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
+        efficiency_trend = [overall_efficiency] * len(months)
+    return [
+        go.Scatter(x=months, y=efficiency_trend, mode='lines+markers',
+                   name="Efficiency Trend", line=dict(color='purple')),
+        # Add target line
+        go.Scatter(x=months, y=[80] * len(months), mode='lines',
+                   name="Target (80%)", line=dict(dash='dash', color='red'))
+    ]
+
+def integrated_figure(profit, inventory, queue, efficiency):
+    """Menyusun trace keempat panel menjadi satu grafik gabungan"""
+    fig_integrated = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=["Profit vs Biaya", "Level Persediaan", "Kinerja Antrian", "Trend Efisiensi"],
+        specs=[[{"secondary_y": False}, {"secondary_y": False}],
+               [{"secondary_y": False}, {"secondary_y": False}]]
+    )
+    fig_integrated.add_trace(profit, row=1, col=1)
+    for trace in inventory:
+        fig_integrated.add_trace(trace, row=1, col=2)
+    if queue is not None:
+        fig_integrated.add_trace(queue, row=2, col=1)
+    for trace in efficiency:
+        fig_integrated.add_trace(trace, row=2, col=2)
+    fig_integrated.update_layout(height=600, showlegend=True, title_text="Dashboard Analisis Terintegrasi")
+    return fig_integrated
+
+def utilization_gauge(queue_metrics):
+    if not queue_metrics:
+        return None
+    fig_gauge1 = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=queue_metrics['utilization']*100,
+        title={'text': "Utilisasi Sistem (%)"},
+        gauge={'axis': {'range': [None, 100]},
+               'bar': {'color': "darkblue"},
+               'steps': [{'range': [0, 50], 'color': "lightgray"},
+                        {'range': [50, 80], 'color': "gray"}],
+               'threshold': {'line': {'color': "red", 'width': 4},
+                           'thickness': 0.75, 'value': 90}}
+    ))
+    fig_gauge1.update_layout(height=300)
+    return fig_gauge1
+
+def efficiency_gauge(overall_efficiency):
+    fig_gauge2 = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=overall_efficiency,
+        delta={'reference': 80},
+        title={'text': "Efisiensi Keseluruhan (%)"},
+        gauge={'axis': {'range': [None, 100]},
+               'bar': {'color': "green"},
+               'steps': [{'range': [0, 60], 'color': "lightgray"},
+                        {'range': [60, 80], 'color': "yellow"}],
+               'threshold': {'line': {'color': "red", 'width': 4},
+                           'thickness': 0.75, 'value': 90}}
+    ))
+    fig_gauge2.update_layout(height=300)
+    return fig_gauge2
+
+# Sumbu kubus sensitivitas persediaan (tetap, agar kubus dapat dipakai ulang antar input)
+SWEEP_AXES = {
+    "demand": ("Permintaan Tahunan (kg)", np.linspace(1000, 200000, 40)),
+    "order_cost": ("Biaya Pemesanan (Rp)", np.linspace(10000, 1000000, 40)),
+    "holding_cost": ("Biaya Simpan (%/tahun)", np.linspace(0.05, 0.40, 8)),
+    "lead_time": ("Lead Time (hari)", np.arange(1, 31)),
+}
+SWEEP_METRICS = {"Total Cost (Rp)": "total_cost", "EOQ (kg)": "eoq", "ROP (kg)": "rop",
+                 "Frekuensi Pesan (kali/tahun)": "order_frequency"}
+
+def inventory_sweep_job(unit_cost):
+    """Kubus EOQ permintaan x biaya pesan x biaya simpan x lead time untuk satu harga bahan (latar belakang)"""
+    return submit_job(run_sweep, "eoq", {name: values for name, (_, values) in SWEEP_AXES.items()},
+                      fixed={"unit_cost": unit_cost}, workers=1, owner=(session_id, "kubus sensitivitas"),
+                      label=f"Kubus sensitivitas (Rp {unit_cost:,.0f}/kg)")
+
+# Node tampilan graf analisis terintegrasi: nama -> (fungsi, nama input)
+DASHBOARD_NODES = {
+    "trace_profit": (profit_trace, ("financial",)),
+    "trace_inventory": (inventory_traces, ("material",)),
+    "trace_queue": (queue_trace, ("queue",)),
+    "trace_efficiency": (efficiency_traces, ("efficiency", "efficiency_history")),
+    "fig_integrated": (integrated_figure, ("trace_profit", "trace_inventory", "trace_queue", "trace_efficiency")),
+    "gauge_utilization": (utilization_gauge, ("queue",)),
+    "gauge_efficiency": (efficiency_gauge, ("efficiency",)),
+}
 
 # DASHBOARD UTAMA
 if menu == "Dashboard Utama":
@@ -140,23 +258,16 @@ if menu == "Dashboard Utama":
     with col2:
         st.metric("Total Bahan Baku", len(BAHAN_BAKU))
     with col3:
-        total_profit = sum([v["harga_jual"] - v["biaya_produksi"] for v in PRODUCTS.values()])
-        st.metric("Total Profit Potensial", f"Rp {total_profit:,}")
+        total_profit = material_index.products["unit_profit"].sum()
+        st.metric("Total Profit Potensial", f"Rp {total_profit:,.0f}")
     
     st.subheader("📈 Overview Produk")
     
     # Membuat dataframe untuk visualisasi
-    df_products = pd.DataFrame([
-        {
-            "Produk": k,
-            "Harga Jual": v["harga_jual"],
-            "Biaya Produksi": v["biaya_produksi"],
-            "Profit": v["harga_jual"] - v["biaya_produksi"],
-            "Waktu Produksi": v["waktu_produksi"]
-        }
-        for k, v in PRODUCTS.items()
-    ])
+    profiler.stage("tabel produk")
+    df_products = build_product_table(PRODUCTS)
     
+    profiler.stage("grafik produk")
     col1, col2 = st.columns(2)
     
     with col1:
@@ -168,10 +279,19 @@ if menu == "Dashboard Utama":
         fig2 = px.pie(df_products, values="Profit", names="Produk", 
                      title="Distribusi Profit per Produk")
         st.plotly_chart(fig2, use_container_width=True)
+    
+    profiler.stage("indeks bahan baku")
+    with st.expander("🧾 Indeks Bahan Baku & Dampak Perubahan"):
+        st.dataframe(pd.DataFrame(material_index.material_table()), use_container_width=True, hide_index=True)
+        changed_materials = st.multiselect("Bahan yang berubah (harga/lead time):", list(BAHAN_BAKU.keys()))
+        if changed_materials:
+            affected = material_index.affected_products(changed_materials)
+            st.write(f"Produk terdampak: **{', '.join(affected)}**")
 
 # OPTIMASI PRODUKSI  
 elif menu == "Optimasi Produksi":
     st.header("🎯 Optimasi Produksi")
+    profiler.stage("input")
     
     st.subheader("Parameter Optimasi")
     col1, col2 = st.columns(2)
@@ -179,71 +299,137 @@ elif menu == "Optimasi Produksi":
     with col1:
         kapasitas_harian = st.number_input("Kapasitas Produksi Harian (jam)", value=16, min_value=8, max_value=24)
         biaya_setup = st.number_input("Biaya Setup per Produk (Rp)", value=500000, min_value=0)
+        periode = st.number_input("Periode Perencanaan (hari)", value=30, min_value=1, max_value=365)
     
     with col2:
         target_profit = st.number_input("Target Profit Harian (Rp)", value=10000000, min_value=0)
         efisiensi_mesin = st.slider("Efisiensi Mesin (%)", 60, 100, 85)
     
-    # Hitung optimasi
-    optimization_results = optimize_production(PRODUCTS, {
+    with st.expander("Batasan Stok Bahan Baku & Permintaan Minimum"):
+        col1, col2 = st.columns(2)
+        with col1:
+            df_stok = st.data_editor(
+                pd.DataFrame({"Bahan Baku": list(BAHAN_BAKU.keys()), "Stok Tersedia (kg)": 250.0}),
+                disabled=["Bahan Baku"], hide_index=True, use_container_width=True
+            )
+        with col2:
+            df_min = st.data_editor(
+                pd.DataFrame({"Produk": list(PRODUCTS.keys()), "Permintaan Minimum (unit)": 0}),
+                disabled=["Produk"], hide_index=True, use_container_width=True
+            )
+    
+    production_constraints = {
         "kapasitas": kapasitas_harian,
-        "efisiensi": efisiensi_mesin / 100
-    })
+        "efisiensi": efisiensi_mesin / 100,
+        "periode": periode,
+        "biaya_setup": biaya_setup,
+        "stok_bahan": dict(zip(df_stok["Bahan Baku"], df_stok["Stok Tersedia (kg)"])),
+        "permintaan_minimum": dict(zip(df_min["Produk"], df_min["Permintaan Minimum (unit)"]))
+    }
+    
+    profiler.stage("ranking produk")
+    # Hitung optimasi
+    optimization_results = optimize_production(PRODUCTS, production_constraints)
     
     st.subheader("📊 Hasil Optimasi Produksi")
     df_opt = pd.DataFrame(optimization_results)
     st.dataframe(df_opt, use_container_width=True)
     
+    profiler.stage("grafik prioritas")
     # Visualisasi prioritas produksi
     fig3 = px.bar(df_opt, x="Produk", y="Profit per Jam", 
                  color="Prioritas", title="Prioritas Produksi Berdasarkan Profit per Jam")
     st.plotly_chart(fig3, use_container_width=True)
     
-    # Simulasi produksi optimal
+    # Simulasi produksi optimal (program linear bilangan bulat)
     st.subheader("🔧 Simulasi Produksi Optimal")
     
-    total_waktu = 0
-    total_profit = 0
-    produksi_plan = []
+    profiler.stage("MILP rencana produksi")
+    production_plan = optimize_production_plan(PRODUCTS, BAHAN_BAKU, production_constraints)
     
-    for result in optimization_results:
-        produk = result["Produk"]
-        waktu_per_unit = PRODUCTS[produk]["waktu_produksi"]
-        profit_per_unit = result["Profit per Unit"]
-        
-        # Hitung berapa unit yang bisa diproduksi
-        sisa_waktu = kapasitas_harian - total_waktu
-        unit_maksimal = int(sisa_waktu / waktu_per_unit) if sisa_waktu > 0 else 0
+    profiler.stage("render rencana")
+    if production_plan["status"] == "infeasible":
+        st.error("⚠️ Tidak ada rencana yang memenuhi permintaan minimum dengan kapasitas dan stok yang tersedia.")
+    elif not production_plan["plan"]:
+        st.warning("Tidak ada produk yang profitnya menutup biaya setup dalam periode ini.")
+    else:
+        if production_plan["status"] == "time_limit":
+            st.info(f"Batas waktu solver tercapai; solusi terbaik berada dalam {production_plan['gap']:.2%} dari optimum.")
         
-        if unit_maksimal > 0:
-            waktu_digunakan = unit_maksimal * waktu_per_unit
-            profit_dihasilkan = unit_maksimal * profit_per_unit
-            
-            produksi_plan.append({
-                "Produk": produk,
-                "Unit Diproduksi": unit_maksimal,
-                "Waktu Digunakan (jam)": waktu_digunakan,
-                "Profit Dihasilkan": profit_dihasilkan
-            })
-            
-            total_waktu += waktu_digunakan
-            total_profit += profit_dihasilkan
-    
-    if produksi_plan:
-        df_plan = pd.DataFrame(produksi_plan)
+        df_plan = pd.DataFrame(production_plan["plan"])
         st.dataframe(df_plan, use_container_width=True)
         
+        total_waktu = production_plan["total_waktu"]
+        total_profit = production_plan["total_profit"]
+        
         col1, col2, col3 = st.columns(3)
         with col1:
             st.metric("Total Waktu Terpakai", f"{total_waktu:.1f} jam")
         with col2:
-            st.metric("Efisiensi Waktu", f"{(total_waktu/kapasitas_harian)*100:.1f}%")
+            st.metric("Utilisasi Kapasitas Efektif", f"{(total_waktu/production_plan['kapasitas_efektif'])*100:.1f}%")
+        with col3:
+            st.metric("Total Profit", f"Rp {total_profit:,.0f}",
+                      delta=f"Rp {total_profit - target_profit * periode:,.0f} vs target")
+        
+        if production_plan["materials"]:
+            st.dataframe(pd.DataFrame(production_plan["materials"]), use_container_width=True)
+        
+        profiler.stage("penjadwalan mesin")
+        st.subheader("📅 Jadwal Produksi per Mesin")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            jumlah_mesin = st.number_input("Jumlah Mesin", value=3, min_value=1, max_value=50)
+        with col2:
+            ukuran_batch = st.number_input("Ukuran Batch (unit)", value=50, min_value=1)
+        with col3:
+            jam_setup = st.number_input("Waktu Setup Dasar (jam)", value=1.0, min_value=0.0, step=0.25)
+        
+        setup_hours, initial_setup = setup_matrix(PRODUCTS, BAHAN_BAKU, base_hours=jam_setup,
+                                                  min_hours=jam_setup / 4)
+        jobs = jobs_from_plan(production_plan["plan"], PRODUCTS, batch_units=ukuran_batch)
+        schedule = schedule_jobs(jobs, int(jumlah_mesin), setup_hours, initial_setup,
+                                 efficiency=efisiensi_mesin / 100, time_limit=0.5)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Makespan", f"{schedule['makespan']:.1f} jam",
+                      delta=f"{schedule['makespan'] / kapasitas_harian:.1f} hari kerja", delta_color="off")
+        with col2:
+            st.metric("Jumlah Setup", schedule["setups"],
+                      delta=f"Rp {schedule['setups'] * biaya_setup:,.0f}", delta_color="off")
         with col3:
-            st.metric("Total Profit", f"Rp {total_profit:,.0f}")
+            st.metric("Utilisasi Rata-rata Mesin", f"{schedule['utilization'].mean()*100:.1f}%")
+        if schedule["makespan"] > kapasitas_harian * periode:
+            st.warning("⚠️ Jadwal melebihi periode perencanaan; tambah mesin atau kurangi rencana produksi.")
+        
+        product_names = np.array(list(PRODUCTS))
+        segments = gantt_segments(schedule, jobs, hours_per_day=kapasitas_harian)
+        day_zero = pd.Timestamp.today().normalize()
+        df_gantt = pd.DataFrame({
+            "Mesin": [f"Mesin {k + 1}" for k in segments["machine"]],
+            "Kegiatan": np.where(segments["kind"] == "Setup", "Setup", product_names[segments["product"]]),
+            "Mulai": day_zero + pd.to_timedelta(segments["day"] * 24 + segments["start_hour"], unit="h"),
+            "Selesai": day_zero + pd.to_timedelta(segments["day"] * 24 + segments["end_hour"], unit="h"),
+        })
+        fig_gantt = px.timeline(df_gantt, x_start="Mulai", x_end="Selesai", y="Mesin", color="Kegiatan",
+                                title="Gantt Chart Jadwal Produksi")
+        fig_gantt.update_yaxes(categoryorder="category descending")
+        st.plotly_chart(fig_gantt, use_container_width=True)
+        
+        df_mesin = pd.DataFrame({
+            "Mesin": [f"Mesin {k + 1}" for k in range(int(jumlah_mesin))],
+            "Urutan Produk": [" → ".join(product_names[seq]) for seq in schedule["sequence"]],
+            "Waktu Produksi (jam)": schedule["processing"],
+            "Waktu Setup (jam)": schedule["setup_hours"],
+            "Selesai (jam)": schedule["load"],
+            "Utilisasi (%)": schedule["utilization"] * 100,
+        })
+        st.dataframe(df_mesin, use_container_width=True)
 
 # MODEL PERSEDIAAN (EOQ & ROP)
 elif menu == "Model Persediaan (EOQ & ROP)":
     st.header("📦 Model Persediaan - EOQ & ROP")
+    profiler.stage("input")
     
     # Pilih bahan baku
     selected_material = st.selectbox("Pilih Bahan Baku:", list(BAHAN_BAKU.keys()))
@@ -258,19 +444,26 @@ elif menu == "Model Persediaan (EOQ & ROP)":
     with col2:
         st.subheader("Parameter ROP")
         daily_demand = annual_demand / 365
-        lead_time = BAHAN_BAKU[selected_material]["lead_time"]
+        material_info = material_index.material(selected_material)
+        lead_time = material_info["lead_time"]
         safety_stock = st.number_input("Safety Stock (kg)", value=500, min_value=0)
+        demand_cv = st.slider("Variabilitas Permintaan Harian (%)", 0, 100, 0)
         
-        st.info(f"Lead Time: {lead_time} hari")
+        st.info(f"Lead Time: {lead_time:g} hari")
+        st.caption(f"Dipakai oleh: {', '.join(material_index.products_using(selected_material))}")
         st.info(f"Permintaan Harian: {daily_demand:.1f} kg")
     
+    profiler.stage("hitung EOQ/ROP")
     # Hitung EOQ dan ROP
-    unit_cost = BAHAN_BAKU[selected_material]["harga"]
-    holding_cost_rate = BAHAN_BAKU[selected_material]["holding_cost"]
+    unit_cost = material_info["harga"]
+    holding_cost_rate = material_info["holding_cost"]
     
-    eoq = calculate_eoq(annual_demand, order_cost, holding_cost_rate, unit_cost)
-    rop = calculate_rop(daily_demand, lead_time, safety_stock)
+    inventory = calculate_eoq_batch(annual_demand, order_cost, holding_cost_rate, unit_cost,
+                                    lead_time, safety_stock)
+    eoq = float(inventory["eoq"])
+    rop = float(inventory["rop"])
     
+    profiler.stage("render metrik")
     # Tampilkan hasil
     st.subheader("📊 Hasil Perhitungan")
     
@@ -280,50 +473,114 @@ elif menu == "Model Persediaan (EOQ & ROP)":
     with col2:
         st.metric("ROP", f"{rop:.0f} kg")
     with col3:
-        total_cost = (annual_demand/eoq) * order_cost + (eoq/2) * holding_cost_rate * unit_cost
+        total_cost = float(inventory["total_cost"])
         st.metric("Total Cost", f"Rp {total_cost:,.0f}")
     with col4:
-        order_frequency = annual_demand / eoq
+        order_frequency = float(inventory["order_frequency"])
         st.metric("Frekuensi Pesan", f"{order_frequency:.1f} kali/tahun")
     
     # Grafik inventory level
     st.subheader("📈 Grafik Level Persediaan")
     
-    days = np.arange(0, 365)
-    inventory_level = []
-    current_inventory = eoq
-    
-    for day in days:
-        current_inventory -= daily_demand
-        
-        # Reorder when reaching ROP
-        if current_inventory <= rop and day % (365/order_frequency) < lead_time:
-            current_inventory += eoq
-        
-        inventory_level.append(max(0, current_inventory))
-    
-    fig4 = go.Figure()
-    fig4.add_trace(go.Scatter(x=days, y=inventory_level, mode='lines', name='Level Persediaan'))
-    fig4.add_hline(y=rop, line_dash="dash", line_color="red", annotation_text=f"ROP: {rop:.0f} kg")
-    fig4.add_hline(y=safety_stock, line_dash="dot", line_color="orange", annotation_text=f"Safety Stock: {safety_stock} kg")
-    fig4.update_layout(title="Simulasi Level Persediaan Sepanjang Tahun", 
-                       xaxis_title="Hari", yaxis_title="Jumlah Persediaan (kg)")
-    st.plotly_chart(fig4, use_container_width=True)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        horizon_years = st.number_input("Horizon Simulasi (tahun)", value=1, min_value=1, max_value=10)
+    with col2:
+        resolution = st.selectbox("Resolusi Simulasi", ["Harian", "Per Jam"])
+    with col3:
+        render_method = st.selectbox("Downsampling Grafik", ["LTTB", "Min-Max", "Tanpa"])
+    
+    profiler.stage("simulasi persediaan")
+    # Simulasi kebijakan (s, Q): pesan EOQ saat posisi persediaan mencapai ROP,
+    # pesanan tiba setelah lead time
+    simulation_job = submit_job(
+        simulate_inventory,
+        daily_demand, eoq, rop, lead_time,
+        demand_std=daily_demand * demand_cv / 100,
+        years=horizon_years,
+        steps_per_day=24 if resolution == "Per Jam" else 1,
+        order_cost=order_cost, holding_cost=holding_cost_rate, unit_cost=unit_cost,
+        seed=0, owner=(session_id, "simulasi persediaan"), label="Simulasi persediaan"
+    )
+    if job_ready(simulation_job, "Simulasi persediaan"):
+        simulation = simulation_job.result
+        days = simulation["time"]
+        inventory_level = simulation["level"][0]
+    
+        profiler.stage("figure persediaan")
+        # Deret panjang (mis. per jam selama 10 tahun) di-downsample di server dan dikirim
+        # sebagai Scattergl (WebGL); objek figure dipakai ulang antar rerun
+        fig4 = update_line_figure(
+            st.session_state.get("inventory_figure"),
+            [{"x": days, "y": inventory_level, "mode": "lines", "name": "Level Persediaan"}],
+            method={"LTTB": "lttb", "Min-Max": "minmax", "Tanpa": "none"}[render_method],
+            title="Simulasi Level Persediaan (negatif = backorder)",
+            xaxis_title="Hari", yaxis_title="Jumlah Persediaan (kg)",
+            shapes=[], annotations=[]
+        )
+        fig4.add_hline(y=rop, line_dash="dash", line_color="red", annotation_text=f"ROP: {rop:.0f} kg")
+        fig4.add_hline(y=safety_stock, line_dash="dot", line_color="orange", annotation_text=f"Safety Stock: {safety_stock} kg")
+        st.session_state["inventory_figure"] = fig4
+        profiler.stage("plotly_chart persediaan")
+        st.plotly_chart(fig4, use_container_width=True)
+        st.caption(f"Titik dikirim ke browser: {len(fig4.data[0].x):,} dari {len(days):,}")
+    
+        profiler.stage("render metrik simulasi")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Hari Stockout", f"{int(simulation['stockout_days'][0])} hari")
+        with col2:
+            st.metric("Rata-rata Persediaan", f"{simulation['avg_inventory'][0]:,.0f} kg")
+        with col3:
+            st.metric("Jumlah Pesanan", f"{int(simulation['orders'][0])} kali")
+        with col4:
+            st.metric("Biaya Realisasi per Tahun", f"Rp {simulation['total_cost'][0] / horizon_years:,.0f}")
     
+    profiler.stage("sensitivitas EOQ")
     # Analisis sensitivitas
     st.subheader("🔍 Analisis Sensitivitas")
     
     demand_range = np.linspace(annual_demand * 0.5, annual_demand * 1.5, 10)
-    eoq_sensitivity = [calculate_eoq(d, order_cost, holding_cost_rate, unit_cost) for d in demand_range]
+    eoq_sensitivity = calculate_eoq_batch(demand_range, order_cost, holding_cost_rate, unit_cost)["eoq"]
     
     fig5 = px.line(x=demand_range, y=eoq_sensitivity, 
                    title="Sensitivitas EOQ terhadap Perubahan Permintaan",
                    labels={"x": "Permintaan Tahunan (kg)", "y": "EOQ (kg)"})
     st.plotly_chart(fig5, use_container_width=True)
+    
+    # Peta sensitivitas dari kubus grid yang dihitung sekali per bahan baku
+    st.subheader("🗺️ Peta Sensitivitas Multi-Parameter")
+    
+    col1, col2, col3 = st.columns(3)
+    axis_labels = {label: name for name, (label, _) in SWEEP_AXES.items()}
+    with col1:
+        sweep_metric = st.selectbox("Metrik", list(SWEEP_METRICS.keys()))
+    with col2:
+        row_label = st.selectbox("Sumbu Y", list(axis_labels.keys()), index=0)
+    with col3:
+        col_label = st.selectbox("Sumbu X", [label for label in axis_labels if label != row_label], index=0)
+    
+    profiler.stage("kubus sensitivitas")
+    cube_job = inventory_sweep_job(unit_cost)
+    if job_ready(cube_job, "Menghitung kubus sensitivitas"):
+        cube = cube_job.result
+        row_values, col_values, heat = sweep_slice(
+            cube, SWEEP_METRICS[sweep_metric], axis_labels[row_label], axis_labels[col_label],
+            demand=annual_demand, order_cost=order_cost, holding_cost=holding_cost_rate, lead_time=lead_time
+        )
+        profiler.stage("heatmap")
+        fig_heat = px.imshow(heat, x=col_values, y=row_values, aspect="auto", origin="lower",
+                             labels={"x": col_label, "y": row_label, "color": sweep_metric},
+                             color_continuous_scale="Viridis")
+        fig_heat.update_layout(title=f"{sweep_metric} (sumbu lain pada nilai input saat ini)")
+        st.plotly_chart(fig_heat, use_container_width=True)
+        st.caption(f"Kubus {' x '.join(str(n) for n in cube['shape'])} = {int(np.prod(cube['shape'])):,} skenario, "
+                   "dihitung sekali per bahan baku di latar belakang lalu diiris tanpa perhitungan ulang.")
 
 # MODEL ANTRIAN
 elif menu == "Model Antrian":
     st.header("⏳ Model Antrian")
+    profiler.stage("input")
     
     st.subheader("Simulasi Antrian Produksi")
     
@@ -332,13 +589,15 @@ elif menu == "Model Antrian":
     with col1:
         st.subheader("Parameter Kedatangan")
         arrival_rate = st.number_input("Tingkat Kedatangan Order (per jam)", value=8.0, min_value=0.1, step=0.1)
-        arrival_pattern = st.selectbox("Pola Kedatangan", ["Poisson", "Deterministik"])
+        arrival_pattern = st.selectbox("Pola Kedatangan", ["Poisson", "Deterministik", "Erlang"])
         
     with col2:
         st.subheader("Parameter Pelayanan")
         service_rate = st.number_input("Tingkat Pelayanan (per jam)", value=10.0, min_value=0.1, step=0.1)
-        num_servers = st.number_input("Jumlah Server/Mesin", value=1, min_value=1, max_value=10)
+        num_servers = st.number_input("Jumlah Server/Mesin", value=1, min_value=1, max_value=100)
+        service_pattern = st.selectbox("Pola Pelayanan", ["Eksponensial", "Deterministik", "Erlang"])
     
+    profiler.stage("metrik M/M/c")
     # Hitung metrik antrian
     queue_metrics = calculate_queue_metrics(arrival_rate, service_rate, num_servers)
     
@@ -356,34 +615,63 @@ elif menu == "Model Antrian":
         with col1:
             st.metric("Utilisasi Sistem", f"{queue_metrics['utilization']:.2%}")
         with col2:
-            if 'avg_queue_length' in queue_metrics:
-                st.metric("Panjang Antrian Rata-rata", f"{queue_metrics['avg_queue_length']:.2f}")
-            else:
-                st.metric("Panjang Sistem Rata-rata", f"{queue_metrics['avg_system_length']:.2f}")
+            st.metric("Panjang Antrian Rata-rata", f"{queue_metrics['avg_queue_length']:.2f}")
         with col3:
-            if 'avg_wait_time' in queue_metrics:
-                st.metric("Waktu Tunggu (jam)", f"{queue_metrics['avg_wait_time']:.2f}")
-            else:
-                st.metric("Waktu dalam Sistem (jam)", f"{queue_metrics['avg_system_time']:.2f}")
+            st.metric("Waktu Tunggu (jam)", f"{queue_metrics['avg_wait_time']:.2f}")
         with col4:
             cycle_time = 1/service_rate if service_rate > 0 else 0
             st.metric("Cycle Time (jam)", f"{cycle_time:.2f}")
         
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Probabilitas Menunggu", f"{queue_metrics['prob_wait']:.2%}")
+        with col2:
+            st.metric("Probabilitas Sistem Kosong", f"{queue_metrics['prob_empty']:.2%}")
+        with col3:
+            st.metric("Waktu dalam Sistem (jam)", f"{queue_metrics['avg_system_time']:.2f}")
+        
+        # Validasi rumus analitik M/M/c dengan simulasi G/G/c
+        st.subheader("🧪 Validasi dengan Simulasi")
+        
+        profiler.stage("simulasi G/G/c")
+        simulation_job = submit_job(
+            simulate_queue, arrival_rate, service_rate, num_servers,
+            arrival_pattern=arrival_pattern, service_pattern=service_pattern,
+            n_jobs=20000, replications=30, seed=0,
+            owner=(session_id, "simulasi antrian"), label="Simulasi antrian G/G/c"
+        )
+        if job_ready(simulation_job, "Simulasi antrian"):
+            simulation = simulation_job.result
+            sim_rows = [
+                ("Utilisasi", "utilization"),
+                ("Panjang Antrian", "avg_queue_length"),
+                ("Waktu Tunggu (jam)", "avg_wait_time"),
+                ("Waktu dalam Sistem (jam)", "avg_system_time"),
+                ("Probabilitas Menunggu", "prob_wait"),
+            ]
+            df_sim = pd.DataFrame([
+                {
+                    "Metrik": label,
+                    "Analitik (M/M/c)": queue_metrics[key],
+                    "Simulasi": simulation[key][0],
+                    "CI 95% Bawah": simulation[key][1],
+                    "CI 95% Atas": simulation[key][2],
+                }
+                for label, key in sim_rows
+            ])
+            st.dataframe(df_sim, use_container_width=True)
+            if arrival_pattern != "Poisson" or service_pattern != "Eksponensial":
+                st.caption("Rumus analitik mengasumsikan kedatangan Poisson dan layanan eksponensial; "
+                           "untuk pola lain gunakan hasil simulasi.")
+        
         # Grafik utilisasi vs waktu tunggu
         st.subheader("📈 Analisis Kinerja Antrian")
         
+        profiler.stage("grafik utilisasi")
         utilization_range = np.linspace(0.1, 0.95, 20)
-        wait_times = []
-        
-        for util in utilization_range:
-            temp_arrival = util * service_rate * num_servers
-            temp_metrics = calculate_queue_metrics(temp_arrival, service_rate, num_servers)
-            if temp_metrics and 'avg_wait_time' in temp_metrics:
-                wait_times.append(temp_metrics['avg_wait_time'])
-            elif temp_metrics and 'avg_system_time' in temp_metrics:
-                wait_times.append(temp_metrics['avg_system_time'])
-            else:
-                wait_times.append(float('inf'))
+        sweep_metrics = calculate_queue_metrics_batch(utilization_range * service_rate * num_servers,
+                                                      service_rate, num_servers)
+        wait_times = sweep_metrics['avg_wait_time']
         
         fig6 = px.line(x=utilization_range*100, y=wait_times,
                        title="Hubungan Utilisasi vs Waktu Tunggu",
@@ -402,69 +690,316 @@ elif menu == "Model Antrian":
         else:
             st.success("Utilisasi dalam rentang optimal.")
 
+    # Optimasi kapasitas: jumlah server dan laju pelayanan berbiaya minimum
+    st.subheader("🎯 Optimasi Kapasitas Biaya Minimum")
+    profiler.stage("optimasi kapasitas")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        machine_cost = st.number_input("Biaya Mesin per Server (Rp/jam)", value=50_000, min_value=0, step=5_000)
+        waiting_cost = st.number_input("Biaya Tunggu (Rp per order per jam)", value=100_000, min_value=0,
+                                       step=10_000)
+    with col2:
+        service_target = st.selectbox("Syarat Layanan", ["Tanpa syarat", "Waktu tunggu maksimum",
+                                                         "Probabilitas menunggu maksimum"])
+        max_wait = max_prob_wait = None
+        if service_target == "Waktu tunggu maksimum":
+            max_wait = st.slider("Waktu Tunggu Maksimum (menit)", 1, 120, 15) / 60
+        elif service_target == "Probabilitas menunggu maksimum":
+            max_prob_wait = st.slider("Probabilitas Menunggu Maksimum (%)", 1, 99, 20) / 100
+    with col3:
+        mu_limit = float(max(50.0, 5 * service_rate))
+        mu_range = st.slider("Rentang Laju Pelayanan per Server (per jam)", 0.1, mu_limit,
+                             (max(0.1, service_rate / 2), min(mu_limit, service_rate * 2)))
+        cost_elasticity = st.slider("Elastisitas Biaya Mesin terhadap Laju", 0.0, 2.0, 1.0, 0.1,
+                                    help="Biaya server = biaya mesin x (laju / laju saat ini)^elastisitas")
+
+    profile_mode = st.radio("Profil Kedatangan", ["Konstan", "Mingguan per jam"], horizontal=True)
+    if profile_mode == "Mingguan per jam":
+        col1, col2 = st.columns(2)
+        with col1:
+            daily_variation = st.slider("Variasi Harian (%)", 0, 95, 50) / 100
+        with col2:
+            weekend_load = st.slider("Beban Akhir Pekan (%)", 0, 150, 60) / 100
+        hours = np.arange(168)
+        # Puncak pukul 14.00, Sabtu-Minggu dengan beban relatif weekend_load
+        arrival_profile = (arrival_rate * (1 + daily_variation * np.sin(2 * np.pi * (hours % 24 - 8) / 24))
+                           * np.where(hours // 24 < 5, 1.0, weekend_load))
+    else:
+        arrival_profile = np.array([arrival_rate])
+
+    candidate_rates = np.linspace(mu_range[0], mu_range[1], 41)
+    candidate_costs = machine_cost * (candidate_rates / service_rate) ** cost_elasticity
+    plan = capacity_plan(arrival_profile, candidate_rates, candidate_costs, waiting_cost,
+                         max_wait=max_wait, max_prob_wait=max_prob_wait)
+    common = plan["common"]
+
+    if common["service_rate"] is None:
+        st.error("Tidak ada kombinasi laju pelayanan dan jumlah server yang memenuhi syarat layanan.")
+    elif profile_mode == "Konstan":
+        optimal_cost = common["total"]
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Laju Pelayanan Optimal (per jam)", f"{common['service_rate']:.2f}")
+        with col2:
+            st.metric("Jumlah Server Optimal", f"{int(common['servers'][0])}")
+        with col3:
+            st.metric("Biaya Total (Rp/jam)", f"Rp {optimal_cost:,.0f}")
+        with col4:
+            st.metric("Waktu Tunggu (menit)", f"{common['avg_wait_time'][0] * 60:.1f}",
+                      delta=f"P(menunggu) {common['prob_wait'][0]:.1%}", delta_color="off")
+
+        grid = plan["grid"]
+        fig_capacity = go.Figure()
+        fig_capacity.add_trace(go.Scatter(x=candidate_rates, y=grid["total_cost"][0], mode="lines",
+                                          name="Biaya Total"))
+        fig_capacity.add_trace(go.Scatter(x=candidate_rates, y=grid["server_cost"][0], mode="lines",
+                                          name="Biaya Mesin", line=dict(dash="dot")))
+        fig_capacity.add_trace(go.Scatter(x=candidate_rates, y=grid["waiting_cost"][0], mode="lines",
+                                          name="Biaya Tunggu", line=dict(dash="dot")))
+        fig_capacity.add_vline(x=common["service_rate"], line_dash="dash", line_color="red",
+                               annotation_text="Optimal")
+        fig_capacity.update_layout(title="Biaya Minimum per Laju Pelayanan (jumlah server optimal di tiap laju)",
+                                   xaxis_title="Laju Pelayanan per Server (per jam)",
+                                   yaxis_title="Biaya (Rp/jam)")
+        st.plotly_chart(fig_capacity, use_container_width=True)
+
+        if queue_metrics is not None:
+            current_cost = num_servers * machine_cost + waiting_cost * queue_metrics["avg_queue_length"]
+            st.info(f"Konfigurasi saat ini ({num_servers} server, laju {service_rate:.2f}/jam) berbiaya "
+                    f"Rp {current_cost:,.0f}/jam; konfigurasi optimal menghemat "
+                    f"Rp {current_cost - optimal_cost:,.0f}/jam.")
+        else:
+            st.info(f"Konfigurasi saat ini tidak stabil; gunakan minimal {int(common['servers'][0])} server "
+                    f"dengan laju {common['service_rate']:.2f}/jam.")
+    else:
+        flexible = plan["flexible"]
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Laju Pelayanan Optimal (per jam)", f"{common['service_rate']:.2f}")
+        with col2:
+            st.metric("Server Puncak", f"{int(common['servers'].max())}",
+                      delta=f"rata-rata {common['servers'].mean():.1f}", delta_color="off")
+        with col3:
+            st.metric("Biaya Mingguan", f"Rp {common['total']:,.0f}")
+        with col4:
+            st.metric("Biaya Mingguan (laju fleksibel per jam)", f"Rp {flexible['total_cost'].sum():,.0f}")
+
+        fig_capacity = make_subplots(specs=[[{"secondary_y": True}]])
+        fig_capacity.add_trace(go.Scatter(x=hours, y=arrival_profile, mode="lines", name="Kedatangan (per jam)"),
+                               secondary_y=False)
+        fig_capacity.add_trace(go.Scatter(x=hours, y=common["servers"], mode="lines", name="Server Optimal",
+                                          line=dict(shape="hv")), secondary_y=True)
+        fig_capacity.update_layout(title=f"Jadwal Server per Jam (laju {common['service_rate']:.2f}/jam)")
+        fig_capacity.update_xaxes(title_text="Jam ke- (Senin 00.00 = 0)")
+        fig_capacity.update_yaxes(title_text="Kedatangan (order/jam)", secondary_y=False)
+        fig_capacity.update_yaxes(title_text="Jumlah Server", secondary_y=True)
+        st.plotly_chart(fig_capacity, use_container_width=True)
+
+        df_shift = pd.DataFrame({
+            "Hari": ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"],
+            "Server Maksimum": common["servers"].reshape(7, 24).max(axis=1),
+            "Server-Jam": common["servers"].reshape(7, 24).sum(axis=1),
+            "Biaya (Rp)": common["total_cost"].reshape(7, 24).sum(axis=1),
+            "Waktu Tunggu Maks (menit)": common["avg_wait_time"].reshape(7, 24).max(axis=1) * 60,
+        })
+        st.dataframe(df_shift, use_container_width=True, hide_index=True)
+
 # ANALISIS TERINTEGRASI
 elif menu == "Analisis Terintegrasi":
     st.header("🔗 Analisis Terintegrasi")
+    profiler.stage("input & data historis")
     
     st.subheader("Simulasi Sistem Produksi Lengkap")
     
     # Input parameter terintegrasi
     col1, col2 = st.columns(2)
     
+    # Riwayat order per sesi: file yang sudah di-ingest tidak dibaca ulang pada rerun
+    if "order_history" not in st.session_state:
+        st.session_state["order_history"] = OrderHistory(window_days=365)
+    history = st.session_state["order_history"]
+    with st.expander("📥 Data Historis Order (CSV/Parquet)"):
+        st.caption("Kolom: order_time, product, quantity, opsional service_hours atau service_start/service_end. "
+                   "File dibaca per potongan; statistik memakai 365 hari terakhir.")
+        uploads = st.file_uploader("Unggah log order", type=["csv", "parquet"], accept_multiple_files=True)
+        for upload in uploads or []:
+            try:
+                history.ingest(upload, key=upload.file_id)
+            except (ValueError, RuntimeError) as exc:
+                st.error(f"{upload.name}: {exc}")
+        if history.rows:
+            st.write(f"**{history.rows:,} order** dari {len(history.files)} file")
+            stats = pd.DataFrame(history.product_demand())
+            stats.columns = ["Produk", "Hari Teramati", "Rata-rata Harian", "Std Harian", "Permintaan Tahunan"]
+            st.dataframe(stats, use_container_width=True)
+    product_history = pd.DataFrame(history.product_demand()).set_index("product") if history.rows else None
+
     with col1:
         selected_product = st.selectbox("Pilih Produk untuk Analisis:", list(PRODUCTS.keys()))
-        monthly_demand = st.number_input("Permintaan Bulanan (unit)", value=1000, min_value=100)
+        use_history = (product_history is not None and selected_product in product_history.index
+                       and st.checkbox("Gunakan permintaan dari data historis", value=True))
+        if use_history:
+            observed = product_history.loc[selected_product]
+            monthly_demand = max(int(round(observed["daily_mean"] * 30)), 1)
+            demand_cv = int(round(observed["daily_std"] / observed["daily_mean"] * 100)) if observed["daily_mean"] else 0
+            st.metric("Permintaan Bulanan Historis (unit)", f"{monthly_demand:,}")
+            st.metric("Variabilitas Permintaan Historis", f"{demand_cv}%")
+        else:
+            monthly_demand = st.number_input("Permintaan Bulanan (unit)", value=1000, min_value=100)
+            demand_cv = st.slider("Variabilitas Permintaan Harian (%)", 0, 100, 30)
         
     with col2:
         production_capacity = st.number_input("Kapasitas Produksi Harian (unit)", value=50, min_value=10)
         service_level = st.slider("Target Service Level (%)", 90, 99, 95)
-    
-    # Hitung kebutuhan bahan baku
-    product_data = PRODUCTS[selected_product]
-    annual_demand = monthly_demand * 12
-    
+        lead_time_cv = st.slider("Variabilitas Lead Time (%)", 0, 50, 10)
+    
+    profiler.stage("graf analisis")
+    # Graf inkremental per sesi: hanya tahap yang input-nya berubah dihitung ulang
+    if "integrated_graph" not in st.session_state:
+        st.session_state["integrated_graph"] = build_integrated_graph()
+    graph = build_integrated_graph(st.session_state["integrated_graph"])
+    graph.set_inputs(
+        product=selected_product,
+        monthly_demand=monthly_demand,
+        production_capacity=production_capacity,
+        service_level=service_level / 100,
+        demand_cv=demand_cv / 100,
+        lead_time_cv=lead_time_cv / 100,
+        products=PRODUCTS,
+        bahan_baku=BAHAN_BAKU,
+        order_cost=DEFAULT_ORDER_COST,
+        seed=0,
+        efficiency_history=(monthly_efficiency(history, selected_product, production_capacity, PRODUCTS)
+                            if use_history else None)
+    )
+    material = graph.get("material")
+    capacity = graph.get("capacity")
+    capacity_utilization = capacity["capacity_utilization"]
+    total_inventory_cost = material["total_inventory_cost"]
+    queue_metrics = graph.get("queue")
+    overall_efficiency = graph.get("efficiency")
+    
+    profiler.stage("tabel bahan & historis")
     st.subheader("📊 Analisis Kebutuhan Bahan Baku")
     
-    bahan_baku_analysis = []
-    total_inventory_cost = 0
-    
-    for bahan, proporsi in product_data["bahan_baku"].items():
-        if bahan in BAHAN_BAKU:
-            bahan_demand = annual_demand * proporsi
-            bahan_data = BAHAN_BAKU[bahan]
-            
-            # Hitung EOQ dan ROP untuk setiap bahan
-            eoq = calculate_eoq(bahan_demand, 200000, bahan_data["holding_cost"], bahan_data["harga"])
-            daily_demand = bahan_demand / 365
-            rop = calculate_rop(daily_demand, bahan_data["lead_time"], daily_demand * 2)  # 2 hari safety stock
-            
-            inventory_cost = (bahan_demand/eoq) * 200000 + (eoq/2) * bahan_data["holding_cost"] * bahan_data["harga"]
-            total_inventory_cost += inventory_cost
-            
-            bahan_baku_analysis.append({
-                "Bahan Baku": bahan,
-                "Kebutuhan Tahunan (kg)": bahan_demand,
-                "EOQ (kg)": eoq,
-                "ROP (kg)": rop,
-                "Biaya Persediaan (Rp)": inventory_cost
-            })
-    
-    df_bahan = pd.DataFrame(bahan_baku_analysis)
+    df_bahan = pd.DataFrame(material["materials"])
     st.dataframe(df_bahan, use_container_width=True)
+
+    if history.rows:
+        with st.expander("📈 EOQ, ROP & Antrian dari Data Historis"):
+            catalog = build_catalog(PRODUCTS, BAHAN_BAKU)
+            st.dataframe(pd.DataFrame(inventory_from_history(history, catalog, DEFAULT_ORDER_COST,
+                                                             service_level / 100)), use_container_width=True)
+            historical_queue = queue_from_history(history, servers=1)
+            if historical_queue:
+                q1, q2, q3 = st.columns(3)
+                q1.metric("Utilisasi Historis", f"{historical_queue['utilization']:.1%}")
+                q2.metric("Rata-rata Antrian", f"{historical_queue['avg_queue_length']:.2f}")
+                q3.metric("Waktu Tunggu (jam)", f"{historical_queue['avg_wait_time']:.2f}")
+            else:
+                st.info("Waktu layanan tidak tersedia di log atau antrian historis tidak stabil (1 server).")
+
+            # ROP dan safety stock mingguan dari ramalan (Holt-Winters/Croston) per bahan baku
+            weekly_usage = history.material_usage(catalog, period_days=7)
+            if weekly_usage.shape[1] >= 4:
+                schedule = reorder_schedule(weekly_usage, catalog.materials["lead_time"], period_days=7,
+                                            service_level=service_level / 100, horizon=12)
+                st.write("**ROP Mingguan Berbasis Ramalan (kg)**")
+                df_rop = pd.DataFrame(schedule["rop"], index=catalog.materials["name"],
+                                      columns=[f"Minggu {i + 1}" for i in range(schedule["rop"].shape[1])])
+                df_rop.insert(0, "Metode", schedule["method"])
+                st.dataframe(df_rop, use_container_width=True)
+                forecast_material = st.selectbox("Bahan untuk grafik ramalan:", list(catalog.materials["name"]))
+                row = int(catalog.material_index(forecast_material))
+                weeks = np.arange(1, schedule["rop"].shape[1] + 1)
+                fig_forecast = go.Figure([
+                    go.Scatter(x=weeks, y=schedule["forecast"][row], mode='lines+markers', name="Ramalan Pemakaian"),
+                    go.Scatter(x=weeks, y=schedule["safety_stock"][row], mode='lines', name="Safety Stock"),
+                    go.Scatter(x=weeks, y=schedule["rop"][row], mode='lines', name="ROP",
+                               line=dict(dash='dash', color='red')),
+                ])
+                fig_forecast.update_layout(title=f"Ramalan & ROP Mingguan: {forecast_material}",
+                                           xaxis_title="Minggu ke-", yaxis_title="kg")
+                st.plotly_chart(fig_forecast, use_container_width=True)
+            else:
+                st.info("Ramalan ROP membutuhkan riwayat minimal 4 minggu.")
+    
+    profiler.stage("MRP")
+    # MRP: bahan yang dipakai bersama (mis. Garam) diagregasi dari semua produk
+    with st.expander("📅 Rencana Pesanan Bahan Baku Semua Produk (MRP)"):
+        demand_plan = st.data_editor(
+            pd.DataFrame({
+                "Produk": list(PRODUCTS.keys()),
+                "Permintaan Bulanan (unit)": [monthly_demand if p == selected_product else 1000 for p in PRODUCTS]
+            }),
+            disabled=["Produk"], hide_index=True, use_container_width=True
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            plan_weeks = st.slider("Horizon Perencanaan (minggu)", 4, 52, 12)
+        with col2:
+            cover_days = st.number_input("Stok Awal Bahan (hari kebutuhan)", value=14, min_value=0)
+        
+        mrp = material_plan(
+            dict(zip(demand_plan["Produk"], demand_plan["Permintaan Bulanan (unit)"].astype(float))),
+            weeks=plan_weeks, cover_days=cover_days
+        )
+        st.dataframe(pd.DataFrame(mrp["summary"]), use_container_width=True, hide_index=True)
+        df_releases = pd.DataFrame(
+            mrp["planned_releases"], index=mrp["materials"],
+            columns=[f"M{week + 1}" for week in range(plan_weeks)]
+        )
+        st.markdown("**Rilis Pesanan Terencana per Minggu (kg)**")
+        st.dataframe(df_releases.style.format("{:,.0f}"), use_container_width=True)
     
+    profiler.stage("persediaan gabungan")
+    # EOQ semua bahan sekaligus: pesanan gabungan per pemasok dengan batasan gudang & modal bersama
+    with st.expander("🏬 Optimasi Persediaan Gabungan (Pemasok, Gudang & Modal)"):
+        col1, col2 = st.columns(2)
+        with col1:
+            major_cost = st.number_input("Biaya Pengiriman per Pemasok (Rp)", value=int(DEFAULT_MAJOR_COST),
+                                         min_value=0, step=10000)
+            minor_cost = st.number_input("Biaya Tambahan per Bahan (Rp)", value=int(DEFAULT_MINOR_COST),
+                                         min_value=0, step=10000)
+        with col2:
+            warehouse_limit = st.number_input("Kapasitas Gudang (kg, 0 = tanpa batas)", value=0, min_value=0, step=100)
+            budget_limit = st.number_input("Modal Persediaan Maksimum (Rp, 0 = tanpa batas)", value=0,
+                                           min_value=0, step=1000000)
+        joint = joint_inventory(
+            PRODUCTS, BAHAN_BAKU,
+            dict(zip(demand_plan["Produk"], demand_plan["Permintaan Bulanan (unit)"].astype(float))),
+            major_cost=float(major_cost), minor_cost=float(minor_cost),
+            space_limit=float(warehouse_limit) or None, budget_limit=float(budget_limit) or None
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Biaya EOQ Independen", f"Rp {joint['independent_cost']:,.0f}")
+        with col2:
+            st.metric("Biaya Pesanan Gabungan", f"Rp {joint['joint_cost']:,.0f}",
+                      delta=f"Rp {joint['joint_cost'] - joint['independent_cost']:,.0f}", delta_color="inverse")
+        with col3:
+            st.metric("Ruang Gudang Terpakai", f"{joint['joint']['space_used']:,.0f} kg")
+        if joint["joint"]["space_multiplier"] > 0 or joint["joint"]["budget_multiplier"] > 0:
+            st.info("Batasan aktif: kuantitas pesan diperkecil. Nilai tambahan 1 kg gudang ≈ "
+                    f"Rp {joint['joint']['space_multiplier']:,.0f}/tahun, tambahan Rp 1 modal ≈ "
+                    f"Rp {joint['joint']['budget_multiplier']:,.3f}/tahun.")
+        st.dataframe(pd.DataFrame(joint["table"]), use_container_width=True, hide_index=True)
+        st.dataframe(pd.DataFrame(joint["suppliers"]), use_container_width=True, hide_index=True)
+        use_joint_cost = st.checkbox("Gunakan biaya pesanan gabungan pada total biaya persediaan", value=False)
+    if use_joint_cost:
+        # Biaya gabungan dialokasikan ke produk terpilih sebanding pemakaian bahannya
+        total_inventory_cost = joint["product_cost"][selected_product]
+    
+    profiler.stage("metrik")
     # Analisis bottleneck produksi
     st.subheader("🔍 Analisis Bottleneck Produksi")
     
-    daily_demand = monthly_demand / 30
-    production_time = product_data["waktu_produksi"]
-    required_capacity = daily_demand * production_time
-    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Kebutuhan Kapasitas Harian", f"{required_capacity:.1f} jam")
+        st.metric("Kebutuhan Kapasitas Harian", f"{capacity['required_capacity']:.1f} jam")
     with col2:
-        capacity_utilization = (required_capacity / (production_capacity * production_time)) * 100
         st.metric("Utilisasi Kapasitas", f"{capacity_utilization:.1f}%")
     with col3:
         st.metric("Total Biaya Persediaan", f"Rp {total_inventory_cost:,.0f}")
@@ -472,11 +1007,6 @@ elif menu == "Analisis Terintegrasi":
     # Model antrian untuk order processing
     st.subheader("⏳ Analisis Antrian Order")
     
-    order_arrival_rate = daily_demand / 8  # order per jam (8 jam kerja)
-    order_service_rate = production_capacity / 8  # service rate per jam
-    
-    queue_metrics = calculate_queue_metrics(order_arrival_rate, order_service_rate, 1)
-    
     if queue_metrics:
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -486,139 +1016,153 @@ elif menu == "Analisis Terintegrasi":
         with col3:
             st.metric("Utilisasi Produksi", f"{queue_metrics['utilization']:.2%}")
     
-    # Dashboard integrasi
-    st.subheader("📊 Dashboard Terintegrasi")
-    
-    # Membuat grafik gabungan
-    fig_integrated = make_subplots(
-        rows=2, cols=2,
-        subplot_titles=["Profit vs Biaya", "Level Persediaan", "Kinerja Antrian", "Trend Efisiensi"],
-        specs=[[{"secondary_y": False}, {"secondary_y": False}],
-               [{"secondary_y": False}, {"secondary_y": False}]]
-    )
-    
-    # Grafik 1: Profit Analysis
-    profit_per_unit = product_data["harga_jual"] - product_data["biaya_produksi"]
-    monthly_profit = monthly_demand * profit_per_unit
-    
-    fig_integrated.add_trace(
-        go.Bar(x=["Revenue", "Cost", "Profit"], 
-               y=[monthly_demand * product_data["harga_jual"], 
-                  monthly_demand * product_data["biaya_produksi"], 
-                  monthly_profit],
-               name="Financial",
-               marker_color=['green', 'red', 'blue']),
-        row=1, col=1
-    )
-    
-    # Grafik 2: Inventory Level (contoh untuk bahan utama)
-    if bahan_baku_analysis:
-        main_material = bahan_baku_analysis[0]
-        days = list(range(1, 31))
-        inventory_sim = [max(0, main_material["EOQ (kg)"] - (i * main_material["Kebutuhan Tahunan (kg)"]/365)) 
-                        for i in days]
-        
-        fig_integrated.add_trace(
-            go.Scatter(x=days, y=inventory_sim, mode='lines+markers', 
-                      name="Inventory Level", line=dict(color='orange')),
-            row=1, col=2
-        )
-        
-        # Add ROP line
-        fig_integrated.add_trace(
-            go.Scatter(x=days, y=[main_material["ROP (kg)"]] * len(days), 
-                      mode='lines', name="ROP", line=dict(dash='dash', color='red')),
-            row=1, col=2
+    profiler.stage("jaringan lini produksi")
+    # Lini multi-tahap sebagai jaringan Jackson: M/M/c per stasiun dengan loop rework
+    with st.expander("🏭 Jaringan Antrian Lini Produksi Multi-Tahap"):
+        base_rate = capacity["order_service_rate"]
+        df_stations = st.data_editor(
+            pd.DataFrame({
+                "Stasiun": list(PRODUCTION_LINE["stasiun"]),
+                "Mesin": [station["mesin"] for station in PRODUCTION_LINE["stasiun"].values()],
+                "Laju per Mesin (unit/jam)": [round(station["laju_relatif"] * base_rate, 2)
+                                              for station in PRODUCTION_LINE["stasiun"].values()],
+            }),
+            disabled=["Stasiun"], hide_index=True, use_container_width=True
         )
-    
-    # Grafik 3: Queue Performance - Bar Chart
-    if queue_metrics:
-        queue_data = ['Utilisasi', 'Waktu Tunggu', 'Panjang Antrian']
-        queue_values = [
-            queue_metrics['utilization'] * 100,
-            queue_metrics.get('avg_wait_time', queue_metrics.get('avg_system_time', 0)) * 10,  # Scale for visibility
-            queue_metrics.get('avg_queue_length', queue_metrics.get('avg_system_length', 0)) * 20  # Scale for visibility
-        ]
-        
-        fig_integrated.add_trace(
-            go.Bar(x=queue_data, y=queue_values, name="Queue Metrics",
-                  marker_color=['blue', 'orange', 'green']),
-            row=2, col=1
+        station_names = df_stations["Stasiun"].tolist()
+        df_rework = st.data_editor(
+            pd.DataFrame(PRODUCTION_LINE["rework"], columns=["Dari", "Ke", "Probabilitas"]),
+            column_config={
+                "Dari": st.column_config.SelectboxColumn(options=station_names, required=True),
+                "Ke": st.column_config.SelectboxColumn(options=station_names, required=True),
+                "Probabilitas": st.column_config.NumberColumn(min_value=0.0, max_value=1.0, step=0.01),
+            },
+            num_rows="dynamic", hide_index=True, use_container_width=True
         )
+        external = np.zeros(len(station_names))
+        external[0] = capacity["order_arrival_rate"]
+        service_rates = df_stations["Laju per Mesin (unit/jam)"].to_numpy(dtype=float)
+        machines = df_stations["Mesin"].to_numpy(dtype=float)
+        try:
+            routing = serial_routing(len(station_names), [
+                (station_names.index(row["Dari"]), station_names.index(row["Ke"]), float(row["Probabilitas"]))
+                for row in df_rework.dropna().to_dict("records")
+            ])
+            network = jackson_network(external, routing, service_rates, machines)
+        except ValueError as exc:
+            st.error(str(exc))
+            routing = None
+        if routing is not None:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Lead Time Lini", f"{network['lead_time']:.2f} jam" if network["stable"] else "Tidak stabil")
+            with col2:
+                st.metric("WIP", f"{network['wip']:.1f} unit" if network["stable"] else "-")
+            with col3:
+                st.metric("Bottleneck", station_names[int(network["bottleneck"])])
+            with col4:
+                st.metric("Throughput Maksimum", f"{network['max_throughput']:.2f} unit/jam",
+                          delta=f"masuk {network['throughput']:.2f} unit/jam", delta_color="off")
+            st.dataframe(pd.DataFrame(station_table(network, station_names)), use_container_width=True,
+                         hide_index=True)
+            
+            # Desain lini: semua kombinasi jumlah mesin dievaluasi dalam satu batch
+            max_machines = st.slider("Maksimum Mesin per Stasiun (desain lini)", 1, 8, 4)
+            # Routing sudah divalidasi jackson_network di atas: varian hanya mengubah jumlah mesin
+            variants = server_variants(external, routing, service_rates, [max_machines] * len(station_names))
+            df_variants = pd.DataFrame({
+                "Total Mesin": variants["total_servers"],
+                "Konfigurasi": [" / ".join(map(str, row)) for row in variants["servers"]],
+                "Lead Time (jam)": variants["lead_time"],
+                "WIP (unit)": variants["wip"],
+            }).dropna()
+            if df_variants.empty:
+                st.warning("Tidak ada konfigurasi mesin yang stabil untuk laju order ini.")
+            else:
+                best_designs = df_variants.loc[df_variants.groupby("Total Mesin")["Lead Time (jam)"].idxmin()]
+                st.markdown(f"**Konfigurasi terbaik per jumlah mesin** ({len(variants['lead_time']):,} varian, "
+                            f"urutan {' / '.join(station_names)})")
+                st.dataframe(best_designs, use_container_width=True, hide_index=True)
     
-    # Grafik 4: Overall Efficiency Trend
-    overall_efficiency = (capacity_utilization + queue_metrics['utilization']*100) / 2 if queue_metrics else capacity_utilization
-    
-    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-    efficiency_trend = [overall_efficiency + np.random.uniform(-5, 5) for _ in months]
-    
-    fig_integrated.add_trace(
-        go.Scatter(x=months, y=efficiency_trend, mode='lines+markers',
-                  name="Efficiency Trend", line=dict(color='purple')),
-        row=2, col=2
-    )
-    
-    # Add target line
-    fig_integrated.add_trace(
-        go.Scatter(x=months, y=[80] * len(months), mode='lines',
-                  name="Target (80%)", line=dict(dash='dash', color='red')),
-        row=2, col=2
-    )
+    # Dashboard integrasi
+    st.subheader("📊 Dashboard Terintegrasi")
     
-    fig_integrated.update_layout(height=600, showlegend=True, title_text="Dashboard Analisis Terintegrasi")
-    st.plotly_chart(fig_integrated, use_container_width=True)
+    profiler.stage("dashboard terintegrasi")
+    # Trace dan gauge juga node graf: mis. mengubah service level tidak membangun ulang grafik profit
+    for name, (func, inputs) in DASHBOARD_NODES.items():
+        graph.add(name, func, inputs)
+    st.plotly_chart(graph.get("fig_integrated"), use_container_width=True)
     
     # Gauge charts terpisah untuk metrics utama
     col1, col2 = st.columns(2)
     
     with col1:
         if queue_metrics:
-            fig_gauge1 = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=queue_metrics['utilization']*100,
-                title={'text': "Utilisasi Sistem (%)"},
-                gauge={'axis': {'range': [None, 100]},
-                       'bar': {'color': "darkblue"},
-                       'steps': [{'range': [0, 50], 'color': "lightgray"},
-                                {'range': [50, 80], 'color': "gray"}],
-                       'threshold': {'line': {'color': "red", 'width': 4},
-                                   'thickness': 0.75, 'value': 90}}
-            ))
-            fig_gauge1.update_layout(height=300)
-            st.plotly_chart(fig_gauge1, use_container_width=True)
+            st.plotly_chart(graph.get("gauge_utilization"), use_container_width=True)
     
     with col2:
-        fig_gauge2 = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=overall_efficiency,
-            delta={'reference': 80},
-            title={'text': "Efisiensi Keseluruhan (%)"},
-            gauge={'axis': {'range': [None, 100]},
-                   'bar': {'color': "green"},
-                   'steps': [{'range': [0, 60], 'color': "lightgray"},
-                            {'range': [60, 80], 'color': "yellow"}],
-                   'threshold': {'line': {'color': "red", 'width': 4},
-                               'thickness': 0.75, 'value': 90}}
-        ))
-        fig_gauge2.update_layout(height=300)
-        st.plotly_chart(fig_gauge2, use_container_width=True)
+        st.plotly_chart(graph.get("gauge_efficiency"), use_container_width=True)
     
+    profiler.stage("rekomendasi")
     # Rekomendasi strategis
     st.subheader("💡 Rekomendasi Strategis")
     
-    recommendations = []
-    
-    if capacity_utilization > 90:
-        recommendations.append("🚨 Kapasitas produksi hampir maksimal. Pertimbangkan ekspansi atau investasi mesin baru.")
-    
-    if queue_metrics and queue_metrics['utilization'] > 0.8:
-        recommendations.append("⚠️ Tingkat antrian tinggi. Pertimbangkan optimasi proses atau penambahan shift.")
+    recommendations = graph.get("recommendations")
+    if use_joint_cost:
+        recommendations = strategic_recommendations(capacity_utilization, queue_metrics, total_inventory_cost,
+                                                    graph.get("financial")["monthly_profit"], overall_efficiency)
+    for recommendation in recommendations:
+        st.markdown(f"- {recommendation}")
     
-    if total_inventory_cost > monthly_profit:
-        recommendations.append("💰 Biaya persediaan terlalu tinggi. Review kebijakan EOQ dan safety stock.")
-    
-    if overall_efficiency < 70:
-        recommendations.append("📈 Efisiensi operasional rendah. Fokus pada perbaikan proses dan eliminasi waste.")
-    
-    if not recommendations:
-        recommendations.append("✅")
+    with st.expander("⏱️ Waktu per Tahap Perhitungan"):
+        df_timing = pd.DataFrame(graph.timings())
+        st.dataframe(df_timing, use_container_width=True, hide_index=True)
+
+profiler.stage("pekerjaan latar belakang")
+with st.sidebar.expander("⚙️ Pekerjaan Latar Belakang"):
+    df_jobs = pd.DataFrame(job_manager.jobs())
+    st.caption(f"{job_manager.max_workers} proses worker dibagi semua sesi")
+    if not df_jobs.empty:
+        st.dataframe(df_jobs.drop(columns=["id"]), use_container_width=True, hide_index=True)
+
+profiler.stage("statistik cache")
+# Statistik cache perhitungan (dibagi oleh semua sesi dalam proses ini)
+with st.sidebar.expander("📦 Statistik Cache"):
+    df_cache = pd.DataFrame(cache_stats())
+    if not df_cache.empty:
+        df_cache["hit_rate"] = df_cache["hits"] / (df_cache["hits"] + df_cache["misses"]).clip(lower=1)
+    st.dataframe(df_cache, use_container_width=True, hide_index=True)
+
+profiler.stage("penyimpanan hasil")
+with st.sidebar.expander("💾 Penyimpanan Hasil"):
+    store_info = result_store().info()
+    st.caption(f"{store_info['entries']} hasil, {store_info['bytes'] / 2**20:.1f} dari "
+               f"{store_info['max_bytes'] / 2**20:.0f} MB di {store_info['directory']}")
+    df_store = pd.DataFrame(result_store().entries())
+    if not df_store.empty:
+        st.dataframe(df_store, use_container_width=True, hide_index=True)
+    if st.button("Kosongkan penyimpanan", key="clear_store"):
+        result_store().clear()
+        st.rerun()
+
+profiler.finish()
+if profiling_panel is not None and profiler.enabled:
+    with profiling_panel:
+        df_spans = pd.DataFrame(profiler.records)
+        df_spans["tahap"] = ["\u2003" * depth + name for depth, name in zip(df_spans["depth"], df_spans["name"])]
+        span_columns = ["tahap", "ms", "self_ms"] + (["memory_kb", "peak_kb"] if profiler.memory else [])
+        st.dataframe(df_spans[span_columns], use_container_width=True, hide_index=True)
+        if profiler.snapshot:
+            st.markdown("**Alokasi terbesar**")
+            st.dataframe(pd.DataFrame(profiler.snapshot), use_container_width=True, hide_index=True)
+        if profiler.stats:
+            st.markdown("**cProfile (kumulatif teratas)**")
+            st.dataframe(pd.DataFrame(profiler.stats), use_container_width=True, hide_index=True)
+        st.download_button("Unduh JSON", json.dumps(profiler.to_json(), indent=2),
+                           file_name="profiling.json", mime="application/json")
+        st.download_button("Unduh flamegraph (collapsed)", profiler.to_collapsed(),
+                           file_name="profiling.folded", mime="text/plain")
+        cprofile_data = profiler.cprofile_bytes()
+        if cprofile_data is not None:
+            st.download_button("Unduh cProfile (.prof)", cprofile_data, file_name="profiling.prof",
+                               mime="application/octet-stream")
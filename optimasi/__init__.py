@@ -0,0 +1,90 @@
+"""Inti perhitungan Sistem Optimasi Produksi Terintegrasi.
+
+Paket ini headless (tanpa Streamlit/Plotly) dan submodulnya dimuat secara
+malas: ``import optimasi`` tidak mengimpor NumPy atau pandas, modul baru
+dimuat saat atributnya pertama kali diakses (PEP 562).
+"""
+
+import importlib
+
+# Nama publik -> submodul yang mendefinisikannya
+_EXPORTS = {
+    "BAHAN_BAKU": "data",
+    "ComputeGraph": "graf",
+    "CSRMatrix": "sparse",
+    "JobCancelled": "pekerjaan",
+    "JobManager": "pekerjaan",
+    "MasterData": "katalog",
+    "MaterialIndex": "indeks",
+    "OrderHistory": "riwayat",
+    "PRODUCTION_LINE": "data",
+    "PRODUCTS": "data",
+    "Profiler": "profiling",
+    "QueueFull": "pekerjaan",
+    "ResultStore": "penyimpanan",
+    "build_catalog": "katalog",
+    "build_integrated_graph": "terintegrasi",
+    "build_material_index": "indeks",
+    "cache_stats": "cache",
+    "calculate_eoq": "persediaan",
+    "calculate_eoq_batch": "persediaan",
+    "calculate_queue_metrics": "antrian",
+    "calculate_queue_metrics_batch": "antrian",
+    "calculate_rop": "persediaan",
+    "calculate_rop_batch": "persediaan",
+    "capacity_plan": "antrian",
+    "catalog_mrp": "mrp",
+    "clear_all_caches": "cache",
+    "configure_store": "penyimpanan",
+    "constrained_eoq": "pengadaan",
+    "croston": "peramalan",
+    "eoq_table": "persediaan",
+    "explode_mrp": "mrp",
+    "fit_forecast": "peramalan",
+    "gantt_segments": "penjadwalan",
+    "generate_demand": "simulasi_persediaan",
+    "holt_winters": "peramalan",
+    "integrated_analysis": "terintegrasi",
+    "jackson_network": "jaringan",
+    "inventory_from_history": "riwayat",
+    "jobs_from_plan": "penjadwalan",
+    "joint_inventory": "pengadaan",
+    "joint_replenishment": "pengadaan",
+    "load_sweep": "sensitivitas",
+    "material_plan": "terintegrasi",
+    "memoize": "cache",
+    "lttb_indices": "downsample",
+    "minmax_indices": "downsample",
+    "optimal_servers": "antrian",
+    "optimize_production": "produksi",
+    "optimize_production_plan": "produksi",
+    "optimize_safety_stock": "monte_carlo",
+    "queue_from_history": "riwayat",
+    "reorder_schedule": "peramalan",
+    "run_sweep": "sensitivitas",
+    "schedule_jobs": "penjadwalan",
+    "serial_routing": "jaringan",
+    "server_variants": "jaringan",
+    "setup_matrix": "penjadwalan",
+    "simulate_inventory": "simulasi_persediaan",
+    "simulate_queue": "simulasi_antrian",
+    "solve_lp": "simplex",
+    "solve_milp": "simplex",
+    "sweep_slice": "sensitivitas",
+    "update_line_figure": "downsample",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # akses berikutnya tidak melewati __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,7 @@
+"""Memungkinkan ``python -m optimasi`` menjalankan CLI batch."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,260 @@
+"""Model antrian M/M/c eksak dalam bentuk vektor (NumPy)."""
+
+import numpy as np
+
+from .cache import memoize
+
+# Awal rekurensi Erlang-B optimal_servers: c0 = a - WARMUP_SIGMAS * sqrt(a)
+WARMUP_SIGMAS = 9.0
+# Server tambahan dianggap lebih murah hanya bila biaya turun lebih dari fraksi ini
+# dari skala biaya a * (server_cost + waiting_cost); selisih lebih kecil dianggap seri
+COST_RTOL = 1e-9
+
+
+def _log_factorials(n):
+    """Tabel log(k!) untuk k = 0..n."""
+    return np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1, dtype=float)))))
+
+
+def _log_erlang_b(offered_load, servers):
+    """log Erlang-B untuk setiap pasangan (a, c) lewat rekurensi di ruang log.
+
+    B(0) = 1, B(k) = a B(k-1) / (k + a B(k-1)). Konfigurasi diurutkan menurun
+    menurut c sehingga pada langkah k hanya prefiks yang masih aktif yang
+    diperbarui; biaya total O(max(c) + sum(c)) tanpa faktorial besar.
+    """
+    order = np.argsort(-servers, kind="stable")
+    a_sorted = offered_load[order]
+    c_sorted = servers[order]
+    log_a = np.log(a_sorted)
+    log_b = np.zeros_like(a_sorted)
+    max_c = int(c_sorted[0]) if c_sorted.size else 0
+    # active_count[k-1] = jumlah konfigurasi dengan c >= k
+    active_count = np.searchsorted(-c_sorted, -np.arange(1, max_c + 1), side="right")
+    for k, n in enumerate(active_count, start=1):
+        head = log_b[:n]
+        head += log_a[:n] - np.log(k + a_sorted[:n] * np.exp(head))
+    out = np.empty_like(log_b)
+    out[order] = log_b
+    return out
+
+
+@memoize(maxsize=256)
+def calculate_queue_metrics_batch(arrival_rate, service_rate, servers=1):
+    """Menghitung metrik antrian M/M/c eksak untuk banyak konfigurasi sekaligus.
+
+    ``arrival_rate`` (lambda), ``service_rate`` (mu) dan ``servers`` (c) di-broadcast
+    bersama. Probabilitas menunggu (Erlang-C) dan P0 dihitung di ruang log
+    sehingga tetap stabil untuk ratusan hingga ribuan server. Konfigurasi yang
+    tidak stabil (rho >= 1) atau tidak valid bernilai NaN dengan ``stable`` False.
+    """
+    lam, mu, c = np.broadcast_arrays(
+        np.asarray(arrival_rate, dtype=float),
+        np.asarray(service_rate, dtype=float),
+        np.asarray(servers, dtype=float),
+    )
+    shape = lam.shape
+    lam, mu, c = lam.ravel(), mu.ravel(), c.ravel()
+
+    valid = (
+        np.isfinite(lam) & np.isfinite(mu) & np.isfinite(c)
+        & (lam >= 0) & (mu > 0) & (c >= 1) & (c == np.round(c))
+    )
+    c_int = np.where(valid, c, 1).astype(np.int64)
+    a = np.where(valid, lam / np.where(valid, mu, 1.0), 0.0)
+    rho = a / c_int
+    stable = valid & (rho < 1)
+
+    # Tanpa kedatangan tidak ada antrian: P(wait) = 0, P0 = 1
+    busy = stable & (a > 0)
+    p_wait = np.zeros_like(a)
+    p0 = np.ones_like(a)
+    if busy.any():
+        a_b, c_b, rho_b = a[busy], c_int[busy], rho[busy]
+        log_b = _log_erlang_b(a_b, c_b)
+        b = np.exp(log_b)
+        log_c = log_b - np.log1p(-rho_b * (1 - b))
+        log_term = c_b * np.log(a_b) - _log_factorials(int(c_b.max()))[c_b]  # log(a^c / c!)
+        p_wait[busy] = np.exp(log_c)
+        p0[busy] = np.exp(log_c + np.log1p(-rho_b) - log_term)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        l_q = p_wait * rho / (1 - rho)
+        w_q = p_wait / (c_int * mu - lam)
+        w_s = w_q + 1 / mu
+        l_s = l_q + a
+
+    def masked(values):
+        return np.where(stable, values, np.nan).reshape(shape)
+
+    return {
+        "utilization": np.where(valid, rho, np.nan).reshape(shape),
+        "avg_queue_length": masked(l_q),
+        "avg_system_length": masked(l_s),
+        "avg_wait_time": masked(w_q),
+        "avg_system_time": masked(w_s),
+        "prob_wait": masked(p_wait),
+        "prob_empty": masked(p0),
+        "servers": c_int.reshape(shape),
+        "stable": stable.reshape(shape),
+    }
+
+
+def calculate_queue_metrics(arrival_rate, service_rate, servers=1):
+    """Menghitung metrik model antrian M/M/1 atau M/M/c (Erlang-C eksak)"""
+    metrics = calculate_queue_metrics_batch(arrival_rate, service_rate, servers)
+    if not metrics["stable"]:
+        return None  # Sistem tidak stabil
+
+    return {
+        "utilization": float(metrics["utilization"]),
+        "avg_queue_length": float(metrics["avg_queue_length"]),
+        "avg_system_length": float(metrics["avg_system_length"]),
+        "avg_wait_time": float(metrics["avg_wait_time"]),
+        "avg_system_time": float(metrics["avg_system_time"]),
+        "prob_wait": float(metrics["prob_wait"]),
+        "prob_empty": float(metrics["prob_empty"]),
+        "servers": int(metrics["servers"])
+    }
+
+
+@memoize(maxsize=64)
+def optimal_servers(arrival_rate, service_rate, server_cost, waiting_cost, max_wait=None, max_prob_wait=None,
+                    max_servers=100_000):
+    """Jumlah server berbiaya minimum untuk setiap kombinasi (lambda, mu, biaya server).
+
+    Biaya per jam = ``c * server_cost + waiting_cost * Lq`` (``waiting_cost``
+    per order per jam menunggu di antrian), dengan syarat opsional
+    ``Wq <= max_wait`` dan/atau ``P(wait) <= max_prob_wait``.
+    ``arrival_rate``, ``service_rate`` dan ``server_cost`` di-broadcast
+    bersama, mis. ``(skenario, 1)`` x ``(1, kandidat_mu)``.
+
+    Erlang-B diperbarui satu langkah per tambahan server lewat rekurensi
+    linear ``1/B(c) = 1 + (c/a) / B(c-1)`` untuk semua konfigurasi sekaligus,
+    dan Erlang-C diturunkan dari B. Galat awal menyusut dengan faktor c/a per
+    langkah selama c < a, sehingga rekurensi cukup dimulai dari
+    ``c0 = a - WARMUP_SIGMAS * sqrt(a)`` dengan taksiran ``B = 1 - c0/a``
+    (galat relatif < exp(-WARMUP_SIGMAS^2 / 2)); langkah per konfigurasi
+    sebanding dengan sqrt(a), bukan a. Karena Lq konveks dan menurun terhadap
+    c sedangkan Wq dan P(wait) menurun, pencarian berhenti begitu c memenuhi
+    syarat dan biaya tidak lagi turun lebih dari ``COST_RTOL`` (seri dipecah ke
+    c terkecil, mis. biaya server nol tidak mendorong c sampai Lq underflow);
+    konfigurasi yang selesai dikeluarkan dari himpunan aktif. Konfigurasi identik (mis. jam yang sama pada hari
+    berbeda) dihitung sekali.
+
+    Mengembalikan dict array: ``servers`` (0 bila tidak ada c <= ``max_servers``
+    yang memenuhi syarat), ``total_cost``, ``server_cost``, ``waiting_cost``,
+    ``avg_queue_length``, ``avg_wait_time``, ``prob_wait``, ``utilization``
+    dan ``feasible``.
+    """
+    lam, mu, cost = np.broadcast_arrays(
+        np.asarray(arrival_rate, dtype=float),
+        np.asarray(service_rate, dtype=float),
+        np.asarray(server_cost, dtype=float),
+    )
+    shape = lam.shape
+    valid = np.isfinite(lam) & np.isfinite(mu) & np.isfinite(cost) & (lam >= 0) & (mu > 0) & (cost >= 0)
+    configs, inverse = np.unique(np.stack([lam[valid], mu[valid], cost[valid]], axis=-1), axis=0,
+                                 return_inverse=True)
+    lam_u, mu_u, cost_u = configs.T
+    n = lam_u.size
+    a_u = lam_u / mu_u
+    tolerance = COST_RTOL * a_u * (cost_u + waiting_cost)
+    max_wait = np.inf if max_wait is None else max_wait
+    max_prob_wait = np.inf if max_prob_wait is None else max_prob_wait
+
+    best_c = np.zeros(n, dtype=np.int64)
+    best_cost = np.full(n, np.inf)
+    best_lq = np.full(n, np.nan)
+    best_wq = np.full(n, np.nan)
+    best_pw = np.full(n, np.nan)
+
+    # Himpunan aktif: indeks konfigurasi, beban a, c saat ini, 1/B(c) dan c stabil terkecil
+    idx = np.arange(n)
+    a = a_u.copy()
+    k = np.maximum(np.floor(a - WARMUP_SIGMAS * np.sqrt(a)), 0.0)
+    inv_b = np.where(k > 0, a / np.maximum(a - k, 1.0), 1.0)
+    c_min = np.floor(a) + 1
+    while idx.size:
+        k += 1
+        with np.errstate(divide="ignore", over="ignore"):
+            inv_b = 1 + k / a * inv_b
+        evaluate = c_min <= k
+        if not evaluate.any():
+            continue
+        rows = idx[evaluate]
+        a_k, b_k, c_k = a[evaluate], 1 / inv_b[evaluate], k[evaluate]
+        rho = a_k / c_k
+        p_wait = b_k / (1 - rho * (1 - b_k))
+        l_q = p_wait * rho / (1 - rho)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w_q = np.where(lam_u[rows] > 0, l_q / lam_u[rows], 0.0)
+        total = c_k * cost_u[rows] + waiting_cost * l_q
+        feasible = (w_q <= max_wait) & (p_wait <= max_prob_wait)
+        better = feasible & (total < best_cost[rows] - tolerance[rows])
+        improved = rows[better]
+        best_c[improved] = c_k[better]
+        best_cost[improved] = total[better]
+        best_lq[improved] = l_q[better]
+        best_wq[improved] = w_q[better]
+        best_pw[improved] = p_wait[better]
+
+        # Sudah layak dan biaya tidak turun lagi: minimum biaya ditemukan (konveks)
+        done = k >= max_servers
+        done[evaluate] |= feasible & ~better
+        if done.any():
+            keep = ~done
+            idx, a, k, inv_b, c_min = idx[keep], a[keep], k[keep], inv_b[keep], c_min[keep]
+
+    found = best_c > 0
+    out = {}
+    for key, values, fill in (
+        ("servers", best_c, 0),
+        ("total_cost", best_cost, np.nan),
+        ("avg_queue_length", best_lq, np.nan),
+        ("avg_wait_time", best_wq, np.nan),
+        ("prob_wait", best_pw, np.nan),
+    ):
+        full = np.full(shape, fill, dtype=values.dtype)
+        full[valid] = np.where(found, values, fill)[inverse.ravel()]
+        out[key] = full
+    out["feasible"] = out["servers"] > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["server_cost"] = np.where(out["feasible"], out["servers"] * cost, np.nan)
+        out["waiting_cost"] = out["total_cost"] - out["server_cost"]
+        out["utilization"] = np.where(out["feasible"], lam / (out["servers"] * mu), np.nan)
+    return out
+
+
+def capacity_plan(arrival_rates, service_rates, server_cost, waiting_cost, max_wait=None, max_prob_wait=None,
+                  max_servers=100_000):
+    """Rencana kapasitas untuk profil kedatangan (mis. per jam selama seminggu).
+
+    ``arrival_rates`` berisi lambda per periode dan ``service_rates`` kandidat
+    mu; ``server_cost`` skalar atau per kandidat mu (mesin lebih cepat lebih
+    mahal). Mengembalikan ``grid`` (hasil :func:`optimal_servers` berbentuk
+    periode x kandidat), ``flexible`` (mu dan c terbaik per periode) dan
+    ``common`` (satu mu untuk semua periode dengan c per periode, dipilih
+    agar total biaya seluruh periode minimum; ``service_rate`` None bila tidak
+    ada mu yang layak di semua periode).
+    """
+    lam = np.atleast_1d(np.asarray(arrival_rates, dtype=float))
+    mu = np.atleast_1d(np.asarray(service_rates, dtype=float))
+    grid = optimal_servers(lam[:, None], mu[None, :], np.broadcast_to(server_cost, mu.shape)[None, :],
+                           waiting_cost, max_wait, max_prob_wait, max_servers)
+    cost = np.where(grid["feasible"], grid["total_cost"], np.inf)
+    periods = np.arange(lam.size)
+
+    best = cost.argmin(axis=1)
+    flexible = {key: grid[key][periods, best] for key in grid}
+    flexible["service_rate"] = np.where(flexible["feasible"], mu[best], np.nan)
+
+    totals = cost.sum(axis=0)
+    common = {"totals": totals}
+    if np.isfinite(totals).any():
+        j = int(totals.argmin())
+        common.update({key: grid[key][:, j] for key in grid})
+        common.update(service_rate=float(mu[j]), index=j, total=float(totals[j]))
+    else:
+        common.update(service_rate=None, index=None, total=float("inf"))
+    return {"grid": grid, "flexible": flexible, "common": common}
@@ -0,0 +1,365 @@
+"""Benchmark dan deteksi regresi performa untuk kernel perhitungan.
+
+Contoh::
+
+    python -m optimasi.benchmark run -o baseline.json
+    python -m optimasi.benchmark run --scale full --pages -o baseline.json
+    python -m optimasi.benchmark compare baseline.json            # jalankan ulang lalu bandingkan
+    python -m optimasi.benchmark compare baseline.json hasil.json --threshold 0.25
+
+Setiap kasus dijalankan ``repeat`` kali pada data sintetis berukuran
+bertingkat (jumlah bahan, jumlah server, langkah simulasi) dan dilaporkan
+sebagai persentil latensi, throughput (item/detik) dan memori puncak
+(``tracemalloc``, satu run terpisah agar tidak memengaruhi latensi). Fungsi
+ber-cache dijalankan di dalam :func:`~optimasi.cache.caches_bypassed`
+sehingga yang diukur adalah perhitungannya, termasuk fungsi ber-cache yang
+dipanggil di dalamnya, bukan pencarian cache. ``--pages`` menambahkan waktu rerun
+skrip Streamlit per halaman menu (headless, ``AppTest``).
+
+``compare`` keluar dengan kode 1 bila ada kasus yang latensi minimumnya
+(paling tahan noise mesin) atau memori puncaknya naik melebihi
+``threshold`` terhadap baseline.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from .cache import caches_bypassed
+
+# Ukuran data sintetis per skala
+SCALES = {
+    "quick": {"materials": (10, 1_000, 100_000), "servers": (1, 10, 100), "steps": (365, 8_760),
+              "products": (3, 100)},
+    "full": {"materials": (10, 1_000, 100_000, 1_000_000), "servers": (1, 10, 100, 1_000),
+             "steps": (365, 8_760, 87_600), "products": (3, 100, 1_000)},
+}
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "conroh_soal1.py")
+PAGES = ("Dashboard Utama", "Optimasi Produksi", "Model Persediaan (EOQ & ROP)", "Model Antrian",
+         "Analisis Terintegrasi")
+DEFAULT_THRESHOLD = 0.2
+
+
+def synthetic_materials(n, seed=0):
+    """Parameter persediaan acak untuk ``n`` bahan (kolom seperti ``eoq_table``)."""
+    rng = np.random.default_rng(seed)
+    return {
+        "demand": rng.uniform(1_000, 100_000, n),
+        "order_cost": rng.uniform(50_000, 500_000, n),
+        "holding_cost": rng.uniform(0.05, 0.4, n),
+        "unit_cost": rng.uniform(1_000, 50_000, n),
+        "lead_time": rng.integers(1, 30, n).astype(float),
+        "safety_stock": rng.uniform(0, 1_000, n),
+    }
+
+
+def synthetic_catalog(n_products, n_materials=None, seed=0):
+    """Dict ``PRODUCTS``/``BAHAN_BAKU`` acak dengan 2-4 bahan per produk."""
+    rng = np.random.default_rng(seed)
+    n_materials = n_materials or max(n_products * 2, 4)
+    bahan_baku = {
+        f"Bahan {j}": {"harga": float(rng.uniform(1_000, 50_000)), "lead_time": int(rng.integers(1, 30)),
+                       "holding_cost": float(rng.uniform(0.05, 0.4))}
+        for j in range(n_materials)
+    }
+    products = {}
+    for i in range(n_products):
+        used = rng.choice(n_materials, size=int(rng.integers(2, 5)), replace=False)
+        products[f"Produk {i}"] = {
+            "harga_jual": float(rng.uniform(10_000, 100_000)),
+            "biaya_produksi": float(rng.uniform(5_000, 9_000)),
+            "waktu_produksi": float(rng.uniform(0.5, 3)),
+            "bahan_baku": {f"Bahan {j}": float(r) for j, r in zip(used, rng.uniform(0.05, 1, used.size))},
+        }
+    return products, bahan_baku
+
+
+def kernel_cases(scale):
+    """List kasus ``(nama, jumlah item, fungsi tanpa argumen)`` untuk skala ``scale``."""
+    from .antrian import calculate_queue_metrics, calculate_queue_metrics_batch, optimal_servers
+    from .data import BAHAN_BAKU, PRODUCTS
+    from .jaringan import jackson_network, serial_routing
+    from .katalog import build_catalog
+    from .monte_carlo import optimize_safety_stock
+    from .mrp import catalog_mrp
+    from .penjadwalan import jobs_from_plan, schedule_jobs, setup_matrix
+    from .peramalan import fit_forecast
+    from .pengadaan import constrained_eoq, joint_replenishment
+    from .persediaan import calculate_eoq, calculate_eoq_batch, calculate_rop, calculate_rop_batch
+    from .produksi import optimize_production, optimize_production_plan
+    from .simulasi_persediaan import simulate_inventory
+    from .terintegrasi import integrated_analysis
+
+    sizes = SCALES[scale]
+    cases = [
+        ("eoq/scalar", 1, lambda: calculate_eoq(50_000, 200_000, 25, 8_000)),
+        ("rop/scalar", 1, lambda: calculate_rop(150.0, 7, 500)),
+    ]
+    for n in sizes["materials"]:
+        m = synthetic_materials(n)
+        cases.append((f"eoq_batch/materials={n}", n, lambda m=m: calculate_eoq_batch(**m)))
+        cases.append((f"rop_batch/materials={n}", n,
+                      lambda m=m: calculate_rop_batch(m["demand"] / 365, m["lead_time"], m["safety_stock"])))
+        # Batasan modal setengah dari kebutuhan EOQ tanpa batasan: bisection pengali selalu berjalan
+        budget = 0.5 * float(m["unit_cost"] @ calculate_eoq_batch(**m)["eoq"])
+        supplier = np.arange(n) % max(n // 10, 1)
+        cases.append((f"constrained_eoq/materials={n}", n, lambda m=m, b=budget: constrained_eoq(
+            m["demand"], m["order_cost"], m["holding_cost"], m["unit_cost"], budget_limit=b)))
+        cases.append((f"joint_replenishment/materials={n}", n, lambda m=m, b=budget, s=supplier: joint_replenishment(
+            m["demand"], 150_000, m["order_cost"] * 0.25, m["holding_cost"], m["unit_cost"], s,
+            budget_limit=b)))
+    for c in sizes["servers"]:
+        load = np.linspace(0.1, 0.95, 1_000) * c
+        cases.append((f"queue/servers={c}", 1, lambda c=c: calculate_queue_metrics(c * 0.8, 1.0, c)))
+        cases.append((f"queue_batch/servers={c}", load.size,
+                      lambda c=c, load=load: calculate_queue_metrics_batch(load, 1.0, c)))
+        # Profil mingguan per jam x 21 kandidat laju pelayanan dengan syarat waktu tunggu
+        hourly = (0.8 * c * (1 + 0.5 * np.sin(2 * np.pi * np.arange(168) / 24)))[:, None]
+        rates = np.linspace(0.5, 2.0, 21)[None, :]
+        cases.append((f"optimal_servers/servers={c}", hourly.size * rates.size,
+                      lambda h=hourly, r=rates: optimal_servers(h, r, 50 * r ** 0.8, 200, max_wait=0.05)))
+        # Varian lini 4 stasiun dengan rework: laju dan jumlah mesin berbeda per varian
+        rng = np.random.default_rng(c)
+        variants = load.size
+        routing = serial_routing(4, [(2, 1, 0.05), (3, 2, 0.03)])
+        rates = rng.uniform(1.0, 2.0, (variants, 4)) * c
+        machines = np.full((variants, 4), float(c))
+        cases.append((f"jackson_network/servers={c}", variants,
+                      lambda r=routing, m=rates, k=machines, c=c: jackson_network(
+                          np.array([0.8 * c, 0, 0, 0]), r, m, k)))
+    for n in sizes["products"]:
+        products, bahan_baku = synthetic_catalog(n)
+        cases.append((f"optimize_production/products={n}", n,
+                      lambda products=products: optimize_production(products, {})))
+        # MILP: batas waktu longgar agar regresi solver tidak tertutup oleh time_limit
+        constraints = {"kapasitas": 8.0 * max(n // 3, 1), "efisiensi": 0.85, "periode": 30,
+                       "biaya_setup": 50_000}
+        cases.append((f"optimize_production_plan/products={n}", n,
+                      lambda p=products, b=bahan_baku, k=constraints: optimize_production_plan(
+                          p, b, k, time_limit=60.0)))
+        catalog = build_catalog(products, bahan_baku)
+        weekly = np.random.default_rng(n).uniform(0, 500, (n, 52))
+        cases.append((f"catalog_mrp/products={n}", n * 52,
+                      lambda c=catalog, w=weekly: catalog_mrp(c, w, material_lot_size=1_000.0)))
+        history = np.random.default_rng(n).poisson(200, (n, 104)).astype(float)
+        cases.append((f"fit_forecast/series={n}", n,
+                      lambda y=history: fit_forecast(y, horizon=26, season_length=52)))
+        m = synthetic_materials(n)
+        daily = m["demand"] / 365
+        cases.append((f"optimize_safety_stock/materials={n}", n,
+                      lambda d=daily, m=m: optimize_safety_stock(d, m["lead_time"], d * 0.3,
+                                                                 m["lead_time"] * 0.2, workers=1, seed=0)))
+        units = np.random.default_rng(n).uniform(100, 2_000, n)
+        plan = [{"Produk": name, "Unit Diproduksi": float(u)} for name, u in zip(products, units)]
+        jobs = jobs_from_plan(plan, products, batch_units=200)
+        setup, initial = setup_matrix(products, bahan_baku)
+        cases.append((f"schedule_jobs/products={n}", jobs["product"].size,
+                      lambda j=jobs, s=setup, i=initial, k=max(n // 3, 2): schedule_jobs(
+                          j, k, s, i, time_limit=60.0)))
+    for steps in sizes["steps"]:
+        # Kelipatan 8760 disimulasikan per jam, selain itu per hari
+        steps_per_day = 24 if steps % 8_760 == 0 else 1
+        years = steps / (365 * steps_per_day)
+        m = synthetic_materials(len(BAHAN_BAKU))
+        daily = m["demand"] / 365
+        cases.append((f"simulate_inventory/steps={steps}", steps,
+                      lambda daily=daily, m=m, y=years, k=steps_per_day: simulate_inventory(
+                          daily, daily * 20, daily * m["lead_time"], m["lead_time"],
+                          demand_std=daily * 0.3, years=y, steps_per_day=k, seed=0)))
+    product = next(iter(PRODUCTS))
+    cases.append(("integrated_analysis", 1, lambda: integrated_analysis(
+        product, 1_000, 50, 0.95, 0.3, 0.1, PRODUCTS, BAHAN_BAKU)))
+    return cases
+
+
+def page_cases(app_path=APP_PATH):
+    """Kasus rerun penuh skrip Streamlit per halaman menu (membutuhkan ``streamlit.testing``)."""
+    from streamlit.testing.v1 import AppTest
+
+    cases = []
+    for page in PAGES:
+        app = AppTest.from_file(app_path, default_timeout=120)
+        app.run()
+        app.sidebar.selectbox[0].select(page)
+        app.run()  # run pertama halaman: isi cache; yang diukur rerun berikutnya
+
+        def rerun(app=app):
+            app.run()
+            if app.exception:
+                raise RuntimeError(app.exception[0].value)
+        cases.append((f"page/{page}", 1, rerun))
+    return cases
+
+
+def _autorange(func, min_ms):
+    """Jumlah panggilan per sampel agar satu sampel memakan minimal ``min_ms``."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if (time.perf_counter() - start) * 1000 >= min_ms or number >= 1 << 20:
+            return number
+        number *= 10
+
+
+def measure(func, items=1, repeat=7, min_sample_ms=5.0):
+    """Latensi (ms) per panggilan, throughput dan memori puncak satu fungsi.
+
+    Fungsi yang sangat cepat dipanggil berulang dalam satu sampel (seperti
+    ``timeit``) agar resolusi timer dan noise tidak mendominasi.
+    """
+    number = _autorange(func, min_sample_ms)  # sekaligus pemanasan
+    latencies = []
+    gc_enabled = gc.isenabled()
+    gc.disable()  # seperti timeit: jeda GC tidak ikut terukur
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            latencies.append((time.perf_counter() - start) * 1000 / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    latencies = np.array(latencies)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {
+        "items": items,
+        "runs": repeat,
+        "calls_per_run": number,
+        "min_ms": float(latencies.min()),
+        "mean_ms": float(latencies.mean()),
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "throughput": float(items / (p50 / 1000)) if p50 > 0 else float("inf"),
+        "peak_mb": peak / 2 ** 20,
+    }
+
+
+def run_benchmarks(scale="quick", repeat=7, pattern=None, pages=False, log=None):
+    """Menjalankan semua kasus yang namanya memuat ``pattern``; hasil siap disimpan sebagai JSON."""
+    cases = kernel_cases(scale)
+    if pages:
+        cases += page_cases()
+    results = {}
+    for name, items, func in cases:
+        if pattern and pattern not in name:
+            continue
+        if name.startswith("page/"):
+            results[name] = measure(func, items, repeat)  # rerun halaman memang memakai cache
+        else:
+            with caches_bypassed():
+                results[name] = measure(func, items, repeat)
+        if log is not None:
+            log(f"{name:<45} p50 {results[name]['p50_ms']:>10.3f} ms  "
+                f"{results[name]['throughput']:>14,.0f} item/s  {results[name]['peak_mb']:>8.1f} MB")
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "scale": scale,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Membandingkan dua hasil; mengembalikan list baris per kasus yang ada di keduanya.
+
+    Kasus ditandai ``regression`` bila rasio latensi minimum atau memori
+    puncak (saat ini / baseline) melebihi ``1 + threshold``.
+    """
+    rows = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        time_ratio = now["min_ms"] / base["min_ms"] if base["min_ms"] > 0 else 1.0
+        memory_ratio = now["peak_mb"] / base["peak_mb"] if base["peak_mb"] > 0 else 1.0
+        rows.append({
+            "case": name,
+            "baseline_ms": base["min_ms"],
+            "current_ms": now["min_ms"],
+            "time_ratio": time_ratio,
+            "memory_ratio": memory_ratio,
+            "regression": time_ratio > 1 + threshold or memory_ratio > 1 + threshold,
+        })
+    return rows
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m optimasi.benchmark",
+                                     description="Benchmark kernel perhitungan dan bandingkan dengan baseline.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="jalankan benchmark dan simpan hasil JSON")
+    run.add_argument("-o", "--output", help="file JSON hasil (default: hanya dicetak)")
+    compare_cmd = commands.add_parser("compare", help="bandingkan hasil dengan baseline JSON")
+    compare_cmd.add_argument("baseline", help="file JSON baseline")
+    compare_cmd.add_argument("current", nargs="?", help="file JSON pembanding (default: jalankan ulang)")
+    compare_cmd.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                             help="kenaikan relatif yang dianggap regresi (default 0.2 = 20%%)")
+    for sub in (run, compare_cmd):
+        sub.add_argument("--scale", choices=sorted(SCALES), default=None, help="ukuran data sintetis")
+        sub.add_argument("--repeat", type=int, default=7, help="jumlah sampel terukur per kasus")
+        sub.add_argument("-k", "--filter", help="hanya kasus yang namanya memuat teks ini")
+        sub.add_argument("--pages", action="store_true", help="ikut ukur rerun Streamlit per halaman")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "run":
+        result = run_benchmarks(args.scale or "quick", args.repeat, args.filter, args.pages, log=print)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as handle:
+                json.dump(result, handle, indent=2)
+            print(f"{len(result['results'])} kasus -> {args.output}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        if args.current:
+            with open(args.current, encoding="utf-8") as handle:
+                current = json.load(handle)
+        else:
+            pages = args.pages or any(name.startswith("page/") for name in baseline["results"])
+            current = run_benchmarks(args.scale or baseline["meta"]["scale"], args.repeat, args.filter, pages)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    rows = compare(baseline, current, args.threshold)
+    for row in rows:
+        flag = "REGRESI" if row["regression"] else "ok"
+        print(f"{row['case']:<45} {row['baseline_ms']:>10.3f} -> {row['current_ms']:>10.3f} ms  "
+              f"x{row['time_ratio']:.2f} waktu  x{row['memory_ratio']:.2f} memori  {flag}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{len(rows)} kasus dibandingkan, {regressions} regresi")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
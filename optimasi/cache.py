@@ -0,0 +1,325 @@
+"""Lapisan memoisasi LRU untuk fungsi perhitungan murni.
+
+Streamlit mengeksekusi ulang skrip pada setiap interaksi, sehingga cache tidak
+boleh disimpan pada objek yang dibuat ulang oleh skrip. Penyimpanan cache
+berada di registry tingkat proses ini dengan kunci modul, nama dan hash
+bytecode fungsi: fungsi yang didekorasi ulang pada rerun memakai cache yang
+sama, sedangkan fungsi yang kodenya berubah mendapat cache baru. Cache dibagi
+oleh semua sesi dan dilindungi lock; ukurannya dibatasi jumlah entri dan
+perkiraan byte. Array di hasil yang di-cache dibuat read-only dan dibagi,
+sedangkan dict/list/DataFrame diberikan sebagai salinan baru ke setiap
+pemanggil. Fungsi dengan ``persist=True`` juga memeriksa store disk aktif
+(:func:`optimasi.penyimpanan.configure_store`) sebelum menghitung.
+"""
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+_REGISTRY = {}
+_REGISTRY_LOCK = threading.Lock()
+# ResultStore aktif untuk memoize(persist=True); diatur lewat penyimpanan.configure_store
+_STORE = None
+# Kedalaman caches_bypassed() aktif: > 0 berarti semua fungsi memoize dihitung langsung
+_BYPASS_DEPTH = 0
+# Batas perkiraan ukuran hasil per fungsi memoize (byte)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _freeze(value):
+    """Mengubah argumen menjadi kunci yang hashable dan stabil antar pemanggilan."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        if array.dtype == object:
+            return ("object-array", array.shape, tuple(_freeze(v) for v in array.ravel()))
+        return ("ndarray", array.dtype.str, array.shape, _digest(array.tobytes()))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted(((_freeze(k), _freeze(v)) for k, v in value.items()), key=repr)))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(_freeze(v) for v in value))
+    module = type(value).__module__
+    if module.startswith("pandas"):
+        import pandas as pd
+
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            hashed = pd.util.hash_pandas_object(value, index=True).to_numpy()
+            columns = tuple(value.columns) if isinstance(value, pd.DataFrame) else value.name
+            return (type(value).__name__, _freeze(columns), _digest(hashed.tobytes()))
+    try:
+        hash(value)
+    except TypeError:
+        raise _Uncacheable(type(value).__name__) from None
+    return value
+
+
+def _make_read_only(result):
+    """Hasil dibagi antar pemanggil: array dibuat read-only agar tidak termodifikasi."""
+    if isinstance(result, np.ndarray):
+        result.setflags(write=False)
+    elif isinstance(result, dict):
+        for value in result.values():
+            _make_read_only(value)
+    elif isinstance(result, (list, tuple)):
+        for value in result:
+            _make_read_only(value)
+    return result
+
+
+def _fresh_containers(value):
+    """Salinan struktur hasil untuk satu pemanggil.
+
+    dict, list dan tuple dibuat ulang di setiap level dan DataFrame/Series
+    disalin, sehingga pemanggil yang mengubahnya tidak mengubah entri cache.
+    Array (sudah read-only) dan objek lain dibagi apa adanya.
+    """
+    kind = type(value)
+    if kind is dict:
+        return {key: _fresh_containers(item) for key, item in value.items()}
+    if kind is list:
+        return [_fresh_containers(item) for item in value]
+    if kind is tuple:
+        return tuple(_fresh_containers(item) for item in value)
+    if kind.__module__.startswith("pandas"):
+        import pandas as pd
+
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return value.copy()
+    return value
+
+
+def _approx_nbytes(value, seen=None):
+    """Perkiraan memori yang ditahan ``value`` (array, DataFrame, kontainer, atribut objek)."""
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _approx_nbytes(key, seen) + _approx_nbytes(item, seen) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_approx_nbytes(item, seen) for item in value)
+    if type(value).__module__.startswith("pandas"):
+        import pandas as pd
+
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True))
+    attributes = getattr(value, "__dict__", None)
+    if attributes is not None:
+        return sys.getsizeof(value) + _approx_nbytes(attributes, seen)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Penyimpanan LRU berukuran terbatas dengan penghitung hit/miss/eviksi.
+
+    Entri dikeluarkan bila jumlahnya melebihi ``maxsize`` atau perkiraan total
+    bytenya melebihi ``max_bytes``; hasil yang sendirian sudah melebihi
+    ``max_bytes`` tidak disimpan.
+    """
+
+    def __init__(self, name, maxsize, max_bytes=DEFAULT_MAX_BYTES):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.data = OrderedDict()
+        self.sizes = {}
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return True, self.data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        size = _approx_nbytes(value)
+        with self.lock:
+            if key in self.data:
+                self.nbytes -= self.sizes.pop(key)
+                del self.data[key]
+            if size > self.max_bytes:
+                self.evictions += 1
+                return
+            self.data[key] = value
+            self.sizes[key] = size
+            self.nbytes += size
+            while len(self.data) > self.maxsize or self.nbytes > self.max_bytes:
+                old_key, _ = self.data.popitem(last=False)
+                self.nbytes -= self.sizes.pop(old_key)
+                self.evictions += 1
+
+    def bypass(self):
+        with self.lock:
+            self.bypassed += 1
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.sizes.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = self.bypassed = 0
+
+    def info(self):
+        with self.lock:
+            return {
+                "function": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bypassed": self.bypassed,
+                "size": len(self.data),
+                "maxsize": self.maxsize,
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _code_bytes(code):
+    # Objek kode bersarang (lambda, comprehension) di-hash isinya, bukan repr-nya
+    # yang memuat alamat memori dan berubah setiap kali skrip dieksekusi ulang
+    parts = [code.co_code]
+    for const in code.co_consts:
+        parts.append(_code_bytes(const) if inspect.iscode(const) else repr(const).encode())
+    return b"\x00".join(parts)
+
+
+def _fingerprint(func):
+    return _digest(_code_bytes(func.__code__))
+
+
+def memoize(maxsize=128, random_arg=None, persist=False, max_bytes=DEFAULT_MAX_BYTES, ignore=()):
+    """Dekorator cache LRU berkunci parameter untuk fungsi murni.
+
+    Argumen dinormalisasi lewat ``inspect.signature`` (posisi, keyword dan
+    default menghasilkan kunci yang sama); array NumPy dan DataFrame di-hash
+    isinya. Bila ``random_arg`` (mis. ``"seed"``) bernilai None, pemanggilan
+    tidak di-cache karena hasilnya acak. Fungsi hasil dekorasi memiliki
+    ``cache_info()`` dan ``cache_clear()`` seperti ``functools.lru_cache``.
+    Dengan ``persist=True`` miss di memori dicari di store disk aktif dan
+    hasil baru ditulis ke sana (untuk perhitungan yang jauh lebih mahal
+    daripada membaca hasilnya dari disk). ``persist`` boleh berupa fungsi
+    ``hasil -> bool`` agar hanya hasil tertentu yang ditulis (mis. solusi
+    optimal, bukan hasil yang terpotong batas waktu). ``max_bytes`` membatasi
+    perkiraan total ukuran hasil yang disimpan di memori untuk fungsi ini.
+    Argumen bernama di ``ignore`` (mis. callback ``progress``) tidak ikut kunci.
+
+    Setiap pemanggil menerima salinan dict/list/DataFrame hasil; array di
+    dalamnya read-only dan dibagi dengan cache.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        fingerprint = _fingerprint(func)
+        with _REGISTRY_LOCK:
+            entry = _REGISTRY.get(name)
+            if entry is None or entry[0] != fingerprint:
+                # Kode fungsi berubah (atau baru): cache lama tidak berlaku lagi
+                entry = _REGISTRY[name] = (fingerprint, LRUCache(name, maxsize, max_bytes))
+            cache = entry[1]
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _BYPASS_DEPTH:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if random_arg is not None and bound.arguments.get(random_arg) is None:
+                cache.bypass()
+                return func(*args, **kwargs)
+            try:
+                call_key = _freeze(tuple(item for item in bound.arguments.items() if item[0] not in ignore))
+            except _Uncacheable:
+                cache.bypass()
+                return func(*args, **kwargs)
+
+            found, value = cache.get(call_key)
+            if found:
+                return _fresh_containers(value)
+            store = _STORE if persist else None
+            if store is not None:
+                from .penyimpanan import digest_key
+
+                store_key = digest_key((name, fingerprint, call_key))
+                found, value = store.get(store_key)
+                if found:
+                    cache.put(call_key, value)
+                    return _fresh_containers(value)
+            start = time.perf_counter()
+            value = _make_read_only(func(*args, **kwargs))
+            cache.put(call_key, value)
+            if store is not None and (persist is True or persist(value)):
+                store.put(store_key, value, name, time.perf_counter() - start)
+            return _fresh_containers(value)
+
+        wrapper.cache_info = cache.info
+        wrapper.cache_ignore = tuple(ignore)
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+@contextlib.contextmanager
+def caches_bypassed():
+    """Selama blok ``with`` semua fungsi ``memoize`` (termasuk yang dipanggil di
+    dalam fungsi lain) dihitung ulang tanpa membaca atau menulis cache/store.
+
+    Dipakai benchmark agar yang terukur adalah perhitungan, bukan pencarian cache.
+    Berlaku untuk seluruh proses, bukan hanya thread pemanggil.
+    """
+    global _BYPASS_DEPTH
+    with _REGISTRY_LOCK:
+        _BYPASS_DEPTH += 1
+    try:
+        yield
+    finally:
+        with _REGISTRY_LOCK:
+            _BYPASS_DEPTH -= 1
+
+
+def cache_stats():
+    """Statistik semua cache terdaftar sebagai list record (satu per fungsi)."""
+    with _REGISTRY_LOCK:
+        caches = [cache for _, cache in _REGISTRY.values()]
+    return [cache.info() for cache in caches]
+
+
+def clear_all_caches():
+    with _REGISTRY_LOCK:
+        caches = [cache for _, cache in _REGISTRY.values()]
+    for cache in caches:
+        cache.clear()
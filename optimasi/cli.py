@@ -0,0 +1,166 @@
+"""CLI batch analisis terintegrasi untuk banyak skenario tanpa server web.
+
+Contoh::
+
+    python -m optimasi skenario.csv -o hasil.parquet --materials bahan.csv
+
+File skenario berisi satu baris per skenario dengan kolom ``product``,
+``monthly_demand`` dan ``production_capacity``; kolom ``service_level``,
+``demand_cv`` dan ``lead_time_cv`` (pecahan 0-1) opsional. Format output
+ditentukan dari ekstensi file (``.csv`` atau ``.parquet``). Dengan ``--store``
+(atau ``$OPTIMASI_STORE_DIR``) hasil analisis disimpan di
+:class:`~optimasi.penyimpanan.ResultStore`, sehingga skenario yang sudah
+pernah dihitung (juga oleh aplikasi) dibaca dari disk.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+REQUIRED_COLUMNS = ("product", "monthly_demand", "production_capacity")
+DEFAULTS = {"service_level": 0.95, "demand_cv": 0.30, "lead_time_cv": 0.10}
+QUEUE_KEYS = ("utilization", "avg_wait_time", "avg_queue_length", "prob_wait")
+
+
+def _init_store(directory):
+    # Worker pool: fungsi memoize(persist=True) membaca/menulis store yang sama
+    if directory:
+        from .penyimpanan import configure_store
+
+        configure_store(directory)
+
+
+def _run_scenario(task):
+    """Worker: satu skenario -> (baris ringkasan, list baris bahan baku)."""
+    from .data import BAHAN_BAKU, PRODUCTS
+    from .terintegrasi import integrated_analysis
+
+    index, scenario, products, bahan_baku, order_cost, seed = task
+    analysis = integrated_analysis(
+        scenario["product"], scenario["monthly_demand"], scenario["production_capacity"],
+        service_level=scenario["service_level"],
+        demand_cv=scenario["demand_cv"],
+        lead_time_cv=scenario["lead_time_cv"],
+        products=products or PRODUCTS,
+        bahan_baku=bahan_baku or BAHAN_BAKU,
+        order_cost=order_cost,
+        seed=seed
+    )
+    queue = analysis["queue"] or {}
+    summary = {"scenario": index, **scenario}
+    for key in ("annual_demand", "daily_demand", "required_capacity", "capacity_utilization",
+                "total_inventory_cost", "monthly_revenue", "monthly_cost", "monthly_profit",
+                "overall_efficiency"):
+        summary[key] = float(analysis[key])
+    summary["queue_stable"] = analysis["queue"] is not None
+    for key in QUEUE_KEYS:
+        summary[f"queue_{key}"] = float(queue.get(key, float("nan")))
+    summary["recommendations"] = " | ".join(analysis["recommendations"])
+
+    materials = analysis["materials"]
+    columns = list(materials)
+    rows = [
+        {"scenario": index, "product": scenario["product"],
+         **{col: (materials[col][i] if col == "Bahan Baku" else float(materials[col][i])) for col in columns}}
+        for i in range(len(materials["Bahan Baku"]))
+    ]
+    return summary, rows
+
+
+def _load_catalog(path):
+    if path is None:
+        return None, None
+    with open(path, encoding="utf-8") as handle:
+        catalog = json.load(handle)
+    return catalog.get("products"), catalog.get("bahan_baku")
+
+
+def _read_scenarios(path):
+    import pandas as pd
+
+    scenarios = pd.read_parquet(path) if path.lower().endswith(".parquet") else pd.read_csv(path)
+    missing = [col for col in REQUIRED_COLUMNS if col not in scenarios.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan di {path}: {', '.join(missing)}")
+    for col, default in DEFAULTS.items():
+        if col not in scenarios.columns:
+            scenarios[col] = default
+        scenarios[col] = scenarios[col].fillna(default)
+    return scenarios[list(REQUIRED_COLUMNS) + list(DEFAULTS)]
+
+
+def _write_table(df, path):
+    if path.lower().endswith(".parquet"):
+        try:
+            df.to_parquet(path, index=False)
+        except ImportError as exc:
+            raise RuntimeError("Output Parquet membutuhkan pyarrow atau fastparquet; "
+                               "pasang salah satunya atau gunakan ekstensi .csv") from exc
+    else:
+        df.to_csv(path, index=False)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m optimasi",
+        description="Jalankan analisis terintegrasi untuk setiap skenario dalam file CSV/Parquet."
+    )
+    parser.add_argument("skenario", help="file skenario (.csv atau .parquet)")
+    parser.add_argument("-o", "--output", required=True, help="file hasil ringkasan (.csv atau .parquet)")
+    parser.add_argument("--materials", help="file hasil per bahan baku (opsional, .csv atau .parquet)")
+    parser.add_argument("--katalog", help="JSON berisi 'products' dan/atau 'bahan_baku' pengganti data bawaan")
+    parser.add_argument("--order-cost", type=float, default=None, help="biaya pemesanan per pesanan (Rp)")
+    parser.add_argument("--workers", type=int, default=1, help="jumlah proses paralel (0 = semua core)")
+    parser.add_argument("--seed", type=int, default=0, help="seed simulasi Monte Carlo")
+    parser.add_argument("--store", default=os.environ.get("OPTIMASI_STORE_DIR"),
+                        help="direktori penyimpanan hasil persisten (default: $OPTIMASI_STORE_DIR)")
+    parser.add_argument("--no-store", dest="store", action="store_const", const=None,
+                        help="hitung ulang semua skenario tanpa penyimpanan hasil")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    import pandas as pd
+
+    from .data import DEFAULT_ORDER_COST, PRODUCTS
+
+    try:
+        scenarios = _read_scenarios(args.skenario)
+        products, bahan_baku = _load_catalog(args.katalog)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    known = set(products or PRODUCTS)
+    unknown = sorted(set(scenarios["product"]) - known)
+    if unknown:
+        print(f"error: produk tidak dikenal: {', '.join(map(str, unknown))}", file=sys.stderr)
+        return 2
+
+    order_cost = DEFAULT_ORDER_COST if args.order_cost is None else args.order_cost
+    tasks = [
+        (index, scenario, products, bahan_baku, order_cost, args.seed)
+        for index, scenario in enumerate(scenarios.to_dict("records"))
+    ]
+    workers = (os.cpu_count() or 1) if args.workers == 0 else max(args.workers, 1)
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_store, initargs=(args.store,)) as pool:
+            results = list(pool.map(_run_scenario, tasks, chunksize=max(len(tasks) // (workers * 4), 1)))
+    else:
+        _init_store(args.store)
+        results = [_run_scenario(task) for task in tasks]
+
+    try:
+        _write_table(pd.DataFrame([summary for summary, _ in results]), args.output)
+        if args.materials:
+            _write_table(pd.DataFrame([row for _, rows in results for row in rows]), args.materials)
+    except (OSError, RuntimeError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"{len(results)} skenario diproses -> {args.output}")
+    return 0
@@ -0,0 +1,53 @@
+"""Data master produk dan bahan baku (contoh industri: Indofood)."""
+
+# Data produk dan bahan baku
+PRODUCTS = {
+    "Kecap Manis": {
+        "bahan_baku": {"Kedelai": 0.3, "Gula Aren": 0.2, "Garam": 0.05, "Air": 0.4},
+        "harga_jual": 15000,
+        "biaya_produksi": 8000,
+        "waktu_produksi": 2.5  # jam per unit
+    },
+    "Tepung Bogasari": {
+        "bahan_baku": {"Gandum": 0.8, "Pengawet": 0.02, "Vitamin": 0.01},
+        "harga_jual": 12000,
+        "biaya_produksi": 7000,
+        "waktu_produksi": 1.5
+    },
+    "Bumbu Racik": {
+        "bahan_baku": {"Bawang Merah": 0.25, "Bawang Putih": 0.15, "Cabai": 0.2, "Garam": 0.1, "Rempah": 0.3},
+        "harga_jual": 8000,
+        "biaya_produksi": 4500,
+        "waktu_produksi": 1.0
+    }
+}
+
+# "pemasok" mengelompokkan bahan untuk pesanan gabungan (joint replenishment)
+BAHAN_BAKU = {
+    "Kedelai": {"harga": 8000, "lead_time": 7, "holding_cost": 0.15, "pemasok": "CV Tani Makmur"},
+    "Gula Aren": {"harga": 12000, "lead_time": 5, "holding_cost": 0.12, "pemasok": "CV Tani Makmur"},
+    "Garam": {"harga": 3000, "lead_time": 3, "holding_cost": 0.08, "pemasok": "PT Garam Nusantara"},
+    "Air": {"harga": 500, "lead_time": 1, "holding_cost": 0.05, "pemasok": "PDAM"},
+    "Gandum": {"harga": 6000, "lead_time": 14, "holding_cost": 0.18, "pemasok": "PT Sentra Gandum"},
+    "Pengawet": {"harga": 25000, "lead_time": 21, "holding_cost": 0.25, "pemasok": "PT Kimia Pangan"},
+    "Vitamin": {"harga": 50000, "lead_time": 30, "holding_cost": 0.30, "pemasok": "PT Kimia Pangan"},
+    "Bawang Merah": {"harga": 15000, "lead_time": 2, "holding_cost": 0.20, "pemasok": "Pasar Induk Kramat Jati"},
+    "Bawang Putih": {"harga": 18000, "lead_time": 3, "holding_cost": 0.22, "pemasok": "Pasar Induk Kramat Jati"},
+    "Cabai": {"harga": 20000, "lead_time": 2, "holding_cost": 0.25, "pemasok": "Pasar Induk Kramat Jati"},
+    "Rempah": {"harga": 35000, "lead_time": 10, "holding_cost": 0.28, "pemasok": "Pasar Induk Kramat Jati"}
+}
+
+# Biaya pemesanan default per pesanan (Rp) untuk analisis terintegrasi
+DEFAULT_ORDER_COST = 200000
+
+# Lini produksi multi-tahap: jumlah mesin per stasiun dan laju layanan per mesin
+# relatif terhadap kapasitas produksi harian; rework = (dari, ke, probabilitas)
+PRODUCTION_LINE = {
+    "stasiun": {
+        "Mixing": {"mesin": 1, "laju_relatif": 1.5},
+        "Pemasakan": {"mesin": 2, "laju_relatif": 0.7},
+        "Pengisian": {"mesin": 1, "laju_relatif": 1.6},
+        "Pengemasan": {"mesin": 1, "laju_relatif": 2.0},
+    },
+    "rework": [("Pengisian", "Pemasakan", 0.05), ("Pengemasan", "Pengisian", 0.03)],
+}
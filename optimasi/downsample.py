@@ -0,0 +1,116 @@
+"""Downsampling deret waktu panjang di sisi server sebelum dikirim ke browser.
+
+Grafik selebar ``w`` piksel tidak dapat menampilkan lebih dari sekitar ``w``
+titik yang berbeda, sehingga deret jutaan titik cukup dikirim sebagai
+beberapa ribu titik yang mempertahankan bentuk visualnya:
+
+* ``"lttb"`` (Largest-Triangle-Three-Buckets): satu titik per ember, dipilih
+  yang membentuk segitiga terbesar dengan titik terpilih sebelumnya dan
+  rata-rata ember berikutnya; menjaga bentuk umum kurva.
+* ``"minmax"``: titik minimum dan maksimum setiap ember (tervektorisasi
+  penuh); menjaga puncak dan lembah, mis. stockout singkat.
+
+:func:`scattergl_trace` membungkus hasilnya menjadi ``go.Scattergl``
+(WebGL) dengan array ``float32`` yang diserialisasi Plotly sebagai typed
+array biner, dan :func:`update_line_figure` memperbarui figure yang sudah
+ada alih-alih membangun ulang figure pada setiap rerun.
+"""
+
+import numpy as np
+
+DEFAULT_WIDTH_PX = 1200
+METHODS = ("lttb", "minmax", "none")
+
+
+def minmax_indices(y, n_buckets):
+    """Indeks minimum dan maksimum setiap ember, terurut naik (maks. ``2 * n_buckets``)."""
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    size = int(np.ceil(n / n_buckets))
+    n_buckets = int(np.ceil(n / size))
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    low = np.where(np.isnan(blocks), np.inf, blocks).argmin(axis=1) + offsets
+    high = np.where(np.isnan(blocks), -np.inf, blocks).argmax(axis=1) + offsets
+    return np.unique(np.concatenate([[0], low, high, [n - 1]]))
+
+
+def lttb_indices(x, y, n_out):
+    """Indeks titik terpilih algoritma LTTB (titik pertama dan terakhir selalu ikut)."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Ember di antara titik pertama dan terakhir; batas dihitung sekali
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    # Rata-rata setiap ember (untuk titik "C" segitiga) dihitung vektor lewat cumsum
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    counts = np.maximum(np.diff(edges), 1)
+    mean_x = np.append((cx[edges[1:]] - cx[edges[:-1]]) / counts, x[-1])
+    mean_y = np.append((cy[edges[1:]] - cy[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        bx, by = x[start:stop], y[start:stop]
+        # Luas (x2) segitiga A-B-C untuk setiap kandidat B dalam ember
+        area = np.abs((x[a] - mean_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (mean_y[i + 1] - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(x, y, width_px=DEFAULT_WIDTH_PX, method="lttb"):
+    """Mengembalikan ``(x, y)`` yang sudah diperkecil untuk grafik selebar ``width_px``."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if method == "lttb":
+        index = lttb_indices(x, y, width_px)
+    elif method == "minmax":
+        index = minmax_indices(y, width_px)
+    elif method == "none":
+        return x, y
+    else:
+        raise ValueError(f"Metode '{method}' tidak dikenal; pilih salah satu dari {METHODS}")
+    return x[index], y[index]
+
+
+def scattergl_trace(x, y, width_px=DEFAULT_WIDTH_PX, method="lttb", **kwargs):
+    """``go.Scattergl`` berisi deret yang sudah di-downsample dengan payload ``float32``."""
+    import plotly.graph_objects as go
+
+    x_small, y_small = downsample(x, y, width_px, method)
+    return go.Scattergl(x=np.asarray(x_small, dtype=np.float32), y=np.asarray(y_small, dtype=np.float32),
+                        **kwargs)
+
+
+def update_line_figure(figure, series, width_px=DEFAULT_WIDTH_PX, method="lttb", **layout):
+    """Membuat atau memperbarui figure garis WebGL untuk ``series`` (list dict trace).
+
+    Setiap elemen ``series`` berisi ``x``, ``y`` dan argumen trace lain
+    (``name``, ``line``...). Bila ``figure`` sudah memiliki jumlah trace yang
+    sama, data trace dan layout diperbarui di tempat sehingga objek figure
+    dapat dipakai ulang antar rerun; bila tidak, figure baru dibuat.
+    """
+    import plotly.graph_objects as go
+
+    traces = [scattergl_trace(s["x"], s["y"], width_px, method,
+                              **{k: v for k, v in s.items() if k not in ("x", "y")})
+              for s in series]
+    if figure is None or len(figure.data) != len(traces):
+        figure = go.Figure(data=traces)
+    else:
+        with figure.batch_update():
+            for old, new in zip(figure.data, traces):
+                old.update(new.to_plotly_json(), overwrite=True)
+    figure.update_layout(**layout)
+    return figure
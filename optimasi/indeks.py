@@ -0,0 +1,118 @@
+"""Indeks read-only bahan baku dan produk yang dihitung sekali per proses.
+
+:class:`MaterialIndex` menyimpan metrik turunan per bahan (harga, biaya simpan,
+kebutuhan tahunan acuan, EOQ pada biaya pesan default, permintaan selama lead
+time) dan per produk (profit, profit per jam, biaya bahan per unit), ditambah
+indeks balik bahan -> produk pemakainya. Pertanyaan seperti "produk mana yang
+terdampak bila lead time Garam berubah" menjadi satu pencarian dict, bukan
+pemindaian ``PRODUCTS[*]["bahan_baku"]``. Semua array dibuat read-only karena
+satu objek dibagi oleh semua sesi (``st.cache_resource``/:func:`build_material_index`).
+"""
+
+import numpy as np
+
+from .cache import memoize
+from .data import DEFAULT_ORDER_COST
+from .katalog import build_catalog
+from .persediaan import calculate_eoq_batch
+
+# Permintaan bulanan acuan per produk (sama dengan default input aplikasi)
+REFERENCE_MONTHLY_DEMAND = 1000
+
+
+def _frozen(table):
+    for value in table.values():
+        value.setflags(write=False)
+    return table
+
+
+class MaterialIndex:
+    """Metrik turunan per bahan/produk dan indeks balik bahan -> produk."""
+
+    def __init__(self, catalog, order_cost=DEFAULT_ORDER_COST, monthly_demand=REFERENCE_MONTHLY_DEMAND):
+        self.catalog = catalog
+        self.order_cost = order_cost
+        materials = catalog.materials
+        products = catalog.products
+
+        annual_product = np.full(catalog.n_products, monthly_demand * 12.0)
+        annual_material = catalog.material_demand(annual_product)
+        daily_material = annual_material / 365
+        inventory = calculate_eoq_batch.__wrapped__(annual_material, order_cost, materials["holding_cost"],
+                                                    materials["harga"])
+        users = np.diff(catalog.bom.T.indptr)
+        self.materials = _frozen({
+            "name": np.asarray(materials["name"]),
+            "harga": np.asarray(materials["harga"], dtype=float),
+            "holding_cost": np.asarray(materials["holding_cost"], dtype=float),
+            "holding_per_unit": materials["holding_cost"] * materials["harga"],
+            "lead_time": np.asarray(materials["lead_time"], dtype=float),
+            "annual_demand": annual_material,
+            "daily_demand": daily_material,
+            "lead_time_demand": daily_material * materials["lead_time"],
+            "eoq": inventory["eoq"],
+            "total_cost": inventory["total_cost"],
+            "n_products": users,
+        })
+        unit_profit = catalog.unit_profit()
+        self.products = _frozen({
+            "name": np.asarray(products["name"]),
+            "unit_profit": unit_profit,
+            "profit_per_hour": unit_profit / products["waktu_produksi"],
+            "material_cost": catalog.bom.dot(materials["harga"]),
+            "n_materials": np.diff(catalog.bom.indptr),
+        })
+
+        material_names = self.materials["name"].tolist()
+        product_names = self.products["name"].tolist()
+        self._material_pos = {name: i for i, name in enumerate(material_names)}
+        self._product_pos = {name: i for i, name in enumerate(product_names)}
+        by_material = catalog.bom.T
+        self._users = {name: tuple(product_names[j] for j in by_material.row(i)[0])
+                       for i, name in enumerate(material_names)}
+        self._uses = {name: tuple(material_names[j] for j in catalog.bom.row(i)[0])
+                      for i, name in enumerate(product_names)}
+
+    def products_using(self, material):
+        """Produk yang memakai ``material`` (tuple; KeyError bila bahan tidak dikenal)."""
+        return self._users[material]
+
+    def materials_of(self, product):
+        return self._uses[product]
+
+    def affected_products(self, materials):
+        """Gabungan produk yang terdampak perubahan salah satu bahan dalam ``materials``."""
+        affected = set()
+        for material in materials:
+            affected.update(self._users[material])
+        return sorted(affected, key=self._product_pos.__getitem__)
+
+    def material(self, name):
+        """Metrik satu bahan sebagai dict skalar."""
+        i = self._material_pos[name]
+        return {key: (value[i].item() if key != "name" else str(value[i])) for key, value in self.materials.items()}
+
+    def product(self, name):
+        i = self._product_pos[name]
+        return {key: (value[i].item() if key != "name" else str(value[i])) for key, value in self.products.items()}
+
+    def material_table(self):
+        """Ringkasan per bahan sebagai dict kolom (siap untuk ``pd.DataFrame``)."""
+        m = self.materials
+        return {
+            "Bahan Baku": m["name"],
+            "Harga (Rp/kg)": m["harga"],
+            "Biaya Simpan (Rp/kg/tahun)": m["holding_per_unit"],
+            "Lead Time (hari)": m["lead_time"],
+            "Kebutuhan Acuan (kg/tahun)": m["annual_demand"],
+            "EOQ Acuan (kg)": m["eoq"],
+            "Permintaan Lead Time (kg)": m["lead_time_demand"],
+            "Dipakai Produk": [", ".join(self._users[name]) for name in m["name"].tolist()],
+        }
+
+
+@memoize(maxsize=4)
+def build_material_index(products, bahan_baku, order_cost=DEFAULT_ORDER_COST,
+                         monthly_demand=REFERENCE_MONTHLY_DEMAND):
+    """:class:`MaterialIndex` untuk dict ``PRODUCTS``/``BAHAN_BAKU`` (di-cache per isi dict)."""
+    return MaterialIndex(build_catalog(products, bahan_baku), order_cost, monthly_demand)
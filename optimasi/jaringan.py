@@ -0,0 +1,151 @@
+"""Jaringan antrian Jackson terbuka untuk lini produksi multi-tahap.
+
+Setiap stasiun adalah antrian M/M/c; setelah dilayani di stasiun i, unit
+berpindah ke stasiun j dengan probabilitas ``routing[i, j]`` atau keluar dari
+sistem dengan sisa probabilitasnya (loop rework cukup ditulis sebagai peluang
+kembali ke stasiun sebelumnya). Laju kedatangan total per stasiun dari
+persamaan trafik ``lambda = gamma + P^T lambda`` diselesaikan dengan satu
+``np.linalg.solve`` untuk seluruh batch varian, lalu metrik M/M/c eksak per
+stasiun dihitung dengan :func:`~optimasi.antrian.calculate_queue_metrics_batch`.
+Dimensi terakhir adalah stasiun; dimensi di depannya (varian routing, jumlah
+mesin, laju layanan) di-broadcast bersama.
+"""
+
+import itertools
+
+import numpy as np
+
+from .antrian import calculate_queue_metrics_batch
+from .cache import memoize
+
+STATION_COLUMNS = (
+    "Stasiun", "Mesin", "Laju Kedatangan (unit/jam)", "Kunjungan per Unit", "Utilisasi",
+    "Panjang Antrian", "WIP (unit)", "Waktu Tunggu (jam)", "Waktu di Stasiun (jam)",
+)
+
+
+def serial_routing(n_stations, rework=()):
+    """Matriks routing lini seri (stasiun i ke i+1, stasiun terakhir keluar).
+
+    ``rework`` berisi ``(dari, ke, probabilitas)`` dengan indeks stasiun;
+    probabilitas tersebut diambil dari aliran maju (atau keluar, untuk
+    stasiun terakhir) stasiun asal. ValueError bila ada stasiun yang tidak
+    dapat mencapai jalan keluar (unit berputar selamanya dalam loop rework).
+    """
+    routing = np.zeros((n_stations, n_stations))
+    routing[np.arange(n_stations - 1), np.arange(1, n_stations)] = 1.0
+    for source, target, probability in rework:
+        if source < n_stations - 1:
+            routing[source, source + 1] -= probability
+        routing[source, target] += probability
+    if np.any(routing < -1e-12) or np.any(routing.sum(axis=1) > 1 + 1e-12):
+        raise ValueError("Probabilitas rework melebihi aliran keluar stasiun")
+    # Stasiun yang dapat keluar: peluang keluar langsung, atau berpindah ke stasiun yang dapat keluar
+    reaches_exit = 1 - routing.sum(axis=1) > 1e-12
+    while True:
+        extended = reaches_exit | (routing[:, reaches_exit] > 1e-12).any(axis=1)
+        if np.array_equal(extended, reaches_exit):
+            break
+        reaches_exit = extended
+    if not reaches_exit.all():
+        stuck = ", ".join(str(i) for i in np.flatnonzero(~reaches_exit))
+        raise ValueError(f"Loop rework tanpa jalan keluar dari lini (stasiun indeks {stuck})")
+    return routing
+
+
+def traffic_rates(external_arrivals, routing):
+    """Laju kedatangan total per stasiun dari persamaan trafik ``(I - P^T) lambda = gamma``."""
+    gamma = np.asarray(external_arrivals, dtype=float)
+    routing = np.asarray(routing, dtype=float)
+    n = routing.shape[-1]
+    if np.any(routing < 0) or np.any(routing.sum(axis=-1) > 1 + 1e-9):
+        raise ValueError("Setiap baris routing harus berisi probabilitas dengan jumlah <= 1")
+    batch = np.broadcast_shapes(gamma.shape[:-1], routing.shape[:-2])
+    system = np.broadcast_to(np.eye(n) - np.swapaxes(routing, -1, -2), batch + (n, n))
+    gamma = np.broadcast_to(gamma, batch + (n,))
+    try:
+        rates = np.linalg.solve(system, gamma[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        raise ValueError("Routing memiliki siklus tanpa jalan keluar (I - P^T singular)") from None
+    return rates
+
+
+@memoize(maxsize=64)
+def jackson_network(external_arrivals, routing, service_rate, servers=1):
+    """Metrik stasiun dan end-to-end jaringan Jackson terbuka (banyak varian sekaligus).
+
+    ``external_arrivals`` (..., n) laju masuk dari luar per stasiun,
+    ``routing`` (..., n, n), ``service_rate`` (mu per mesin) dan ``servers``
+    (c) berbentuk (..., n). Mengembalikan dict array per stasiun
+    (``arrival_rate``, ``visits``, ``utilization``, ``avg_queue_length``,
+    ``avg_system_length``, ``avg_wait_time``, ``avg_system_time``,
+    ``station_stable``)
+    dan per varian: ``throughput``, ``wip`` (total unit dalam sistem),
+    ``lead_time`` (jam, hukum Little), ``bottleneck`` (indeks stasiun
+    berutilisasi tertinggi), ``max_throughput`` (laju masuk saat bottleneck
+    jenuh) dan ``stable``. Varian tidak stabil bernilai NaN.
+    """
+    gamma = np.asarray(external_arrivals, dtype=float)
+    rates = traffic_rates(gamma, routing)
+    mu, c = np.broadcast_arrays(np.asarray(service_rate, dtype=float), np.asarray(servers, dtype=float))
+    rates, mu, c = np.broadcast_arrays(rates, mu, c)
+    nodes = calculate_queue_metrics_batch.__wrapped__(rates, mu, c)
+
+    throughput = np.broadcast_to(gamma.sum(axis=-1), rates.shape[:-1])
+    stable = nodes["stable"].all(axis=-1)
+    wip = np.where(stable, nodes["avg_system_length"].sum(axis=-1), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lead_time = np.where(stable & (throughput > 0), wip / throughput, np.nan)
+        visits = rates / throughput[..., None]
+        # lambda linear terhadap gamma: skala maksimum sebelum stasiun mana pun jenuh
+        headroom = np.where(rates > 0, c * mu / rates, np.inf).min(axis=-1)
+    return {
+        "arrival_rate": rates,
+        "visits": visits,
+        "servers": nodes["servers"],
+        "utilization": nodes["utilization"],
+        "avg_queue_length": nodes["avg_queue_length"],
+        "avg_system_length": nodes["avg_system_length"],
+        "avg_wait_time": nodes["avg_wait_time"],
+        "avg_system_time": nodes["avg_system_time"],
+        "station_stable": nodes["stable"],
+        "throughput": throughput,
+        "wip": wip,
+        "lead_time": lead_time,
+        "bottleneck": np.argmax(np.nan_to_num(nodes["utilization"], nan=np.inf), axis=-1),
+        "max_throughput": throughput * headroom,
+        "stable": stable,
+    }
+
+
+def station_table(network, names):
+    """Tabel per stasiun (kolom ``STATION_COLUMNS``) untuk satu varian jaringan."""
+    return dict(zip(STATION_COLUMNS, (
+        list(names),
+        network["servers"],
+        network["arrival_rate"],
+        network["visits"],
+        network["utilization"],
+        network["avg_queue_length"],
+        network["avg_system_length"],
+        network["avg_wait_time"],
+        network["avg_system_time"],
+    )))
+
+
+def server_variants(external_arrivals, routing, service_rate, max_servers):
+    """Semua kombinasi jumlah mesin 1..``max_servers[i]`` per stasiun dievaluasi sekaligus.
+
+    Mengembalikan dict ``servers`` (varian, stasiun), ``total_servers``,
+    ``lead_time``, ``wip``, ``bottleneck`` dan ``stable`` per varian.
+    """
+    grid = np.array(list(itertools.product(*(range(1, int(m) + 1) for m in max_servers))), dtype=float)
+    network = jackson_network.__wrapped__(external_arrivals, routing, service_rate, grid)
+    return {
+        "servers": grid.astype(np.int64),
+        "total_servers": grid.sum(axis=1).astype(np.int64),
+        "lead_time": network["lead_time"],
+        "wip": network["wip"],
+        "bottleneck": network["bottleneck"],
+        "stable": network["stable"],
+    }
@@ -0,0 +1,197 @@
+"""Penyimpanan data master kolumnar: tabel produk, tabel bahan baku dan BOM jarang.
+
+Setiap atribut produk/bahan disimpan sebagai satu array NumPy, dan bill of
+materials sebagai matriks CSR produk x bahan (kg bahan per unit produk).
+Kebutuhan bahan untuk vektor permintaan apa pun cukup satu perkalian
+``BOM.T @ permintaan``. Katalog dapat dimuat dari CSV/Parquet (format
+panjang untuk BOM: ``product, material, ratio``) lalu disimpan sebagai
+direktori ``.npy`` yang dibuka kembali dengan memory-mapping.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .cache import memoize
+from .sparse import CSRMatrix
+
+PRODUCT_FIELDS = ("harga_jual", "biaya_produksi", "waktu_produksi")
+MATERIAL_FIELDS = ("harga", "lead_time", "holding_cost")
+BOM_COLUMNS = ("product", "material", "ratio")
+
+
+class _NameIndex:
+    """Pencarian nama -> posisi secara vektor (``searchsorted`` pada nama terurut)."""
+
+    def __init__(self, names):
+        self.names = np.asarray(names).astype(str)
+        self.order = np.argsort(self.names, kind="stable")
+        self.sorted = self.names[self.order]
+        if self.sorted.size > 1 and np.any(self.sorted[1:] == self.sorted[:-1]):
+            raise ValueError("Nama duplikat dalam katalog")
+
+    def lookup(self, names, missing="raise"):
+        names = np.asarray(names).astype(str)
+        pos = np.clip(np.searchsorted(self.sorted, names), 0, max(self.sorted.size - 1, 0))
+        found = self.sorted[pos] == names if self.sorted.size else np.zeros(names.shape, dtype=bool)
+        if missing == "raise" and not found.all():
+            unknown = ", ".join(map(str, np.unique(names[~found])[:5]))
+            raise KeyError(f"Nama tidak dikenal dalam katalog: {unknown}")
+        return np.where(found, self.order[pos] if self.sorted.size else -1, -1)
+
+
+class MasterData:
+    """Katalog produk dan bahan baku dalam bentuk array kolumnar.
+
+    ``products`` dan ``materials`` adalah dict kolom (``name`` + field numerik),
+    ``bom`` adalah :class:`CSRMatrix` berukuran (produk, bahan).
+    """
+
+    def __init__(self, products, materials, bom):
+        self.products = {key: np.asarray(value) for key, value in products.items()}
+        self.materials = {key: np.asarray(value) for key, value in materials.items()}
+        if bom.shape != (self.n_products, self.n_materials):
+            raise ValueError(f"BOM berukuran {bom.shape}, seharusnya {(self.n_products, self.n_materials)}")
+        self.bom = bom
+        self._product_index = _NameIndex(self.products["name"])
+        self._material_index = _NameIndex(self.materials["name"])
+
+    @property
+    def n_products(self):
+        return len(self.products["name"])
+
+    @property
+    def n_materials(self):
+        return len(self.materials["name"])
+
+    # --- konstruksi -------------------------------------------------------
+
+    @classmethod
+    def from_dicts(cls, products, bahan_baku):
+        """Membangun katalog dari dict bersarang gaya ``PRODUCTS``/``BAHAN_BAKU``.
+
+        Bahan yang dirujuk BOM tetapi tidak ada di ``bahan_baku`` diabaikan,
+        sama seperti analisis terintegrasi.
+        """
+        product_names = list(products)
+        material_names = list(bahan_baku)
+        material_pos = {name: i for i, name in enumerate(material_names)}
+        rows, cols, ratios = [], [], []
+        for i, name in enumerate(product_names):
+            for material, ratio in products[name]["bahan_baku"].items():
+                if material in material_pos:
+                    rows.append(i)
+                    cols.append(material_pos[material])
+                    ratios.append(ratio)
+        product_table = {"name": np.array(product_names, dtype=str)}
+        product_table.update({f: np.array([products[p][f] for p in product_names], dtype=float)
+                              for f in PRODUCT_FIELDS})
+        material_table = {"name": np.array(material_names, dtype=str)}
+        material_table.update({f: np.array([bahan_baku[m][f] for m in material_names], dtype=float)
+                               for f in MATERIAL_FIELDS})
+        bom = CSRMatrix.from_coo(rows, cols, ratios, (len(product_names), len(material_names)))
+        return cls(product_table, material_table, bom)
+
+    @classmethod
+    def from_frames(cls, products, materials, bom):
+        """Membangun katalog dari tiga DataFrame (produk, bahan, BOM format panjang)."""
+        # Nama sebagai unicode lebar-tetap (bukan object) agar bisa di-memory-map
+        product_table = {"name": products["name"].to_numpy().astype(str)}
+        product_table.update({f: products[f].to_numpy(dtype=float) for f in PRODUCT_FIELDS})
+        material_table = {"name": materials["name"].to_numpy().astype(str)}
+        material_table.update({f: materials[f].to_numpy(dtype=float) for f in MATERIAL_FIELDS})
+        product_col, material_col, ratio_col = BOM_COLUMNS
+        rows = _NameIndex(product_table["name"]).lookup(bom[product_col].to_numpy())
+        cols = _NameIndex(material_table["name"]).lookup(bom[material_col].to_numpy())
+        matrix = CSRMatrix.from_coo(rows, cols, bom[ratio_col].to_numpy(dtype=float),
+                                    (len(product_table["name"]), len(material_table["name"])))
+        return cls(product_table, material_table, matrix)
+
+    @classmethod
+    def from_files(cls, products_path, materials_path, bom_path):
+        """Memuat katalog dari file CSV atau Parquet (ditentukan dari ekstensi).
+
+        File dibaca dengan ``memory_map=True`` sehingga OS memetakan file
+        langsung tanpa salinan buffer tambahan.
+        """
+        import pandas as pd
+
+        def read(path):
+            if str(path).lower().endswith(".parquet"):
+                return pd.read_parquet(path, memory_map=True)
+            return pd.read_csv(path, memory_map=True)
+
+        return cls.from_frames(read(products_path), read(materials_path), read(bom_path))
+
+    # --- penyimpanan .npy dengan memory-mapping ---------------------------
+
+    def save(self, directory):
+        """Menyimpan semua kolom dan BOM sebagai file ``.npy`` di ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        arrays = {f"product_{k}": v for k, v in self.products.items()}
+        arrays.update({f"material_{k}": v for k, v in self.materials.items()})
+        arrays.update(bom_indptr=self.bom.indptr, bom_indices=self.bom.indices, bom_data=self.bom.data)
+        for key, value in arrays.items():
+            np.save(os.path.join(directory, f"{key}.npy"), np.asarray(value))
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as handle:
+            json.dump({"products": list(self.products), "materials": list(self.materials),
+                       "shape": list(self.bom.shape)}, handle)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        """Membuka katalog hasil :meth:`save`; kolom numerik dan BOM di-memory-map."""
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as handle:
+            meta = json.load(handle)
+
+        def array(key):
+            return np.load(os.path.join(directory, f"{key}.npy"), mmap_mode=mmap_mode)
+
+        products = {k: array(f"product_{k}") for k in meta["products"]}
+        materials = {k: array(f"material_{k}") for k in meta["materials"]}
+        bom = CSRMatrix(array("bom_indptr"), array("bom_indices"), array("bom_data"), meta["shape"])
+        return cls(products, materials, bom)
+
+    # --- kueri --------------------------------------------------------------
+
+    def product_index(self, names, missing="raise"):
+        """Posisi produk untuk satu nama atau array nama.
+
+        Nama tidak dikenal memicu KeyError, atau bernilai -1 bila ``missing="ignore"``.
+        """
+        return self._product_index.lookup(names, missing)
+
+    def material_index(self, names):
+        return self._material_index.lookup(names)
+
+    def product_materials(self, product):
+        """(nama bahan, rasio kg per unit) untuk satu produk."""
+        cols, ratios = self.bom.row(int(self.product_index(product)))
+        return self.materials["name"][cols], ratios
+
+    def material_demand(self, product_demand):
+        """Kebutuhan bahan = ``BOM.T @ product_demand``.
+
+        ``product_demand`` berbentuk (produk,) atau (produk, periode); hasilnya
+        (bahan,) atau (bahan, periode).
+        """
+        return self.bom.T.dot(product_demand)
+
+    def unit_profit(self):
+        return self.products["harga_jual"] - self.products["biaya_produksi"]
+
+    def product_table(self):
+        """Ringkasan per produk sebagai dict kolom (siap untuk ``pd.DataFrame``)."""
+        return {
+            "Produk": self.products["name"],
+            "Harga Jual": self.products["harga_jual"],
+            "Biaya Produksi": self.products["biaya_produksi"],
+            "Profit": self.unit_profit(),
+            "Waktu Produksi": self.products["waktu_produksi"],
+        }
+
+
+@memoize(maxsize=8)
+def build_catalog(products, bahan_baku):
+    """:class:`MasterData` untuk dict ``PRODUCTS``/``BAHAN_BAKU`` (di-cache per isi dict)."""
+    return MasterData.from_dicts(products, bahan_baku)
@@ -0,0 +1,176 @@
+"""Material Requirements Planning (MRP) multi-level, tervektorisasi antar periode.
+
+Item (produk jadi, setengah jadi, bahan baku) diurutkan menurut low-level
+code: kedalaman maksimum item dalam struktur BOM. Item pada level yang sama
+diproses sekaligus sebagai matriks (item x periode):
+
+* kebutuhan kotor = permintaan independen + rilis pesanan induk x rasio BOM,
+* kekurangan kumulatif ``S_t = sum(kotor - penerimaan terjadwal) - (on hand - safety stock)``,
+* penerimaan terencana kumulatif = running max ``S_t`` (dibulatkan ke kelipatan
+  ``lot_size`` bila ada), sehingga netting lot-for-lot tidak perlu loop periode,
+* rilis pesanan = penerimaan terencana digeser ``lead_time`` periode ke belakang.
+
+Loop Python hanya ada per level BOM, bukan per item atau per periode.
+"""
+
+import numpy as np
+
+from .sparse import CSRMatrix
+
+
+def _per_item(value, n_items):
+    return np.broadcast_to(np.asarray(value, dtype=float), (n_items,)).copy()
+
+
+def bom_from_edges(items, parents, components, quantities):
+    """Matriks BOM item x item (induk -> komponen, jumlah per unit induk) dari daftar relasi."""
+    position = {name: i for i, name in enumerate(items)}
+    try:
+        rows = [position[p] for p in parents]
+        cols = [position[c] for c in components]
+    except KeyError as exc:
+        raise KeyError(f"Item BOM tidak dikenal: {exc.args[0]}") from None
+    return CSRMatrix.from_coo(rows, cols, quantities, (len(items), len(items)))
+
+
+def low_level_codes(bom):
+    """Low-level code setiap item: 0 untuk item puncak, level terdalam untuk komponen.
+
+    Dihitung dengan relaksasi serempak atas semua relasi BOM; ``ValueError``
+    bila BOM memiliki siklus.
+    """
+    n_items = bom.shape[0]
+    parents, children = bom.row_ids(), bom.indices
+    level = np.zeros(n_items, dtype=np.int64)
+    for _ in range(n_items + 1):
+        candidate = level.copy()
+        np.maximum.at(candidate, children, level[parents] + 1)
+        if np.array_equal(candidate, level):
+            return level
+        level = candidate
+    raise ValueError("BOM mengandung siklus; MRP membutuhkan struktur tanpa siklus")
+
+
+def _net_level(gross, receipts, on_hand, safety_stock, lot_size):
+    """Netting lot-for-lot / kelipatan lot untuk satu blok item (item x periode)."""
+    shortfall = np.cumsum(gross - receipts, axis=1) - (on_hand - safety_stock)[:, None]
+    cumulative_net = np.maximum(np.maximum.accumulate(shortfall, axis=1), 0.0)
+    cumulative_planned = cumulative_net.copy()
+    fixed = lot_size > 0
+    if fixed.any():
+        lots = lot_size[fixed, None]
+        cumulative_planned[fixed] = np.ceil(cumulative_net[fixed] / lots - 1e-9) * lots
+    return (np.diff(cumulative_planned, axis=1, prepend=0.0), np.diff(cumulative_net, axis=1, prepend=0.0))
+
+
+def _offset(planned, lead_periods):
+    """Menggeser penerimaan terencana ke periode rilis; rilis sebelum periode 0 = past due."""
+    n_items, n_periods = planned.shape
+    target = np.arange(n_periods)[None, :] - lead_periods[:, None]
+    rows = np.broadcast_to(np.arange(n_items)[:, None], planned.shape)
+    releases = np.bincount((rows * n_periods + np.maximum(target, 0)).ravel(),
+                           weights=planned.ravel(), minlength=n_items * n_periods)
+    past_due = np.where(target < 0, planned, 0.0).sum(axis=1)
+    return releases.reshape(n_items, n_periods), past_due
+
+
+def explode_mrp(bom, demand, lead_time=0, on_hand=0.0, scheduled_receipts=None,
+                safety_stock=0.0, lot_size=0.0, period_days=7):
+    """Menjalankan MRP untuk seluruh item dan seluruh periode.
+
+    ``bom`` adalah :class:`CSRMatrix` item x item; ``demand`` permintaan
+    independen berbentuk (item, periode). ``lead_time`` dalam hari dan
+    dibulatkan ke atas menjadi periode sepanjang ``period_days``. ``lot_size``
+    0 berarti lot-for-lot, nilai positif berarti pesanan kelipatan lot.
+
+    Mengembalikan dict array (item, periode): ``gross_requirements``,
+    ``scheduled_receipts``, ``net_requirements``, ``planned_receipts``,
+    ``planned_releases``, ``projected_on_hand``; serta per item
+    ``past_due`` (rilis yang seharusnya sudah dilakukan sebelum periode 0),
+    ``lead_periods`` dan ``low_level_code``.
+    """
+    demand = np.atleast_2d(np.asarray(demand, dtype=float))
+    n_items, n_periods = demand.shape
+    if bom.shape != (n_items, n_items):
+        raise ValueError(f"BOM berukuran {bom.shape}, permintaan untuk {n_items} item")
+    receipts = (np.zeros_like(demand) if scheduled_receipts is None
+                else np.broadcast_to(np.asarray(scheduled_receipts, dtype=float), demand.shape).copy())
+    on_hand = _per_item(on_hand, n_items)
+    safety_stock = _per_item(safety_stock, n_items)
+    lot_size = np.nan_to_num(_per_item(lot_size, n_items))
+    lead_periods = np.ceil(_per_item(lead_time, n_items) / period_days - 1e-9).astype(np.int64)
+
+    levels = low_level_codes(bom)
+    gross = demand.copy()
+    net = np.zeros_like(demand)
+    planned = np.zeros_like(demand)
+    releases = np.zeros_like(demand)
+    past_due = np.zeros(n_items)
+    parents, children = bom.row_ids(), bom.indices
+
+    for level in range(int(levels.max()) + 1 if n_items else 0):
+        items = np.flatnonzero(levels == level)
+        planned[items], net[items] = _net_level(gross[items], receipts[items], on_hand[items],
+                                                safety_stock[items], lot_size[items])
+        releases[items], past_due[items] = _offset(planned[items], lead_periods[items])
+
+        # Kebutuhan dependen: rilis induk pada level ini diteruskan ke komponennya
+        edges = levels[parents] == level
+        if edges.all():
+            gross += bom.T.dot(releases)  # BOM satu level: transpos tersimpan di matriks
+        elif edges.any():
+            dependent = CSRMatrix.from_coo(children[edges], parents[edges], bom.data[edges],
+                                           (n_items, n_items))
+            gross += dependent.dot(releases)
+
+    projected = on_hand[:, None] + np.cumsum(receipts + planned - gross, axis=1)
+    return {
+        "gross_requirements": gross,
+        "scheduled_receipts": receipts,
+        "net_requirements": net,
+        "planned_receipts": planned,
+        "planned_releases": releases,
+        "projected_on_hand": projected,
+        "past_due": past_due,
+        "lead_periods": lead_periods,
+        "low_level_code": levels,
+    }
+
+
+def catalog_mrp(catalog, product_demand, material_on_hand=0.0, material_receipts=None,
+                material_safety_stock=0.0, material_lot_size=0.0, period_days=7,
+                product_lead_time=0):
+    """MRP untuk katalog :class:`~optimasi.katalog.MasterData` (produk -> bahan baku).
+
+    ``product_demand`` berbentuk (produk, periode). Produk diasumsikan tanpa
+    stok barang jadi dan diproduksi dalam ``product_lead_time`` hari; parameter
+    ``material_*`` per bahan. Hasil :func:`explode_mrp` dipotong ke baris bahan
+    baku dan ditambah ``materials`` (nama bahan).
+    """
+    product_demand = np.atleast_2d(np.asarray(product_demand, dtype=float))
+    n_products, n_materials = catalog.n_products, catalog.n_materials
+    n_items = n_products + n_materials
+    bom = catalog.bom
+    items_bom = CSRMatrix(np.concatenate([bom.indptr, np.full(n_materials, bom.indptr[-1])]),
+                          bom.indices + n_products, bom.data, (n_items, n_items))
+
+    def stacked(product_value, material_value):
+        return np.concatenate([_per_item(product_value, n_products), _per_item(material_value, n_materials)])
+
+    demand = np.vstack([product_demand, np.zeros((n_materials, product_demand.shape[1]))])
+    receipts = None
+    if material_receipts is not None:
+        receipts = np.zeros_like(demand)
+        receipts[n_products:] = material_receipts
+    plan = explode_mrp(
+        items_bom, demand,
+        lead_time=stacked(product_lead_time, catalog.materials["lead_time"]),
+        on_hand=stacked(0.0, material_on_hand),
+        scheduled_receipts=receipts,
+        safety_stock=stacked(0.0, material_safety_stock),
+        lot_size=stacked(0.0, material_lot_size),
+        period_days=period_days,
+    )
+    result = {key: value[n_products:] for key, value in plan.items()}
+    result["materials"] = catalog.materials["name"]
+    return result
@@ -0,0 +1,420 @@
+"""Eksekusi perhitungan berat di latar belakang pada pool proses bersama.
+
+Skrip Streamlit mengirim pekerjaan (fungsi + argumen) ke :class:`JobManager`
+lalu cukup memeriksa statusnya pada setiap rerun, sehingga thread skrip sesi
+tidak terblokir dan semua core terpakai oleh pekerjaan dari banyak sesi.
+
+* Pekerjaan dikunci dengan kunci yang sama seperti :func:`~optimasi.cache.memoize`
+  (nama fungsi, hash kode dan argumen): pengiriman identik dari sesi lain
+  selama pekerjaan masih berjalan, atau hasilnya masih disimpan, memakai
+  pekerjaan yang sama.
+* ``owner`` (mis. ``(id_sesi, "kubus sensitivitas")``) menandai slot pemakai;
+  pengiriman baru pada slot yang sama melepas pekerjaan lama, dan pekerjaan
+  yang tidak lagi punya pemilik dibatalkan. Elemen pertama ``owner`` adalah
+  grupnya (sesi): :meth:`JobManager.release_idle` melepas semua slot grup yang
+  tidak aktif (sesi browser yang sudah ditutup), dan slot pekerjaan selesai
+  ikut dilepas saat pekerjaan itu keluar dari daftar yang disimpan.
+* Fungsi yang menerima argumen ``progress`` (seperti
+  :func:`~optimasi.sensitivitas.run_sweep`) mendapat callback
+  ``progress(selesai, total, partial=None)`` yang mengirim progres dan hasil
+  sementara ke proses utama, sekaligus titik pembatalan: callback
+  memunculkan :class:`JobCancelled` bila pekerjaan dibatalkan saat berjalan.
+  Pekerjaan yang sedang berjalan hanya berhenti di panggilan ``progress``;
+  fungsi tanpa parameter itu baru berhenti setelah selesai, jadi kernel berat
+  (simulasi persediaan dan antrian) memanggilnya secara berkala. Fungsi
+  :func:`~optimasi.cache.memoize` mengecualikan ``progress`` dari kuncinya
+  lewat ``ignore``.
+* Dengan ``store`` (:class:`~optimasi.penyimpanan.ResultStore`) hasil yang
+  selesai ditulis ke disk, dan pengiriman yang hasilnya sudah tersimpan
+  langsung selesai tanpa menyentuh pool, juga setelah server dimulai ulang.
+"""
+
+import inspect
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .cache import _fingerprint, _freeze, _fresh_containers, _make_read_only, _Uncacheable
+from .penyimpanan import digest_key
+
+# Jumlah pekerjaan antre/berjalan bersamaan (satu flag pembatalan per slot)
+MAX_SLOTS = 256
+# Pekerjaan selesai yang hasilnya disimpan untuk pengiriman ulang/polling
+KEEP_FINISHED = 32
+# Jeda minimum (detik) antar laporan progres dari worker
+PROGRESS_INTERVAL = 0.1
+# Grup pemilik (sesi) tanpa aktivitas selama ini dianggap sudah berakhir
+IDLE_SECONDS = 30 * 60
+
+PENDING, RUNNING, CANCELLING = "menunggu", "berjalan", "membatalkan"
+DONE, FAILED, CANCELLED = "selesai", "gagal", "dibatalkan"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Pekerjaan dibatalkan; dimunculkan di worker oleh callback ``progress``."""
+
+
+class QueueFull(RuntimeError):
+    """Semua ``MAX_SLOTS`` slot pekerjaan sedang dipakai; kirim ulang nanti."""
+
+
+# --- sisi worker ------------------------------------------------------------------
+
+_WORKER = {}
+
+
+def _init_worker(flags, channel):
+    # Flag dan antrean diwarisi saat proses worker dibuat (tidak bisa di-pickle per tugas)
+    _WORKER["flags"] = flags
+    _WORKER["channel"] = channel
+
+
+class _Reporter:
+    def __init__(self, job_id, slot):
+        self.job_id = job_id
+        self.slot = slot
+        self.last = 0.0
+
+    def __call__(self, done, total=None, partial=None):
+        if _WORKER["flags"][self.slot]:
+            raise JobCancelled()
+        now = time.monotonic()
+        if partial is not None or now - self.last >= PROGRESS_INTERVAL or (total and done >= total):
+            self.last = now
+            _WORKER["channel"].put((self.job_id, done, total, partial))
+
+
+def _execute(job_id, slot, func, args, kwargs, progress_arg):
+    if _WORKER["flags"][slot]:
+        raise JobCancelled()
+    if progress_arg is not None:
+        kwargs = {**kwargs, progress_arg: _Reporter(job_id, slot)}
+    return func(*args, **kwargs)
+
+
+# --- sisi proses utama --------------------------------------------------------------
+
+def job_key(func, *args, **kwargs):
+    """Kunci dedup pemanggilan ``func(*args, **kwargs)``; None bila argumen tidak dapat di-hash."""
+    target = getattr(func, "__wrapped__", func)
+    bound = inspect.signature(target).bind(*args, **kwargs)
+    bound.apply_defaults()
+    ignore = getattr(func, "cache_ignore", ())
+    try:
+        return (f"{target.__module__}.{target.__qualname__}", _fingerprint(target),
+                _freeze(tuple(item for item in bound.arguments.items() if item[0] not in ignore)))
+    except _Uncacheable:
+        return None
+
+
+def _group(owner):
+    """Grup pemilik: elemen pertama tuple ``owner`` (mis. id sesi), selain itu ``owner`` sendiri."""
+    return owner[0] if isinstance(owner, tuple) and owner else owner
+
+
+class Job:
+    """Status satu pekerjaan; objek yang sama dibagi oleh semua sesi pengirimnya.
+
+    ``result`` dan ``partial`` memberikan salinan dict/list/DataFrame baru pada
+    setiap akses (seperti hasil :func:`~optimasi.cache.memoize`); array di
+    dalamnya read-only dan dibagi.
+    """
+
+    def __init__(self, job_id, key, label, slot):
+        self.id = job_id
+        self.key = key
+        self.label = label
+        self.slot = slot
+        self.status = PENDING
+        self.done = 0
+        self.total = None
+        self._partial = None
+        self._result = None
+        self.error = None
+        self.owners = set()
+        self.submitted = time.time()
+        self.finished_at = None
+        self.future = None
+        self._event = threading.Event()
+
+    @property
+    def result(self):
+        return _fresh_containers(self._result)
+
+    @property
+    def partial(self):
+        return _fresh_containers(self._partial)
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    @property
+    def fraction(self):
+        """Progres 0-1 (None bila fungsi tidak melaporkan total)."""
+        if self.status == DONE:
+            return 1.0
+        return min(self.done / self.total, 1.0) if self.total else None
+
+    def wait(self, timeout=None):
+        """Menunggu paling lama ``timeout`` detik; True bila pekerjaan sudah selesai."""
+        self._event.wait(timeout)
+        return self.finished
+
+    def info(self):
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return {"id": self.id, "pekerjaan": self.label, "status": self.status,
+                "progres": self.fraction, "pemilik": len(self.owners), "detik": end - self.submitted,
+                "error": self.error}
+
+
+class JobManager:
+    """Antrean pekerjaan latar belakang di atas ``ProcessPoolExecutor`` bersama.
+
+    Satu objek per proses server (mis. lewat ``st.cache_resource``). Pool
+    memakai konteks ``forkserver`` (``spawn`` bila tidak tersedia) agar worker
+    tidak mewarisi thread server Streamlit.
+    """
+
+    def __init__(self, max_workers=None, keep_finished=KEEP_FINISHED, mp_context=None, store=None):
+        if mp_context is None:
+            methods = multiprocessing.get_all_start_methods()
+            mp_context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.keep_finished = keep_finished
+        self.store = store
+        self._context = mp_context
+        self._flags = mp_context.Array("b", MAX_SLOTS, lock=False)
+        self._channel = mp_context.Queue()
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._free_slots = list(range(MAX_SLOTS - 1, -1, -1))
+        self._jobs = {}  # id -> Job (belum selesai atau masih disimpan)
+        self._by_key = {}  # kunci -> Job yang dapat dipakai ulang
+        self._owners = {}  # pemilik -> Job
+        self._seen = {}  # grup pemilik -> waktu aktivitas terakhir (monotonic)
+        self._finished = OrderedDict()  # id -> Job selesai (LRU)
+        self._pool = self._new_pool()
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_progress, name="job-progress", daemon=True)
+        self._reader.start()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context,
+                                   initializer=_init_worker, initargs=(self._flags, self._channel))
+
+    # --- pengiriman ---------------------------------------------------------------
+
+    def submit(self, func, *args, owner=None, label=None, progress_arg="progress", **kwargs):
+        """Mengirim ``func(*args, **kwargs)`` (fungsi tingkat modul yang dapat di-pickle).
+
+        Mengembalikan :class:`Job` baru atau yang sudah ada untuk kunci yang
+        sama. ``progress_arg`` adalah nama parameter callback progres; bila
+        ``func`` tidak memilikinya, pekerjaan hanya melaporkan selesai.
+        Memunculkan :class:`QueueFull` bila semua slot pekerjaan terpakai.
+        """
+        key = job_key(func, *args, **kwargs)
+        target = getattr(func, "__wrapped__", func)
+        if progress_arg not in inspect.signature(target).parameters:
+            progress_arg = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("JobManager sudah dihentikan")
+            job = self._by_key.get(key) if key is not None else None
+            if job is None and key is not None and self.store is not None:
+                job = self._restore(key, label or target.__name__)
+            if job is None:
+                job = self._start(key, label or target.__name__, func, args, kwargs, progress_arg)
+            elif job.id in self._finished:
+                self._finished.move_to_end(job.id)
+            if owner is not None:
+                self._assign(owner, job)
+            return job
+
+    def _start(self, key, label, func, args, kwargs, progress_arg):
+        if not self._free_slots:
+            raise QueueFull(f"Antrean pekerjaan penuh ({MAX_SLOTS} pekerjaan aktif)")
+        slot = self._free_slots.pop()
+        self._flags[slot] = 0
+        job = Job(next(self._ids), key, label, slot)
+        self._jobs[job.id] = job
+        if key is not None:
+            self._by_key[key] = job
+        try:
+            job.future = self._pool.submit(_execute, job.id, slot, func, args, kwargs, progress_arg)
+        except BrokenProcessPool:
+            self._pool = self._new_pool()
+            job.future = self._pool.submit(_execute, job.id, slot, func, args, kwargs, progress_arg)
+        job.future.add_done_callback(lambda future, job=job: self._complete(job, future))
+        return job
+
+    def _restore(self, key, label):
+        found, value = self.store.get(digest_key(key))
+        if not found:
+            return None
+        job = Job(next(self._ids), key, label, None)
+        job._result = value
+        job.status = DONE
+        job.finished_at = job.submitted
+        job._event.set()
+        self._jobs[job.id] = job
+        self._by_key[key] = job
+        self._retain(job)
+        return job
+
+    def _assign(self, owner, job):
+        self._seen[_group(owner)] = time.monotonic()
+        previous = self._owners.get(owner)
+        self._owners[owner] = job
+        job.owners.add(owner)
+        if previous is not None and previous is not job:
+            previous.owners.discard(owner)
+            if not previous.owners:
+                self._cancel(previous)
+
+    # --- status & pembatalan --------------------------------------------------------
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def poll(self, job):
+        """Memperbarui status berjalan dari future lalu mengembalikan ``job``."""
+        with self._lock:
+            if job.status == PENDING and job.future is not None and job.future.running():
+                job.status = RUNNING
+        return job
+
+    def release(self, owner):
+        """Melepas slot ``owner``; pekerjaannya dibatalkan bila tidak ada pemilik lain."""
+        with self._lock:
+            job = self._owners.pop(owner, None)
+            if job is not None:
+                job.owners.discard(owner)
+                if not job.owners:
+                    self._cancel(job)
+
+    def touch(self, group):
+        """Menandai grup pemilik (sesi) masih aktif, mis. dari fragmen yang menunggu hasil."""
+        with self._lock:
+            self._seen[group] = time.monotonic()
+
+    def release_idle(self, max_idle=IDLE_SECONDS):
+        """Melepas semua slot milik grup yang tidak aktif selama ``max_idle`` detik.
+
+        Streamlit tidak memberi tahu skrip saat sesi berakhir; dipanggil pada
+        setiap rerun agar pekerjaan dan hasil sesi yang sudah ditutup tidak
+        tertahan. Mengembalikan jumlah slot yang dilepas.
+        """
+        cutoff = time.monotonic() - max_idle
+        with self._lock:
+            idle = {group for group, seen in self._seen.items() if seen < cutoff}
+            if not idle:
+                return 0
+            for group in idle:
+                del self._seen[group]
+            owners = [owner for owner in self._owners if _group(owner) in idle]
+            for owner in owners:
+                self.release(owner)
+            return len(owners)
+
+    def cancel(self, job):
+        """Membatalkan ``job`` untuk semua pemiliknya."""
+        with self._lock:
+            for owner in list(job.owners):
+                if self._owners.get(owner) is job:
+                    del self._owners[owner]
+            job.owners.clear()
+            self._cancel(job)
+
+    def _cancel(self, job):
+        if job.finished:
+            return
+        if self._by_key.get(job.key) is job:
+            del self._by_key[job.key]  # pengiriman berikutnya memulai pekerjaan baru
+        if job.future.cancel():
+            return  # belum berjalan: _complete dipanggil oleh future
+        job.status = CANCELLING
+        self._flags[job.slot] = 1  # diperiksa worker pada laporan progres berikutnya
+
+    def _complete(self, job, future):
+        with self._lock:
+            if future.cancelled():
+                job.status = CANCELLED
+            else:
+                error = future.exception()
+                if error is None:
+                    job._result = _make_read_only(future.result())
+                    job.status = DONE
+                    job.done = job.total if job.total else job.done
+                elif isinstance(error, JobCancelled):
+                    job.status = CANCELLED
+                else:
+                    job.status = FAILED
+                    job.error = f"{type(error).__name__}: {error}"
+                    if isinstance(error, BrokenProcessPool) and not self._closed:
+                        self._pool = self._new_pool()
+            job.finished_at = time.time()
+            job.future = None
+            self._flags[job.slot] = 0
+            self._free_slots.append(job.slot)
+            if job.status != DONE and self._by_key.get(job.key) is job:
+                del self._by_key[job.key]  # gagal/batal: tidak dipakai ulang
+            self._retain(job)
+            job._event.set()
+        if job.status == DONE and job.key is not None and self.store is not None:
+            # Ditulis di luar lock: hasil besar tidak menahan submit/poll sesi lain
+            self.store.put(digest_key(job.key), job._result, job.key[0], job.finished_at - job.submitted)
+
+    def _retain(self, job):
+        self._finished[job.id] = job
+        while len(self._finished) > self.keep_finished:
+            _, old = self._finished.popitem(last=False)
+            self._jobs.pop(old.id, None)
+            for owner in old.owners:
+                if self._owners.get(owner) is old:
+                    del self._owners[owner]
+            old.owners.clear()
+            if self._by_key.get(old.key) is old:
+                del self._by_key[old.key]
+
+    def _read_progress(self):
+        while True:
+            try:
+                message = self._channel.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            job_id, done, total, partial = message
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.finished:
+                    continue
+                job.done, job.total = done, total
+                if partial is not None:
+                    job._partial = _make_read_only(partial)
+                if job.status == PENDING:
+                    job.status = RUNNING
+
+    def jobs(self):
+        """Ringkasan semua pekerjaan yang dikenal (aktif dan selesai tersimpan)."""
+        with self._lock:
+            return [job.info() for job in self._jobs.values()]
+
+    def shutdown(self, wait=True):
+        """Membatalkan semua pekerjaan lalu menghentikan pool dan thread pembaca progres."""
+        with self._lock:
+            self._closed = True
+            for job in list(self._jobs.values()):
+                self._cancel(job)
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        self._channel.put(None)
+        if wait:
+            self._reader.join()
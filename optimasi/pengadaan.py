@@ -0,0 +1,267 @@
+"""Optimasi persediaan multi-bahan dengan batasan bersama.
+
+EOQ per bahan dihitung terpisah mengabaikan dua hal: gudang dan modal dipakai
+bersama, dan bahan dari pemasok yang sama dapat dikirim dalam satu pesanan.
+
+* :func:`constrained_eoq` meminimumkan total biaya pesan + simpan semua bahan
+  dengan ``sum(space_i * Q_i) <= space_limit`` (kapasitas gudang bila semua
+  pesanan tiba bersamaan) dan ``sum(unit_cost_i * Q_i) <= budget_limit`` (modal
+  maksimum yang terikat di persediaan siklus). Relaksasi Lagrange memberi
+  ``Q_i = sqrt(2 D_i S_i / (h_i + 2 l_s space_i + 2 l_b unit_cost_i))``;
+  pengali ``l_s``/``l_b`` dicari dengan bisection yang setiap langkahnya
+  mengevaluasi seluruh bahan sebagai satu array.
+* :func:`joint_replenishment` memesan bahan satu pemasok pada siklus dasar
+  ``T`` pemasok dengan kelipatan bulat ``k_i`` (metode RAND/Silver, semua
+  pemasok diiterasi serentak), dengan batasan yang sama lewat pengali Lagrange.
+
+``holding_cost`` mengikuti :func:`~optimasi.persediaan.calculate_eoq_batch`,
+yaitu persentase per tahun terhadap ``unit_cost``.
+"""
+
+import numpy as np
+
+from .cache import memoize
+from .data import DEFAULT_ORDER_COST
+from .katalog import build_catalog
+
+# Toleransi relatif bisection pengali Lagrange dan batas iterasi RAND
+RELATIVE_TOLERANCE = 1e-9
+MAX_RAND_ITERATIONS = 50
+
+# Pembagian default biaya pesan: pengiriman per pemasok (mayor) + tambahan per bahan (minor)
+DEFAULT_MAJOR_COST = 0.75 * DEFAULT_ORDER_COST
+DEFAULT_MINOR_COST = DEFAULT_ORDER_COST - DEFAULT_MAJOR_COST
+
+
+def _bisect(usage, limit):
+    """Pengali terkecil (dalam toleransi) dengan ``usage(pengali) <= limit``; ``usage`` menurun."""
+    if usage(0.0) <= limit:
+        return 0.0
+    lo, hi = 0.0, 1.0
+    while usage(hi) > limit:
+        lo, hi = hi, hi * 4
+        if hi > 1e300:
+            raise ValueError("Batasan tidak dapat dipenuhi")
+    while hi - lo > RELATIVE_TOLERANCE * hi:
+        mid = 0.5 * (lo + hi)
+        if usage(mid) > limit:
+            lo = mid
+        else:
+            hi = mid
+    return hi  # sisi yang memenuhi batasan
+
+
+def _solve_multipliers(order, holding, space, unit_cost, space_limit, budget_limit):
+    """Pengali gudang dan anggaran untuk ``order(holding_efektif) -> Q``.
+
+    Bila kedua batasan aktif, bisection anggaran membungkus bisection gudang;
+    pemakaian anggaran tetap menurun terhadap pengalinya karena fungsi dual
+    yang sudah dimaksimumkan terhadap pengali gudang tetap cekung.
+    """
+    for name, limit in (("space_limit", space_limit), ("budget_limit", budget_limit)):
+        if limit is not None and not limit > 0:
+            raise ValueError(f"{name} harus positif")
+
+    def space_multiplier(budget_multiplier):
+        if space_limit is None:
+            return 0.0
+        base = holding + 2 * budget_multiplier * unit_cost
+        return _bisect(lambda l_s: space @ order(base + 2 * l_s * space), space_limit)
+
+    def effective(budget_multiplier):
+        l_s = space_multiplier(budget_multiplier)
+        return holding + 2 * l_s * space + 2 * budget_multiplier * unit_cost, l_s
+
+    if budget_limit is None:
+        l_b = 0.0
+    else:
+        l_b = _bisect(lambda l_b: unit_cost @ order(effective(l_b)[0]), budget_limit)
+    h_eff, l_s = effective(l_b)
+    return h_eff, l_s, l_b
+
+
+def _prepare(demand, holding_cost, unit_cost, space_per_unit, *costs):
+    arrays = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in
+                                   (demand, holding_cost, unit_cost, space_per_unit) + costs))
+    demand, holding_cost, unit_cost, space = (np.ascontiguousarray(a) for a in arrays[:4])
+    if np.any(demand < 0) or np.any(holding_cost * unit_cost <= 0) or np.any(space < 0):
+        raise ValueError("Permintaan dan ruang tidak boleh negatif, biaya simpan harus positif")
+    return demand, holding_cost * unit_cost, unit_cost, space, [np.ascontiguousarray(a) for a in arrays[4:]]
+
+
+def _usage(quantity, unit_cost, space, l_s, l_b):
+    return {
+        "space_used": float(space @ quantity),
+        "budget_used": float(unit_cost @ quantity),
+        "space_multiplier": l_s,
+        "budget_multiplier": l_b,
+    }
+
+
+def constrained_eoq(demand, order_cost, holding_cost, unit_cost, space_per_unit=1.0,
+                    space_limit=None, budget_limit=None):
+    """EOQ semua bahan sekaligus di bawah batasan gudang dan/atau anggaran bersama.
+
+    ``demand`` tahunan per bahan; ``space_per_unit`` ruang per unit (default 1,
+    sehingga ``space_limit`` dalam kg). Batasan None berarti tidak dibatasi.
+    Mengembalikan dict array ``eoq``, ``order_frequency``, ``ordering_cost``,
+    ``holding_cost``, ``total_cost`` per bahan serta ``space_used``,
+    ``budget_used`` dan pengali Lagrange (``*_multiplier``, Rp per unit
+    batasan per tahun: nilai melonggarkan batasan satu unit).
+    """
+    demand, holding, unit_cost, space, (order_cost,) = _prepare(
+        demand, holding_cost, unit_cost, space_per_unit, order_cost)
+    numerator = 2 * demand * order_cost
+
+    def order(h_eff):
+        return np.sqrt(numerator / h_eff)
+
+    h_eff, l_s, l_b = _solve_multipliers(order, holding, space, unit_cost, space_limit, budget_limit)
+    quantity = order(h_eff)
+    has_orders = quantity > 0
+    frequency = np.where(has_orders, demand / np.where(has_orders, quantity, 1.0), 0.0)
+    ordering = frequency * order_cost
+    holding_total = quantity / 2 * holding
+    return {
+        "eoq": quantity,
+        "order_frequency": frequency,
+        "ordering_cost": ordering,
+        "holding_cost": holding_total,
+        "total_cost": ordering + holding_total,
+        **_usage(quantity, unit_cost, space, l_s, l_b),
+    }
+
+
+def _rand_cycle(hd, minor, major, family, n_families):
+    """Siklus dasar ``T`` per pemasok dan kelipatan ``k`` per bahan (iterasi RAND dari k = 1)."""
+    active = hd > 0
+    minor = np.where(active, minor, 0.0)  # bahan tanpa permintaan tidak pernah dipesan
+    k = np.ones(hd.size)
+    for _ in range(MAX_RAND_ITERATIONS):
+        numerator = major * (np.bincount(family, weights=active, minlength=n_families) > 0) \
+            + np.bincount(family, weights=minor / k, minlength=n_families)
+        denominator = np.bincount(family, weights=k * hd, minlength=n_families)
+        cycle = np.sqrt(2 * numerator / np.where(denominator > 0, denominator, 1.0))
+        # k terbaik memenuhi k(k-1) <= x <= k(k+1) dengan x = 2 s / (h D T^2)
+        t = cycle[family]
+        x = 2 * minor / np.where(active, hd * t ** 2, 1.0)
+        new_k = np.where(active, np.maximum(np.ceil((np.sqrt(1 + 4 * x) - 1) / 2), 1.0), 1.0)
+        if np.array_equal(new_k, k):
+            break
+        k = new_k
+    return cycle, k
+
+
+def joint_replenishment(demand, major_cost, minor_cost, holding_cost, unit_cost, supplier,
+                        space_per_unit=1.0, space_limit=None, budget_limit=None):
+    """Pesanan gabungan per pemasok (joint replenishment) dengan batasan bersama opsional.
+
+    ``major_cost`` adalah biaya satu pengiriman dari pemasok (skalar atau per
+    pemasok, urut seperti ``suppliers`` hasil), ``minor_cost`` biaya tambahan
+    per bahan yang ikut dalam pesanan. Bahan i dipesan setiap ``k_i * T``
+    tahun sebanyak ``D_i * k_i * T``. Mengembalikan dict array per bahan
+    (``order_quantity``, ``multiple``, ``cycle_days``, ``order_frequency``,
+    ``ordering_cost`` minor, ``holding_cost``), per pemasok (``suppliers``,
+    ``supplier_cycle_days``, ``supplier_orders``, ``major_ordering_cost``),
+    ``total_cost`` keseluruhan serta pemakaian batasan dan pengalinya.
+    """
+    suppliers, family = np.unique(np.asarray(supplier).astype(str), return_inverse=True)
+    family = family.ravel()
+    n_families = suppliers.size
+    demand, holding, unit_cost, space, (minor_cost,) = _prepare(
+        demand, holding_cost, unit_cost, space_per_unit, minor_cost)
+    major = np.broadcast_to(np.asarray(major_cost, dtype=float), (n_families,))
+
+    def plan(h_eff):
+        # Selalu mulai dari k = 1: kelipatan bulat membuat pemakaian tidak kontinu, sehingga
+        # hasil harus fungsi dari h_eff saja agar rencana akhir sama dengan evaluasi layak
+        # yang diterima bisection (bukan bergantung pada evaluasi terakhir sebelumnya)
+        cycle, k = _rand_cycle(h_eff * demand, minor_cost, major, family, n_families)
+        return cycle, k, demand * k * cycle[family]
+
+    h_eff, l_s, l_b = _solve_multipliers(lambda h: plan(h)[2], holding, space, unit_cost,
+                                         space_limit, budget_limit)
+    cycle, k, quantity = plan(h_eff)
+    ordered = demand > 0
+    interval = k * cycle[family]
+    frequency = np.where(ordered, 1 / np.where(ordered, interval, 1.0), 0.0)
+    ordering = frequency * minor_cost
+    holding_total = quantity / 2 * holding
+    active_family = np.bincount(family, weights=ordered, minlength=n_families) > 0
+    supplier_orders = np.where(active_family, 1 / np.where(active_family, cycle, 1.0), 0.0)
+    major_total = supplier_orders * major
+    return {
+        "order_quantity": quantity,
+        "multiple": k.astype(np.int64),
+        "cycle_days": np.where(ordered, interval * 365, np.nan),
+        "order_frequency": frequency,
+        "ordering_cost": ordering,
+        "holding_cost": holding_total,
+        "suppliers": suppliers,
+        "supplier_index": family,
+        "supplier_cycle_days": np.where(active_family, cycle * 365, np.nan),
+        "supplier_orders": supplier_orders,
+        "major_ordering_cost": major_total,
+        "total_cost": float(major_total.sum() + ordering.sum() + holding_total.sum()),
+        **_usage(quantity, unit_cost, space, l_s, l_b),
+    }
+
+
+@memoize(maxsize=32)
+def joint_inventory(products, bahan_baku, monthly_demand, major_cost=DEFAULT_MAJOR_COST,
+                    minor_cost=DEFAULT_MINOR_COST, space_limit=None, budget_limit=None):
+    """Perbandingan EOQ independen vs pesanan gabungan berbatasan untuk seluruh ``BAHAN_BAKU``.
+
+    ``monthly_demand`` adalah dict produk -> permintaan bulanan (lihat
+    :func:`~optimasi.terintegrasi.material_plan`); pemasok dibaca dari kunci
+    ``pemasok`` (default: nama bahan itu sendiri). EOQ independen memakai
+    biaya pesan ``major_cost + minor_cost``. Mengembalikan dict ``table``
+    (kolom per bahan), ``suppliers`` (kolom per pemasok), ``independent_cost``,
+    ``joint_cost``, ``product_cost`` (dict produk -> biaya gabungan yang dialokasikan
+    sebanding pemakaian bahan) dan ``joint`` (hasil :func:`joint_replenishment`).
+    """
+    catalog = build_catalog(products, bahan_baku)
+    names = catalog.materials["name"]
+    demand = np.array([monthly_demand.get(name, 0.0) for name in catalog.products["name"]], dtype=float)
+    annual = catalog.material_demand(demand * 12)
+    supplier = [bahan_baku[name].get("pemasok", name) for name in names.tolist()]
+    holding, harga = catalog.materials["holding_cost"], catalog.materials["harga"]
+
+    independent = constrained_eoq(annual, major_cost + minor_cost, holding, harga)
+    joint = joint_replenishment(annual, major_cost, minor_cost, holding, harga, supplier,
+                                space_limit=space_limit, budget_limit=budget_limit)
+    family = joint["supplier_index"]
+    # Biaya mayor dialokasikan ke bahan sebanding biaya minor dalam satu pemasok
+    minor_by_supplier = np.bincount(family, weights=joint["ordering_cost"], minlength=joint["suppliers"].size)
+    major_share = np.where(minor_by_supplier[family] > 0,
+                           joint["ordering_cost"] / np.where(minor_by_supplier[family] > 0,
+                                                             minor_by_supplier[family], 1.0), 0.0)
+    material_cost = joint["ordering_cost"] + joint["holding_cost"] + major_share * joint["major_ordering_cost"][family]
+
+    # Alokasi ke produk sebanding pemakaian bahan: biaya per kg x kebutuhan tahunan produk
+    cost_per_kg = np.where(annual > 0, material_cost / np.where(annual > 0, annual, 1.0), 0.0)
+    product_cost = demand * 12 * catalog.bom.dot(cost_per_kg)
+    return {
+        "table": {
+            "Bahan Baku": names.tolist(),
+            "Pemasok": supplier,
+            "Kebutuhan Tahunan (kg)": annual,
+            "EOQ Independen (kg)": independent["eoq"],
+            "Kuantitas Pesan Gabungan (kg)": joint["order_quantity"],
+            "Kelipatan Siklus": joint["multiple"],
+            "Interval Pesan (hari)": joint["cycle_days"],
+            "Biaya Independen (Rp)": independent["total_cost"],
+            "Biaya Gabungan (Rp)": material_cost,
+        },
+        "suppliers": {
+            "Pemasok": joint["suppliers"].tolist(),
+            "Siklus Dasar (hari)": joint["supplier_cycle_days"],
+            "Pengiriman per Tahun": joint["supplier_orders"],
+            "Biaya Pengiriman (Rp)": joint["major_ordering_cost"],
+        },
+        "independent_cost": float(independent["total_cost"].sum()),
+        "joint_cost": joint["total_cost"],
+        "material_cost": material_cost,
+        "product_cost": dict(zip(catalog.products["name"].tolist(), product_cost.tolist())),
+        "joint": joint,
+    }
@@ -0,0 +1,354 @@
+"""Penjadwalan produksi multi-mesin multi-hari dengan setup bergantung urutan.
+
+Rencana produksi (unit per produk) dipecah menjadi job berukuran batch lalu
+dijadwalkan ke mesin paralel:
+
+1. Konstruksi: job diurutkan per produk (kelompok dengan total kerja terbesar
+   dahulu, LPT di dalamnya) lalu dibagi dengan dua aturan prioritas, yaitu
+   dispatching waktu selesai paling awal (termasuk setup dari produk terakhir
+   di mesin) dan pengisian berurutan sampai target beban; hasil dengan
+   makespan terkecil dipakai.
+2. Pencarian lokal berbatas waktu: job pada mesin kritis (makespan) dipindahkan
+   ke mesin lain bila makespan turun (penyisipan kelompok produk termurah
+   dievaluasi serentak untuk semua job x mesin); bila tidak ada lagi, kelompok
+   kecil digabung ke mesin lain yang sudah menjalankan produk yang sama selama
+   makespan tidak naik. Terakhir urutan kelompok produk di tiap mesin
+   diperbaiki dengan pemindahan posisi (or-opt) pada matriks setup.
+
+Waktu dihitung dalam jam kerja; :func:`gantt_segments` memotong jadwal di batas
+hari kerja (``hours_per_day``) agar siap untuk grafik Gantt.
+"""
+
+import time
+
+import numpy as np
+
+
+def setup_matrix(products, bahan_baku=None, base_hours=1.0, min_hours=0.25):
+    """Matriks waktu setup (jam) antar produk, ``[dari, ke]``, dan vektor setup awal.
+
+    Tanpa data setup eksplisit, lama pembersihan diperkirakan dari kemiripan
+    bahan baku: ``base_hours * (1 - jaccard)`` dengan minimum ``min_hours`` untuk
+    pergantian produk; setup awal mesin kosong = ``base_hours``.
+    """
+    names = list(products)
+    sets = [set(products[p]["bahan_baku"]) for p in names]
+    if bahan_baku is not None:
+        sets = [materials & set(bahan_baku) for materials in sets]
+    n = len(names)
+    matrix = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                union = sets[i] | sets[j]
+                similarity = len(sets[i] & sets[j]) / len(union) if union else 0.0
+                matrix[i, j] = max(base_hours * (1 - similarity), min_hours)
+    return matrix, np.full(n, float(base_hours))
+
+
+def jobs_from_plan(plan, products, batch_units=None):
+    """Memecah rencana (record ``Produk``/``Unit Diproduksi``) menjadi job.
+
+    ``batch_units`` (skalar atau dict per produk) adalah ukuran maksimum satu
+    job; None berarti satu job per produk. Mengembalikan dict array
+    ``product`` (indeks dalam ``products``), ``units`` dan ``hours`` (jam standar).
+    """
+    names = list(products)
+    position = {name: i for i, name in enumerate(names)}
+    product, units = [], []
+    for row in plan:
+        total = float(row["Unit Diproduksi"])
+        if total <= 0:
+            continue
+        size = batch_units.get(row["Produk"]) if isinstance(batch_units, dict) else batch_units
+        count = int(np.ceil(total / size)) if size else 1
+        lots = np.full(count, total / count)
+        product.extend([position[row["Produk"]]] * count)
+        units.extend(lots)
+    product = np.array(product, dtype=np.int64)
+    units = np.array(units, dtype=float)
+    hours_per_unit = np.array([products[p]["waktu_produksi"] for p in names], dtype=float)
+    return {"product": product, "units": units, "hours": units * hours_per_unit[product]}
+
+
+def _sequence_cost(sequence, setup, initial):
+    if not sequence:
+        return 0.0
+    return initial[sequence[0]] + sum(setup[a, b] for a, b in zip(sequence[:-1], sequence[1:]))
+
+
+def _insertion(sequence, setup, initial, n_products):
+    """(biaya, posisi) penyisipan termurah setiap produk ke dalam ``sequence``."""
+    if not sequence:
+        return initial.copy(), np.zeros(n_products, dtype=np.int64)
+    seq = np.asarray(sequence)
+    # Posisi 0: sebelum kelompok pertama; posisi i: setelah seq[i-1]
+    costs = [initial + setup[:, seq[0]] - initial[seq[0]]]
+    for i in range(1, seq.size):
+        a, b = seq[i - 1], seq[i]
+        costs.append(setup[a, :] + setup[:, b] - setup[a, b])
+    costs.append(setup[seq[-1], :])
+    costs = np.array(costs)
+    best = costs.argmin(axis=0)
+    return costs[best, np.arange(n_products)], best
+
+
+def _removal_saving(sequence, setup, initial):
+    """Penghematan setup bila kelompok pada setiap posisi ``sequence`` dihapus."""
+    savings = {}
+    for i, p in enumerate(sequence):
+        before = initial[p] if i == 0 else setup[sequence[i - 1], p]
+        if i + 1 < len(sequence):
+            nxt = sequence[i + 1]
+            after = setup[p, nxt]
+            bridge = initial[nxt] if i == 0 else setup[sequence[i - 1], nxt]
+        else:
+            after = bridge = 0.0
+        savings[p] = before + after - bridge
+    return savings
+
+
+def _improve_order(sequence, setup, initial):
+    """Or-opt: pindahkan satu kelompok ke posisi termurah selama total setup turun."""
+    n_products = setup.shape[0]
+    improved = True
+    while improved and len(sequence) > 2:
+        improved = False
+        savings = _removal_saving(sequence, setup, initial)
+        for i, p in enumerate(sequence):
+            rest = sequence[:i] + sequence[i + 1:]
+            cost, position = _insertion(rest, setup, initial, n_products)
+            if cost[p] < savings[p] - 1e-9:
+                sequence = rest[:position[p]] + [p] + rest[position[p]:]
+                improved = True
+                break
+    return sequence
+
+
+def _dispatch(order, product, duration, setup, initial, n_machines):
+    """Aturan dispatching: setiap job ke mesin dengan waktu selesai (termasuk setup) paling awal."""
+    machine = np.empty(product.size, dtype=np.int64)
+    load = np.zeros(n_machines)
+    last = np.full(n_machines, -1)
+    sequences = [[] for _ in range(n_machines)]
+    for j in order:
+        p = product[j]
+        changeover = np.where(last == p, 0.0, np.where(last < 0, initial[p], setup[np.maximum(last, 0), p]))
+        finish = load + changeover + duration[j]
+        k = int(finish.argmin())
+        machine[j] = k
+        if last[k] != p:
+            sequences[k].append(int(p))
+            last[k] = p
+        load[k] = finish[k]
+    return machine, sequences
+
+
+def _wrap_around(order, product, duration, setup, initial, n_machines):
+    """Pengisian berurutan (McNaughton): mesin diisi sampai target beban lalu pindah ke mesin berikut.
+
+    Kelompok produk paling banyak terpecah ``n_machines - 1`` kali, sehingga
+    jumlah setup jauh lebih sedikit daripada dispatching per job.
+    """
+    n_products = setup.shape[0]
+    target = (duration.sum() + (n_products + n_machines - 1) * initial.mean()) / n_machines
+    machine = np.empty(product.size, dtype=np.int64)
+    sequences = [[] for _ in range(n_machines)]
+    k, load, last = 0, 0.0, -1
+    for j in order:
+        p = product[j]
+        change = 0.0 if last == p else (initial[p] if last < 0 else setup[last, p])
+        if k < n_machines - 1 and load > 0 and load + change + duration[j] / 2 > target:
+            k, load, last = k + 1, 0.0, -1
+            change = initial[p]
+        machine[j] = k
+        if last != p:
+            sequences[k].append(int(p))
+            last = p
+        load += change + duration[j]
+    return machine, sequences
+
+
+def schedule_jobs(jobs, n_machines, setup, initial_setup=None, efficiency=1.0, time_limit=1.0):
+    """Menjadwalkan ``jobs`` (dari :func:`jobs_from_plan`) ke ``n_machines`` mesin paralel.
+
+    ``setup[i, j]`` adalah jam setup dari produk i ke j, ``initial_setup[j]``
+    setup pertama di mesin kosong (default: setup maksimum ke j). ``efficiency``
+    (skalar atau per mesin, 0-1) membagi jam standar job. Mengembalikan dict
+    ``machine``, ``start``, ``end`` dan ``setup_start`` per job (jam kerja),
+    ``sequence`` (urutan produk per mesin), ``makespan``, ``load``,
+    ``processing`` dan ``setup_hours`` per mesin, ``utilization`` per mesin,
+    ``setups`` (jumlah setup) dan ``iterations`` pencarian lokal.
+    """
+    product = np.asarray(jobs["product"], dtype=np.int64)
+    base = np.asarray(jobs["hours"], dtype=float)
+    setup = np.asarray(setup, dtype=float)
+    n_products = setup.shape[0]
+    initial = setup.max(axis=0) if initial_setup is None else np.asarray(initial_setup, dtype=float)
+    efficiency = np.broadcast_to(np.asarray(efficiency, dtype=float), (n_machines,))
+    if np.any(efficiency <= 0):
+        raise ValueError("Efisiensi mesin harus positif")
+    n_jobs = product.size
+    deadline = time.perf_counter() + time_limit
+
+    # --- konstruksi: kelompok produk terbesar dahulu, LPT di dalam kelompok -----
+    # Kedua aturan dicoba (durasi pada mesin rata-rata); yang makespan-nya kecil dipakai
+    group_work = np.bincount(product, weights=base, minlength=n_products)
+    order = np.lexsort((-base, product, -group_work[product]))
+    duration = base / efficiency.mean()
+
+    def state(machine, sequences):
+        counts = np.zeros((n_machines, n_products), dtype=np.int64)
+        np.add.at(counts, (machine, product), 1)
+        processing = np.bincount(machine, weights=base, minlength=n_machines) / efficiency
+        load = processing + np.array([_sequence_cost(seq, setup, initial) for seq in sequences])
+        return counts, processing, load
+
+    candidates = [rule(order, product, duration, setup, initial, n_machines) for rule in (_dispatch, _wrap_around)]
+    states = [state(*candidate) for candidate in candidates]
+    best = int(np.argmin([load.max() if n_jobs else 0.0 for _, _, load in states]))
+    machine, sequences = candidates[best]
+    counts, processing, load = states[best]
+
+    def move(j, k, position=None):
+        c, p = machine[j], product[j]
+        machine[j] = k
+        counts[c, p] -= 1
+        if counts[c, p] == 0:
+            sequences[c].remove(int(p))
+        if counts[k, p] == 0:
+            sequences[k].insert(int(position), int(p))
+        counts[k, p] += 1
+        for m in (c, k):
+            processing[m] = base[machine == m].sum() / efficiency[m]
+            load[m] = processing[m] + _sequence_cost(sequences[m], setup, initial)
+
+    # --- pencarian lokal ------------------------------------------------------------
+    iterations = 0
+    while time.perf_counter() < deadline and n_machines > 1 and n_jobs:
+        iterations += 1
+        insertion = np.empty((n_products, n_machines))
+        positions = np.empty((n_products, n_machines), dtype=np.int64)
+        for k in range(n_machines):
+            insertion[:, k], positions[:, k] = _insertion(sequences[k], setup, initial, n_products)
+        insertion[counts.T > 0] = 0.0  # kelompok sudah ada di mesin: tanpa setup tambahan
+
+        # 1) Relokasi: job dari mesin kritis ke mesin lain bila makespan turun
+        c = int(load.argmax())
+        on_c = np.flatnonzero(machine == c)
+        saving = _removal_saving(sequences[c], setup, initial)
+        p_c = product[on_c]
+        removed = np.where(counts[c, p_c] == 1, [saving[p] for p in p_c], 0.0)
+        new_c = load[c] - base[on_c] / efficiency[c] - removed
+        new_k = load[None, :] + base[on_c, None] / efficiency[None, :] + insertion[p_c]
+        new_k[:, c] = np.inf
+        score = np.maximum(new_c[:, None], new_k)
+        row, k = divmod(int(score.argmin()), n_machines)
+        if score[row, k] < load[c] - 1e-9:
+            move(on_c[row], k, positions[p_c[row], k])
+            continue
+
+        # 2) Konsolidasi: kelompok kecil dipindah utuh ke mesin yang sudah menjalankan
+        #    produk yang sama bila makespan tidak naik (mengurangi jumlah setup)
+        makespan = load.max()
+        merged = False
+        for c in np.argsort(-load):
+            saving = _removal_saving(sequences[c], setup, initial)
+            for p in sorted(sequences[c], key=lambda p: counts[c, p]):
+                group = np.flatnonzero((machine == c) & (product == p))
+                others = np.flatnonzero((counts[:, p] > 0) & (np.arange(n_machines) != c))
+                if others.size == 0:
+                    continue
+                extra = base[group].sum() / efficiency[others]
+                fits = load[others] + extra <= makespan + 1e-9
+                if fits.any() and saving[p] > 0:
+                    k = int(others[fits][np.argmin(load[others][fits] + extra[fits])])
+                    for j in group:
+                        move(j, k)
+                    merged = True
+                    break
+            if merged:
+                break
+        if not merged:
+            break
+
+    for k in range(n_machines):
+        if time.perf_counter() >= deadline:
+            break
+        sequences[k] = _improve_order(sequences[k], setup, initial)
+
+    # --- linimasa akhir -------------------------------------------------------------
+    start = np.zeros(n_jobs)
+    end = np.zeros(n_jobs)
+    setup_start = np.full(n_jobs, np.nan)
+    setup_hours = np.zeros(n_machines)
+    for k in range(n_machines):
+        t = 0.0
+        previous = None
+        for p in sequences[k]:
+            change = initial[p] if previous is None else setup[previous, p]
+            group = np.flatnonzero((machine == k) & (product == p))
+            group = group[np.argsort(-base[group], kind="stable")]
+            setup_start[group[0]] = t
+            t += change
+            setup_hours[k] += change
+            durations = base[group] / efficiency[k]
+            finish = t + np.cumsum(durations)
+            start[group], end[group] = finish - durations, finish
+            t = finish[-1]
+            previous = p
+        load[k] = t
+        processing[k] = t - setup_hours[k]
+
+    makespan = float(load.max()) if n_jobs else 0.0
+    return {
+        "machine": machine,
+        "start": start,
+        "end": end,
+        "setup_start": setup_start,
+        "sequence": sequences,
+        "makespan": makespan,
+        "load": load,
+        "processing": processing,
+        "setup_hours": setup_hours,
+        "utilization": processing / makespan if makespan > 0 else np.zeros(n_machines),
+        "setups": int(sum(len(seq) for seq in sequences)),
+        "iterations": iterations,
+    }
+
+
+def gantt_segments(schedule, jobs, hours_per_day=8.0, day_start_hour=8.0):
+    """Memotong jadwal (setup dan produksi) di batas hari kerja.
+
+    Mengembalikan dict array per segmen: ``job`` (untuk setup: job pertama
+    kelompoknya), ``machine``, ``product``, ``kind`` (``"Setup"``/``"Produksi"``),
+    ``day``, serta ``start_hour``/``end_hour`` (jam dinding dalam hari tersebut,
+    mulai dari ``day_start_hour``).
+    """
+    n_jobs = schedule["start"].size
+    has_setup = np.isfinite(schedule["setup_start"])
+    setup_end = np.where(has_setup, schedule["start"], np.nan)
+    seg_start = np.concatenate([schedule["setup_start"][has_setup], schedule["start"]])
+    seg_end = np.concatenate([setup_end[has_setup], schedule["end"]])
+    seg_job = np.concatenate([np.flatnonzero(has_setup), np.arange(n_jobs)])
+    seg_kind = np.concatenate([np.full(has_setup.sum(), "Setup"), np.full(n_jobs, "Produksi")])
+    keep = seg_end > seg_start
+    seg_start, seg_end, seg_job, seg_kind = seg_start[keep], seg_end[keep], seg_job[keep], seg_kind[keep]
+
+    first_day = np.floor(seg_start / hours_per_day).astype(np.int64)
+    last_day = np.floor(np.nextafter(seg_end, -np.inf) / hours_per_day).astype(np.int64)
+    pieces = last_day - first_day + 1
+    index = np.repeat(np.arange(seg_start.size), pieces)
+    day = first_day[index] + (np.arange(index.size) - np.repeat(np.cumsum(pieces) - pieces, pieces))
+    lo = np.maximum(seg_start[index], day * hours_per_day)
+    hi = np.minimum(seg_end[index], (day + 1) * hours_per_day)
+    job = seg_job[index]
+    return {
+        "job": job,
+        "machine": schedule["machine"][job],
+        "product": np.asarray(jobs["product"])[job],
+        "kind": seg_kind[index],
+        "day": day,
+        "start_hour": day_start_hour + lo - day * hours_per_day,
+        "end_hour": day_start_hour + hi - day * hours_per_day,
+    }
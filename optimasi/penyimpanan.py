@@ -0,0 +1,379 @@
+"""Penyimpanan hasil perhitungan persisten di disk, dialamatkan oleh isi input.
+
+Cache :func:`~optimasi.cache.memoize` hilang setiap kali proses berhenti;
+:class:`ResultStore` menyimpan hasil rencana dan simulasi yang mahal agar
+rerun server, sesi baru dan batch CLI tidak menghitung ulang.
+
+* Kunci adalah hash blake2b dari nama fungsi, hash bytecode-nya, hash isi
+  seluruh sumber paket ``optimasi`` (fungsi yang dipanggil ikut berubah tanpa
+  perlu menaikkan ``SCHEMA_VERSION``), versi skema dan argumen yang
+  dinormalisasi seperti kunci ``memoize`` (termasuk default
+  ``products``/``bahan_baku``, sehingga isi katalog ikut menjadi bagian kunci).
+* Metadata (ukuran, waktu hitung, akses terakhir, jumlah hit) ada di SQLite
+  ``index.sqlite``; hasilnya di ``objects/<ab>/<kunci>/``: ``manifest.json``
+  untuk struktur dict/list/tuple/skalar, array kecil dalam ``small.npz`` dan
+  array besar masing-masing sebagai ``<n>.npy`` yang dibuka dengan memmap.
+* Total ukuran dibatasi ``max_bytes``; entri yang paling lama tidak diakses
+  dihapus lebih dulu. ``PRAGMA user_version`` mencatat versi skema; store
+  dengan versi lain dikosongkan saat dibuka.
+
+Hasil yang memuat objek selain array numerik, skalar, string, None, dict,
+list dan tuple tidak disimpan (pemanggilan tetap berjalan normal).
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from . import cache
+from .cache import _fingerprint, _freeze, _make_read_only, _Uncacheable
+
+# Naikkan bila format manifest/blob atau tabel metadata berubah
+SCHEMA_VERSION = 1
+DEFAULT_MAX_BYTES = 1 << 30
+# Array sejak ukuran ini disimpan sebagai .npy tersendiri dan dibuka dengan memmap
+MMAP_THRESHOLD = 1 << 16
+
+_SCHEMA = (
+    """CREATE TABLE results (
+        key TEXT PRIMARY KEY,
+        function TEXT NOT NULL,
+        bytes INTEGER NOT NULL,
+        seconds REAL,
+        created REAL NOT NULL,
+        accessed REAL NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX results_accessed ON results (accessed)",
+)
+
+
+class _Unstorable(Exception):
+    pass
+
+
+def default_directory():
+    """Direktori store bawaan: ``$OPTIMASI_STORE_DIR`` atau ``~/.cache/optimasi``."""
+    directory = os.environ.get("OPTIMASI_STORE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "optimasi")
+
+
+def _canonical(value):
+    # repr frozenset bergantung pada hash string per proses; anggotanya diurutkan
+    if isinstance(value, tuple):
+        return b"(" + b",".join(_canonical(v) for v in value) + b")"
+    if isinstance(value, frozenset):
+        return b"{" + b",".join(sorted(_canonical(v) for v in value)) + b"}"
+    return repr(value).encode()
+
+
+@functools.lru_cache(maxsize=None)
+def package_fingerprint():
+    """Hash isi semua file ``.py`` paket ``optimasi`` (dihitung sekali per proses)."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.blake2b(digest_size=16)
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, root).encode() + b"\x00")
+                with open(path, "rb") as handle:
+                    digest.update(handle.read())
+    return digest.digest()
+
+
+def digest_key(key):
+    """Kunci heksadesimal dari ``(nama fungsi, fingerprint, argumen beku)``."""
+    name, fingerprint, arguments = key
+    data = b"\x00".join((name.encode(), fingerprint, package_fingerprint(), str(SCHEMA_VERSION).encode(),
+                         _canonical(arguments)))
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def result_key(func, *args, **kwargs):
+    """Kunci store untuk ``func(*args, **kwargs)``; None bila argumen tidak dapat di-hash."""
+    target = getattr(func, "__wrapped__", func)
+    bound = inspect.signature(target).bind(*args, **kwargs)
+    bound.apply_defaults()
+    ignore = getattr(func, "cache_ignore", ())
+    try:
+        arguments = _freeze(tuple(item for item in bound.arguments.items() if item[0] not in ignore))
+    except _Uncacheable:
+        return None
+    return digest_key((f"{target.__module__}.{target.__qualname__}", _fingerprint(target), arguments))
+
+
+def _encode(value, arrays):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return _encode(value.item(), arrays)
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise _Unstorable("array object")
+        arrays.append(value)
+        return {"npy": len(arrays) - 1}
+    if isinstance(value, dict):
+        return {"dict": [[_encode(k, arrays), _encode(v, arrays)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {"tuple": [_encode(v, arrays) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v, arrays) for v in value]
+    raise _Unstorable(type(value).__name__)
+
+
+def _decode(node, arrays):
+    if isinstance(node, list):
+        return [_decode(v, arrays) for v in node]
+    if isinstance(node, dict):
+        if "npy" in node:
+            return arrays(node["npy"])
+        if "tuple" in node:
+            return tuple(_decode(v, arrays) for v in node["tuple"])
+        return {_decode(k, arrays): _decode(v, arrays) for k, v in node["dict"]}
+    return node
+
+
+def _write_blob(directory, value):
+    """Menulis ``value`` ke ``directory``; mengembalikan jumlah byte di disk."""
+    arrays = []
+    manifest = {"schema": SCHEMA_VERSION, "value": _encode(value, arrays), "large": []}
+    small = {}
+    for i, array in enumerate(arrays):
+        if array.nbytes >= MMAP_THRESHOLD:
+            np.save(os.path.join(directory, f"{i}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+            manifest["large"].append(i)
+        else:
+            small[str(i)] = array
+    if small:
+        np.savez(os.path.join(directory, "small.npz"), **small)
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle)
+    return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+
+def _read_blob(directory):
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if manifest.get("schema") != SCHEMA_VERSION:
+        raise ValueError("versi skema blob berbeda")
+    large = set(manifest["large"])
+    small = {}
+    if os.path.exists(os.path.join(directory, "small.npz")):
+        with np.load(os.path.join(directory, "small.npz"), allow_pickle=False) as archive:
+            small = {int(name): archive[name] for name in archive.files}
+
+    def arrays(i):
+        if i in large:
+            return np.load(os.path.join(directory, f"{i}.npy"), mmap_mode="r", allow_pickle=False)
+        return small[i]
+
+    return _make_read_only(_decode(manifest["value"], arrays))
+
+
+class ResultStore:
+    """Store hasil persisten berbatas ukuran; aman dipakai banyak thread dan proses.
+
+    Setiap operasi membuka koneksi SQLite sendiri (mode WAL), sehingga satu
+    direktori dapat dibagi server Streamlit, worker pool dan batch CLI.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.abspath(directory or default_directory())
+        self.max_bytes = max_bytes
+        self._objects = os.path.join(self.directory, "objects")
+        self._tmp = os.path.join(self.directory, "tmp")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.bypassed = 0
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._tmp, exist_ok=True)
+        self._open()
+
+    def _connect(self):
+        connection = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), timeout=30,
+                                     isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _open(self):
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                # Store lama/format lain: metadata dan blob tidak dapat dibaca lagi
+                connection.execute("DROP TABLE IF EXISTS results")
+                shutil.rmtree(self._objects, ignore_errors=True)
+                os.makedirs(self._objects, exist_ok=True)
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def _path(self, key):
+        return os.path.join(self._objects, key[:2], key)
+
+    def _count(self, counter, n=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    # --- baca/tulis -----------------------------------------------------------------
+
+    def get(self, key):
+        """``(True, hasil)`` bila ``key`` tersimpan (array besar sebagai memmap read-only)."""
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count("misses")
+                return False, None
+            try:
+                value = _read_blob(self._path(key))
+            except (OSError, ValueError, KeyError):
+                # Blob hilang/rusak (mis. dievict proses lain saat dibaca): anggap tidak ada
+                connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._count("misses")
+                return False, None
+            connection.execute("UPDATE results SET accessed = ?, hits = hits + 1 WHERE key = ?",
+                               (time.time(), key))
+        finally:
+            connection.close()
+        self._count("hits")
+        return True, value
+
+    def put(self, key, value, function="", seconds=None):
+        """Menyimpan ``value``; False bila tidak dapat disimpan atau melebihi ``max_bytes``."""
+        staging = tempfile.mkdtemp(dir=self._tmp)
+        try:
+            size = _write_blob(staging, value)
+            if size > self.max_bytes:
+                self._count("bypassed")
+                return False
+            target = self._path(key)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                pass  # sudah ditulis proses lain dengan isi yang sama
+        except _Unstorable:
+            self._count("bypassed")
+            return False
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        now = time.time()
+        connection = self._connect()
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, function, bytes, seconds, created, accessed, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, COALESCE((SELECT hits FROM results WHERE key = ?), 0))",
+                (key, function, size, seconds, now, now, key))
+            self._evict(connection)
+        finally:
+            connection.close()
+        self._count("writes")
+        return True
+
+    def _evict(self, connection):
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            total = connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM results").fetchone()[0]
+            victims = []
+            if total > self.max_bytes:
+                for key, size in connection.execute("SELECT key, bytes FROM results ORDER BY accessed"):
+                    if total <= self.max_bytes:
+                        break
+                    victims.append(key)
+                    total -= size
+                connection.executemany("DELETE FROM results WHERE key = ?", [(key,) for key in victims])
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        for key in victims:
+            shutil.rmtree(self._path(key), ignore_errors=True)
+        self._count("evictions", len(victims))
+
+    def call(self, func, *args, **kwargs):
+        """``func(*args, **kwargs)`` dari store bila ada; selain itu dihitung lalu disimpan."""
+        key = result_key(func, *args, **kwargs)
+        if key is None:
+            self._count("bypassed")
+            return func(*args, **kwargs)
+        found, value = self.get(key)
+        if found:
+            return value
+        start = time.perf_counter()
+        value = _make_read_only(func(*args, **kwargs))
+        target = getattr(func, "__wrapped__", func)
+        self.put(key, value, f"{target.__module__}.{target.__qualname__}", time.perf_counter() - start)
+        return value
+
+    # --- administrasi ---------------------------------------------------------------
+
+    def clear(self):
+        connection = self._connect()
+        try:
+            connection.execute("DELETE FROM results")
+        finally:
+            connection.close()
+        shutil.rmtree(self._objects, ignore_errors=True)
+        os.makedirs(self._objects, exist_ok=True)
+
+    def entries(self):
+        """Ringkasan per fungsi: jumlah entri, byte, hit dan waktu hitung yang dihemat."""
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT function, COUNT(*), SUM(bytes), SUM(hits), SUM(hits * COALESCE(seconds, 0)) "
+                "FROM results GROUP BY function ORDER BY SUM(bytes) DESC").fetchall()
+        finally:
+            connection.close()
+        return [{"function": function, "entries": n, "bytes": size, "hits": hits, "saved_seconds": saved}
+                for function, n, size, hits, saved in rows]
+
+    def info(self):
+        connection = self._connect()
+        try:
+            n, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM results").fetchone()
+        finally:
+            connection.close()
+        with self._lock:
+            return {"directory": self.directory, "entries": n, "bytes": size, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "writes": self.writes,
+                    "evictions": self.evictions, "bypassed": self.bypassed}
+
+
+def configure_store(store):
+    """Mengaktifkan ``store`` untuk fungsi ``memoize(persist=True)`` di proses ini.
+
+    ``store`` berupa :class:`ResultStore`, path direktori, atau None untuk
+    menonaktifkan. Mengembalikan store yang aktif.
+    """
+    if isinstance(store, (str, os.PathLike)):
+        store = ResultStore(store)
+    cache._STORE = store
+    return store
+
+
+def active_store():
+    return cache._STORE
@@ -0,0 +1,100 @@
+"""Model persediaan EOQ & ROP dalam bentuk vektor (NumPy)."""
+
+import numpy as np
+
+from .cache import memoize
+
+EOQ_INPUT_COLUMNS = ("demand", "order_cost", "holding_cost", "unit_cost", "lead_time", "safety_stock")
+
+
+def _as_float_arrays(*values):
+    return np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values))
+
+
+def calculate_eoq(demand, order_cost, holding_cost, unit_cost):
+    """Menghitung Economic Order Quantity (NaN bila input tidak valid)"""
+    return float(calculate_eoq_batch(demand, order_cost, holding_cost, unit_cost)["eoq"])
+
+
+def calculate_rop(demand_rate, lead_time, safety_stock=0):
+    """Menghitung Reorder Point (NaN bila input tidak valid)"""
+    return float(calculate_rop_batch(demand_rate, lead_time, safety_stock))
+
+
+def calculate_rop_batch(demand_rate, lead_time, safety_stock=0):
+    """Menghitung Reorder Point untuk banyak baris sekaligus.
+
+    Baris dengan input negatif atau tidak hingga menghasilkan NaN.
+    """
+    demand_rate, lead_time, safety_stock = _as_float_arrays(demand_rate, lead_time, safety_stock)
+    valid = (
+        np.isfinite(demand_rate) & np.isfinite(lead_time) & np.isfinite(safety_stock)
+        & (demand_rate >= 0) & (lead_time >= 0) & (safety_stock >= 0)
+    )
+    rop = np.where(valid, demand_rate * lead_time + safety_stock, np.nan)
+    return rop
+
+
+@memoize(maxsize=256)
+def calculate_eoq_batch(demand, order_cost, holding_cost, unit_cost,
+                        lead_time=0, safety_stock=0, days_per_year=365):
+    """Menghitung EOQ, ROP, total biaya dan frekuensi pesan per baris.
+
+    Semua argumen boleh berupa skalar atau array dan di-broadcast bersama.
+    ``demand`` adalah permintaan tahunan, ``holding_cost`` adalah persentase
+    biaya simpan per tahun terhadap ``unit_cost``. Baris yang tidak valid
+    (mis. biaya simpan nol) tidak memunculkan exception: nilainya NaN dan
+    ditandai ``False`` pada kunci ``valid``.
+    """
+    demand, order_cost, holding_cost, unit_cost, lead_time, safety_stock = _as_float_arrays(
+        demand, order_cost, holding_cost, unit_cost, lead_time, safety_stock
+    )
+    holding_per_unit = holding_cost * unit_cost
+    valid = (
+        np.isfinite(demand) & np.isfinite(order_cost) & np.isfinite(holding_per_unit)
+        & (demand >= 0) & (order_cost >= 0) & (holding_per_unit > 0)
+    )
+
+    # Penyebut diganti 1 pada baris tidak valid agar tidak ada pembagian nol
+    safe_holding = np.where(valid, holding_per_unit, 1.0)
+    eoq = np.sqrt(np.where(valid, 2 * demand * order_cost, 0.0) / safe_holding)
+    has_orders = valid & (eoq > 0)
+    order_frequency = np.where(has_orders, demand / np.where(has_orders, eoq, 1.0), 0.0)
+    total_cost = order_frequency * order_cost + (eoq / 2) * holding_per_unit
+
+    rop = calculate_rop_batch(demand / days_per_year, lead_time, safety_stock)
+    valid = valid & np.isfinite(rop)
+
+    return {
+        "eoq": np.where(valid, eoq, np.nan),
+        "rop": np.where(valid, rop, np.nan),
+        "total_cost": np.where(valid, total_cost, np.nan),
+        "order_frequency": np.where(valid, order_frequency, np.nan),
+        "valid": valid,
+    }
+
+
+def eoq_table(df, days_per_year=365, **defaults):
+    """Menjalankan ``calculate_eoq_batch`` atas DataFrame katalog bahan baku.
+
+    Kolom yang dibaca mengikuti ``EOQ_INPUT_COLUMNS``; kolom yang tidak ada
+    diambil dari ``defaults`` (mis. ``order_cost=200000``). Hasil dikembalikan
+    sebagai salinan DataFrame dengan kolom ``eoq``, ``rop``, ``total_cost``,
+    ``order_frequency`` dan ``valid``.
+    """
+    inputs = {}
+    for column in EOQ_INPUT_COLUMNS:
+        if column in df.columns:
+            inputs[column] = df[column].to_numpy(dtype=float)
+        elif column in defaults:
+            inputs[column] = defaults[column]
+        elif column in ("lead_time", "safety_stock"):
+            inputs[column] = 0.0
+        else:
+            raise KeyError(f"Kolom '{column}' tidak ditemukan dan tidak ada nilai default")
+
+    result = calculate_eoq_batch(days_per_year=days_per_year, **inputs)
+    out = df.copy()
+    for key, values in result.items():
+        out[key] = np.broadcast_to(values, (len(df),))
+    return out
@@ -0,0 +1,122 @@
+"""Optimasi rencana produksi dengan program linear bilangan bulat."""
+
+import numpy as np
+
+from .cache import memoize
+from .simplex import solve_milp
+
+
+@memoize(maxsize=64)
+def optimize_production(products, constraints):
+    """Optimasi produksi sederhana menggunakan profit per unit waktu"""
+    results = []
+
+    for product, data in products.items():
+        profit_per_unit = data["harga_jual"] - data["biaya_produksi"]
+        profit_per_hour = profit_per_unit / data["waktu_produksi"]
+
+        results.append({
+            "Produk": product,
+            "Profit per Unit": profit_per_unit,
+            "Waktu Produksi (jam)": data["waktu_produksi"],
+            "Profit per Jam": profit_per_hour,
+            "Prioritas": len(results) + 1
+        })
+
+    # Sorting berdasarkan profit per jam
+    results.sort(key=lambda x: x["Profit per Jam"], reverse=True)
+    for i, result in enumerate(results):
+        result["Prioritas"] = i + 1
+
+    return results
+
+
+def _per_product(value, names, default=0.0):
+    """Nilai skalar berlaku untuk semua produk; dict dibaca per nama produk."""
+    if isinstance(value, dict):
+        return np.array([value.get(name, default) for name in names], dtype=float)
+    return np.full(len(names), default if value is None else value, dtype=float)
+
+
+def _proven_optimal(result):
+    # Hasil terpotong time_limit bergantung pada kecepatan mesin saat itu: tidak disimpan ke disk
+    return result["status"] == "optimal"
+
+
+@memoize(maxsize=64, persist=_proven_optimal)
+def optimize_production_plan(products, bahan_baku, constraints, time_limit=0.3):
+    """Mencari rencana produksi dengan profit bersih maksimum.
+
+    ``constraints`` berisi ``kapasitas`` (jam mesin per hari), ``efisiensi``
+    (0-1), ``periode`` (hari perencanaan), ``biaya_setup`` (skalar atau dict per
+    produk, dibayar sekali per produk yang dijalankan), ``stok_bahan`` (dict
+    bahan -> stok tersedia selama periode), ``permintaan_minimum`` (dict
+    produk -> unit) dan ``bilangan_bulat`` (default True).
+
+    Kebutuhan bahan dihitung dari rasio ``bahan_baku`` tiap produk. Hasilnya
+    dict berisi ``status``, ``plan`` (list record per produk), ``materials``
+    (pemakaian bahan baku), ``total_profit``, ``total_waktu``,
+    ``kapasitas_efektif``, ``bound`` dan ``gap``.
+    """
+    names = list(products)
+    profit = np.array([products[p]["harga_jual"] - products[p]["biaya_produksi"] for p in names], dtype=float)
+    waktu = np.array([products[p]["waktu_produksi"] for p in names], dtype=float)
+
+    periode = constraints.get("periode", 1)
+    kapasitas_efektif = constraints["kapasitas"] * constraints.get("efisiensi", 1.0) * periode
+    stok = constraints.get("stok_bahan") or {}
+    materials = [m for m in stok if m in bahan_baku and stok[m] is not None and np.isfinite(stok[m])]
+    ratios = np.array([[products[p]["bahan_baku"].get(m, 0.0) for p in names] for m in materials],
+                      dtype=float).reshape(len(materials), len(names))
+
+    A = np.vstack([waktu, ratios])
+    b = np.concatenate([[kapasitas_efektif], [stok[m] for m in materials]]).astype(float)
+    lower = _per_product(constraints.get("permintaan_minimum"), names)
+    setup = _per_product(constraints.get("biaya_setup"), names)
+
+    # Batas atas per produk dari baris dengan koefisien positif (semua koefisien >= 0)
+    with np.errstate(divide="ignore"):
+        limits = np.where(A > 0, b[:, None] / np.where(A > 0, A, 1.0), np.inf)
+    upper = np.maximum(limits.min(axis=0), 0.0)
+
+    result = solve_milp(profit, A, b, lower, upper,
+                        integer=np.full(len(names), constraints.get("bilangan_bulat", True)),
+                        fixed_cost=setup, time_limit=time_limit)
+    if result["x"] is None:
+        return {"status": result["status"], "plan": [], "materials": [], "total_profit": 0.0,
+                "total_waktu": 0.0, "kapasitas_efektif": kapasitas_efektif,
+                "bound": result["bound"], "gap": result["gap"]}
+
+    units = np.where(result["x"] > 1e-9, result["x"], 0.0)
+    produced = units > 0
+    plan = [
+        {
+            "Produk": name,
+            "Unit Diproduksi": float(units[i]),
+            "Waktu Digunakan (jam)": float(units[i] * waktu[i]),
+            "Profit Kotor": float(units[i] * profit[i]),
+            "Biaya Setup": float(setup[i]),
+            "Profit Dihasilkan": float(units[i] * profit[i] - setup[i]),
+        }
+        for i, name in enumerate(names) if produced[i]
+    ]
+    usage = ratios @ units
+    material_usage = [
+        {
+            "Bahan Baku": m,
+            "Pemakaian (kg)": float(usage[k]),
+            "Stok (kg)": float(b[k + 1]),
+            "Sisa (kg)": float(b[k + 1] - usage[k]),
+        }
+        for k, m in enumerate(materials)
+    ]
+    return {
+        "status": result["status"],
+        "plan": plan,
+        "materials": material_usage,
+        "total_profit": float(result["objective"]),
+        "total_waktu": float(waktu @ units),
+        "kapasitas_efektif": kapasitas_efektif,
+        "bound": float(result["bound"]),
+        "gap": float(result["gap"]),
+    }
@@ -0,0 +1,178 @@
+"""Instrumentasi ringan untuk mengukur tahap perhitungan dan render per rerun.
+
+:class:`Profiler` mencatat span bersarang (``with profiler.span(nama)``) dan
+tahap berurutan (``profiler.stage(nama)`` menutup tahap sebelumnya), dengan
+opsi snapshot memori (``tracemalloc``) dan cProfile. Saat tidak aktif,
+``span`` mengembalikan context manager kosong yang sama dan ``stage`` langsung
+kembali, sehingga instrumentasi dapat dibiarkan di kode tanpa biaya berarti.
+
+Hasil dapat diekspor sebagai dict JSON (:meth:`Profiler.to_json`) atau format
+"collapsed stack" (:meth:`Profiler.to_collapsed`, satu baris
+``induk;anak;cucu mikrodetik`` berisi waktu self) yang dapat dibaca
+``flamegraph.pl``, speedscope atau inferno.
+"""
+
+import time
+from contextlib import nullcontext
+
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "path", "start", "memory_start", "peak", "children_ms")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._open(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._close(self)
+        return False
+
+
+class Profiler:
+    """Pencatat span waktu (dan memori) untuk satu rerun skrip.
+
+    ``memory=True`` menjalankan ``tracemalloc`` (menambah overhead alokasi),
+    ``cprofile=True`` merekam semua pemanggilan fungsi selama profiler aktif.
+    Panggil :meth:`finish` setelah tahap terakhir.
+    """
+
+    def __init__(self, enabled=False, memory=False, cprofile=False, root="rerun"):
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.records = []
+        self.snapshot = []
+        self.stats = []
+        self._stack = []
+        self._stage = None
+        self._profile = None
+        self._finished = False
+        if not enabled:
+            return
+        if self.memory:
+            import tracemalloc
+
+            self._tracemalloc = tracemalloc
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+        if cprofile:
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError:  # profiler lain sudah aktif di thread ini
+                self._profile = None
+        self._root = _Span(self, root)
+        self._open(self._root)
+
+    # --- pencatatan ---------------------------------------------------------------
+
+    def span(self, name):
+        """Context manager span bersarang di bawah span/tahap yang sedang terbuka."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def stage(self, name):
+        """Memulai tahap baru; tahap sebelumnya pada level yang sama ditutup."""
+        if not self.enabled:
+            return
+        if self._stage is not None and self._stage in self._stack:
+            self._close(self._stage)
+        self._stage = _Span(self, name)
+        self._open(self._stage)
+
+    def _open(self, span):
+        parent = self._stack[-1] if self._stack else None
+        span.path = f"{parent.path};{span.name}" if parent is not None else span.name
+        span.children_ms = 0.0
+        span.peak = 0
+        span.memory_start = 0
+        if self.memory:
+            current, peak = self._tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.peak = max(parent.peak, peak)
+            self._tracemalloc.reset_peak()
+            span.memory_start = current
+        self._stack.append(span)
+        span.start = time.perf_counter()
+
+    def _close(self, span):
+        elapsed = (time.perf_counter() - span.start) * 1000
+        # Span anak yang belum ditutup (mis. tahap terakhir di dalam span) ikut ditutup
+        while self._stack and self._stack[-1] is not span:
+            self._close(self._stack[-1])
+        self._stack.pop()
+        record = {"path": span.path, "name": span.name, "depth": len(self._stack),
+                  "start_ms": (span.start - self._root.start) * 1000, "ms": elapsed,
+                  "self_ms": max(elapsed - span.children_ms, 0.0)}
+        if self.memory:
+            current, peak = self._tracemalloc.get_traced_memory()
+            span.peak = max(span.peak, peak)
+            record["memory_kb"] = (current - span.memory_start) / 1024
+            record["peak_kb"] = (span.peak - span.memory_start) / 1024
+        if self._stack:
+            parent = self._stack[-1]
+            parent.children_ms += elapsed
+            parent.peak = max(parent.peak, span.peak)
+        self.records.append(record)
+
+    def finish(self, top=15):
+        """Menutup semua span, menghentikan tracemalloc/cProfile dan merangkum hasilnya."""
+        if not self.enabled or self._finished:
+            return self
+        self._finished = True
+        self._close(self._root)
+        self.records.sort(key=lambda record: record["start_ms"])
+        if self._profile is not None:
+            self._profile.disable()
+            self.stats = self._top_functions(top)
+        if self.memory:
+            snapshot = self._tracemalloc.take_snapshot()
+            self.snapshot = [
+                {"lokasi": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 "kb": stat.size / 1024, "blok": stat.count}
+                for stat in snapshot.statistics("lineno")[:top]
+            ]
+            if self._started_tracemalloc:
+                self._tracemalloc.stop()
+        return self
+
+    def _top_functions(self, top):
+        import pstats
+
+        stats = pstats.Stats(self._profile)
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({"fungsi": f"{function} ({filename}:{line})", "panggilan": calls,
+                         "self_ms": tottime * 1000, "kumulatif_ms": cumtime * 1000})
+        rows.sort(key=lambda row: row["kumulatif_ms"], reverse=True)
+        return rows[:top]
+
+    # --- ekspor ---------------------------------------------------------------------
+
+    def to_json(self):
+        """Dict siap ``json.dumps``: span, snapshot memori dan fungsi teratas cProfile."""
+        return {"spans": self.records, "memory": self.snapshot, "cprofile": self.stats}
+
+    def to_collapsed(self):
+        """Teks format collapsed stack (waktu self dalam mikrodetik) untuk flamegraph."""
+        lines = [f"{record['path']} {int(round(record['self_ms'] * 1000))}"
+                 for record in self.records if record["self_ms"] > 0]
+        return "\n".join(lines) + "\n"
+
+    def cprofile_bytes(self):
+        """Statistik cProfile mentah (isi file ``.prof`` untuk snakeviz/pstats); None bila tidak aktif."""
+        if self._profile is None:
+            return None
+        import marshal
+        import pstats
+
+        return marshal.dumps(pstats.Stats(self._profile).stats)
@@ -0,0 +1,310 @@
+"""Ingestion streaming riwayat order (CSV/Parquet) menjadi parameter model.
+
+File dibaca per potongan (generator, memori terbatas) dan setiap potongan
+langsung diringkas menjadi agregat harian per produk: jumlah unit, jumlah
+order, dan jumlah/kuadrat waktu layanan. Agregat tersebut yang disimpan,
+bukan baris mentah, sehingga log multi-GB diproses dalam satu lintasan dan
+file baru cukup ditambahkan (``ingest`` ulang) untuk memperbarui statistik
+bergulir. File yang sudah diproses dikenali dari path, ukuran dan waktu
+modifikasinya sehingga tidak terhitung dua kali.
+
+Kolom log: ``order_time``, ``product``, ``quantity`` dan opsional
+``service_hours`` atau pasangan ``service_start``/``service_end``.
+"""
+
+import os
+
+import numpy as np
+
+from .antrian import calculate_queue_metrics
+from .persediaan import calculate_eoq_batch, calculate_rop_batch
+from .terintegrasi import capacity_stage, efficiency_stage, queue_stage
+
+REQUIRED_COLUMNS = ("order_time", "product", "quantity")
+OPTIONAL_COLUMNS = ("service_hours", "service_start", "service_end")
+AGGREGATE_COLUMNS = ("quantity", "orders", "service_n", "service_sum", "service_sumsq")
+
+# Agregat tertunda dipadatkan (groupby ulang) bila jumlah barisnya melebihi ini
+_COMPACT_ROWS = 200_000
+
+
+def iter_chunks(source, chunksize=500_000):
+    """Generator DataFrame per potongan dari path/buffer CSV atau Parquet."""
+    import pandas as pd
+
+    name = getattr(source, "name", source)
+    if str(name).lower().endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Membaca Parquet secara streaming membutuhkan pyarrow") from exc
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+
+    header = pd.read_csv(source, nrows=0)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    usecols = [col for col in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if col in header.columns]
+    yield from pd.read_csv(source, chunksize=chunksize, usecols=usecols)
+
+
+def summarize_chunk(chunk):
+    """Meringkas satu potongan log menjadi agregat (produk, hari)."""
+    import pandas as pd
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan di log order: {', '.join(missing)}")
+    day = pd.to_datetime(chunk["order_time"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+    if "service_hours" in chunk.columns:
+        service = pd.to_numeric(chunk["service_hours"], errors="coerce").to_numpy(dtype=float)
+    elif "service_start" in chunk.columns and "service_end" in chunk.columns:
+        elapsed = pd.to_datetime(chunk["service_end"]) - pd.to_datetime(chunk["service_start"])
+        service = elapsed.dt.total_seconds().to_numpy(dtype=float) / 3600
+    else:
+        service = np.full(len(chunk), np.nan)
+    has_service = np.isfinite(service)
+    service = np.where(has_service, service, 0.0)
+
+    frame = pd.DataFrame({
+        "product": chunk["product"].astype(str).to_numpy(),
+        "day": day,
+        "quantity": pd.to_numeric(chunk["quantity"], errors="coerce").fillna(0.0).to_numpy(dtype=float),
+        "orders": 1.0,
+        "service_n": has_service.astype(float),
+        "service_sum": service,
+        "service_sumsq": service ** 2,
+    })
+    return frame.groupby(["product", "day"], sort=False).sum()
+
+
+class OrderHistory:
+    """Agregat harian bergulir dari riwayat order yang di-ingest secara bertahap.
+
+    ``window_days`` membatasi jendela statistik (hari terakhir yang tersimpan);
+    None berarti seluruh riwayat.
+    """
+
+    def __init__(self, window_days=365):
+        self.window_days = window_days
+        self.files = {}
+        self.rows = 0
+        self._daily = None
+        self._pending = []
+        self._pending_rows = 0
+
+    # --- ingestion ------------------------------------------------------------
+
+    def ingest(self, source, chunksize=500_000, key=None):
+        """Menambahkan satu file/buffer ke agregat; mengembalikan jumlah baris baru.
+
+        File yang sama (path, ukuran, mtime — atau ``key`` untuk buffer) dilewati.
+        Bila pembacaan gagal di tengah file, agregat dikembalikan ke keadaan
+        sebelum file ini sehingga percobaan ulang tidak menghitung ganda.
+        """
+        if key is None and isinstance(source, (str, os.PathLike)):
+            stat = os.stat(source)
+            key = (os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+        if key is not None and key in self.files:
+            return 0
+
+        # _compact membuat DataFrame baru, jadi referensi lama aman sebagai cadangan
+        saved = (self._daily, list(self._pending), self._pending_rows)
+        rows = 0
+        try:
+            for chunk in iter_chunks(source, chunksize):
+                self._pending.append(summarize_chunk(chunk))
+                self._pending_rows += len(self._pending[-1])
+                rows += len(chunk)
+                if self._pending_rows > _COMPACT_ROWS:
+                    self._compact()
+            self._compact()
+        except BaseException:
+            self._daily, self._pending, self._pending_rows = saved
+            raise
+        self.rows += rows
+        if key is not None:
+            self.files[key] = rows
+        return rows
+
+    def _compact(self):
+        import pandas as pd
+
+        if not self._pending:
+            return
+        parts = self._pending if self._daily is None else [self._daily] + self._pending
+        daily = pd.concat(parts).groupby(level=["product", "day"]).sum()
+        if self.window_days is not None and len(daily):
+            last_day = daily.index.get_level_values("day").max()
+            daily = daily[daily.index.get_level_values("day") > last_day - self.window_days]
+        self._daily = daily
+        self._pending = []
+        self._pending_rows = 0
+
+    def daily(self):
+        """DataFrame agregat berindeks (``product``, ``day``) dengan ``AGGREGATE_COLUMNS``."""
+        import pandas as pd
+
+        self._compact()
+        if self._daily is None:
+            index = pd.MultiIndex.from_arrays([[], []], names=["product", "day"])
+            return pd.DataFrame(columns=list(AGGREGATE_COLUMNS), index=index, dtype=float)
+        return self._daily
+
+    # --- statistik turunan ------------------------------------------------------
+
+    def _product_matrix(self):
+        """Matriks permintaan (produk x hari) pada rentang hari yang teramati."""
+        daily = self.daily()
+        if daily.empty:
+            return np.array([], dtype=str), np.zeros((0, 0)), np.zeros(0, dtype=np.int64)
+        matrix = daily["quantity"].unstack("day", fill_value=0.0)
+        first, last = matrix.columns.min(), matrix.columns.max()
+        days = np.arange(first, last + 1)
+        matrix = matrix.reindex(columns=days, fill_value=0.0)
+        return matrix.index.to_numpy().astype(str), matrix.to_numpy(dtype=float), days
+
+    def product_demand(self):
+        """Rata-rata dan simpangan baku permintaan harian per produk (hari kosong = 0)."""
+        names, matrix, days = self._product_matrix()
+        return {
+            "product": names,
+            "days": np.full(names.size, days.size),
+            "daily_mean": matrix.mean(axis=1) if days.size else np.zeros(names.size),
+            "daily_std": matrix.std(axis=1, ddof=1) if days.size > 1 else np.zeros(names.size),
+            "annual_demand": matrix.mean(axis=1) * 365 if days.size else np.zeros(names.size),
+        }
+
+    def material_usage(self, catalog, period_days=1):
+        """Pemakaian bahan (bahan x periode) lewat BOM katalog; produk tak dikenal diabaikan.
+
+        Hari dikelompokkan per ``period_days`` dihitung mundur dari hari terakhir,
+        sehingga hanya periode lengkap yang ikut.
+        """
+        names, matrix, days = self._product_matrix()
+        known = catalog.product_index(names, missing="ignore") if names.size else np.zeros(0, int)
+        periods = days.size // period_days
+        matrix = matrix[:, days.size - periods * period_days:]
+        matrix = matrix.reshape(names.size, periods, period_days).sum(axis=2)
+        full = np.zeros((catalog.n_products, periods))
+        full[known[known >= 0]] = matrix[known >= 0]
+        return catalog.material_demand(full)
+
+    def material_demand(self, catalog):
+        """Statistik permintaan harian per bahan lewat BOM katalog."""
+        usage = self.material_usage(catalog)
+        days = usage.shape[1]
+        return {
+            "material": catalog.materials["name"],
+            "daily_mean": usage.mean(axis=1) if days else np.zeros(catalog.n_materials),
+            "daily_std": usage.std(axis=1, ddof=1) if days > 1 else np.zeros(catalog.n_materials),
+        }
+
+    def queue_rates(self, hours_per_day=8, product=None):
+        """Laju kedatangan order per jam kerja dan laju layanan dari waktu layanan rata-rata."""
+        daily = self.daily()
+        if product is not None:
+            daily = daily[daily.index.get_level_values("product") == product]
+        if daily.empty:
+            return None
+        day_values = daily.index.get_level_values("day")
+        span = int(day_values.max() - day_values.min() + 1)
+        totals = daily.sum()
+        arrival_rate = totals["orders"] / (span * hours_per_day)
+        if totals["service_n"] == 0:
+            return {"arrival_rate": arrival_rate, "service_rate": np.nan, "service_cv": np.nan, "days": span}
+        mean = totals["service_sum"] / totals["service_n"]
+        var = max(totals["service_sumsq"] / totals["service_n"] - mean ** 2, 0.0)
+        return {"arrival_rate": arrival_rate, "service_rate": 1 / mean if mean > 0 else np.nan,
+                "service_cv": np.sqrt(var) / mean if mean > 0 else np.nan, "days": span}
+
+    def monthly(self, product=None):
+        """Ringkasan bulanan: kuantitas, order, jam layanan dan jumlah hari teramati."""
+        import pandas as pd
+
+        daily = self.daily()
+        if product is not None:
+            daily = daily[daily.index.get_level_values("product") == product]
+        if daily.empty:
+            return pd.DataFrame(columns=["month", "quantity", "orders", "service_sum", "days"])
+        per_day = daily.groupby(level="day").sum()
+        month = per_day.index.to_numpy().astype("datetime64[D]").astype("datetime64[M]")
+        summary = per_day.groupby(month).agg(quantity=("quantity", "sum"), orders=("orders", "sum"),
+                                              service_sum=("service_sum", "sum"))
+        first, last = per_day.index.min(), per_day.index.max()
+        all_days = np.arange(first, last + 1).astype("datetime64[D]").astype("datetime64[M]")
+        summary["days"] = pd.Series(all_days).value_counts().reindex(summary.index).to_numpy()
+        return summary.rename_axis("month").reset_index()
+
+    # --- persistensi ----------------------------------------------------------------
+
+    def save(self, path):
+        """Menyimpan agregat dan daftar file yang sudah diproses (``.npz``)."""
+        daily = self.daily()
+        np.savez(path,
+                 product=daily.index.get_level_values("product").to_numpy().astype(str),
+                 day=daily.index.get_level_values("day").to_numpy(dtype=np.int64),
+                 values=daily[list(AGGREGATE_COLUMNS)].to_numpy(dtype=float),
+                 files=np.array([repr(key) for key in self.files], dtype=str),
+                 file_rows=np.array(list(self.files.values()), dtype=np.int64),
+                 window_days=np.array(-1 if self.window_days is None else self.window_days),
+                 rows=np.array(self.rows))
+
+    @classmethod
+    def load(cls, path):
+        import ast
+
+        import pandas as pd
+
+        with np.load(path) as data:
+            window = int(data["window_days"])
+            history = cls(None if window < 0 else window)
+            index = pd.MultiIndex.from_arrays([data["product"], data["day"]], names=["product", "day"])
+            history._daily = pd.DataFrame(data["values"], index=index, columns=list(AGGREGATE_COLUMNS))
+            history.files = {ast.literal_eval(key): int(rows)
+                             for key, rows in zip(data["files"], data["file_rows"])}
+            history.rows = int(data["rows"])
+        return history
+
+
+def inventory_from_history(history, catalog, order_cost, service_level=0.95):
+    """EOQ dan ROP per bahan baku dari permintaan historis (safety stock z * sigma * sqrt(L))."""
+    from statistics import NormalDist
+
+    stats = history.material_demand(catalog)
+    lead_time = catalog.materials["lead_time"]
+    safety_stock = NormalDist().inv_cdf(service_level) * stats["daily_std"] * np.sqrt(lead_time)
+    inventory = calculate_eoq_batch(stats["daily_mean"] * 365, order_cost, catalog.materials["holding_cost"],
+                                    catalog.materials["harga"], lead_time, safety_stock)
+    return {
+        "Bahan Baku": catalog.materials["name"].tolist(),
+        "Permintaan Harian (kg)": stats["daily_mean"],
+        "Std Harian (kg)": stats["daily_std"],
+        "EOQ (kg)": inventory["eoq"],
+        "Safety Stock (kg)": safety_stock,
+        "ROP (kg)": calculate_rop_batch(stats["daily_mean"], lead_time, safety_stock),
+        "Biaya Persediaan (Rp)": inventory["total_cost"],
+    }
+
+
+def queue_from_history(history, servers=1, hours_per_day=8, product=None):
+    """Metrik antrian M/M/c dari laju kedatangan dan layanan historis (None bila tidak stabil/kurang data)."""
+    rates = history.queue_rates(hours_per_day, product)
+    if rates is None or not np.isfinite(rates["service_rate"]):
+        return None
+    return calculate_queue_metrics(rates["arrival_rate"], rates["service_rate"], servers)
+
+
+def monthly_efficiency(history, product, production_capacity, products, months=6):
+    """Efisiensi keseluruhan per bulan dari permintaan historis ``product``.
+
+    Memakai tahap kapasitas, antrian dan efisiensi yang sama dengan analisis
+    terintegrasi; mengembalikan dict ``month`` (label ``YYYY-MM``) dan ``efficiency``.
+    """
+    summary = history.monthly(product).tail(months)
+    efficiency = []
+    for quantity, days in zip(summary["quantity"], summary["days"]):
+        capacity = capacity_stage(products[product], quantity / days * 30, production_capacity)
+        efficiency.append(efficiency_stage(capacity, queue_stage(capacity)))
+    return {"month": [str(month)[:7] for month in summary["month"]], "efficiency": efficiency}
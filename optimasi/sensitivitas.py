@@ -0,0 +1,195 @@
+"""Sweep skenario N-dimensi (what-if grid) untuk model EOQ, ROP, antrian dan produksi.
+
+Grid didefinisikan sebagai dict ``parameter -> nilai sumbu``; hasilnya kubus
+berbentuk ``(len(sumbu_1), ..., len(sumbu_n))`` per metrik. Ruang indeks
+dipotong menjadi potongan datar berukuran ``chunk_size`` sehingga memori
+sementara tetap terbatas berapa pun jumlah titiknya. Model vektor (EOQ, ROP,
+antrian) menghitung satu potongan dengan sekali panggilan; model produksi
+(MILP) dihitung per titik. Potongan dapat dibagi ke ``ProcessPoolExecutor``
+dan, bila ``directory`` diberikan, langsung ditulis ke file ``.npy`` yang
+di-memory-map sehingga kubus berukuran jutaan titik tidak perlu muat di RAM.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .antrian import calculate_queue_metrics_batch
+from .persediaan import calculate_eoq_batch, calculate_rop_batch
+from .produksi import optimize_production_plan
+
+# Di bawah jumlah titik ini overhead proses lebih mahal daripada perhitungannya
+PARALLEL_THRESHOLD = 2_000_000
+
+
+def _eoq_model(demand, order_cost, holding_cost, unit_cost, lead_time=0.0, safety_stock=0.0):
+    # Memakai fungsi asli tanpa cache: setiap potongan hanya dihitung sekali
+    result = calculate_eoq_batch.__wrapped__(demand, order_cost, holding_cost, unit_cost,
+                                             lead_time, safety_stock)
+    return {key: result[key] for key in ("eoq", "rop", "total_cost", "order_frequency")}
+
+
+def _rop_model(demand_rate, lead_time, safety_stock=0.0):
+    return {"rop": calculate_rop_batch(demand_rate, lead_time, safety_stock)}
+
+
+def _queue_model(arrival_rate, service_rate, servers=1):
+    result = calculate_queue_metrics_batch.__wrapped__(arrival_rate, service_rate, servers)
+    return {key: result[key] for key in ("utilization", "avg_queue_length", "avg_wait_time",
+                                         "avg_system_time", "prob_wait")}
+
+
+def _production_model(products, bahan_baku, constraints=None, time_limit=0.3, **axes):
+    # MILP per titik: ``axes`` berupa array sepanjang potongan, ``constraints`` nilai tetap
+    size = len(next(iter(axes.values())))
+    out = {key: np.empty(size) for key in ("total_profit", "total_waktu", "gap")}
+    for i in range(size):
+        point = {**(constraints or {}), **{key: float(values[i]) for key, values in axes.items()}}
+        plan = optimize_production_plan.__wrapped__(products, bahan_baku, point, time_limit)
+        for key in out:
+            out[key][i] = plan[key]
+    return out
+
+
+# Nama model -> (fungsi, parameter yang boleh menjadi sumbu, metrik keluaran)
+MODELS = {
+    "eoq": (_eoq_model, ("demand", "order_cost", "holding_cost", "unit_cost", "lead_time", "safety_stock"),
+            ("eoq", "rop", "total_cost", "order_frequency")),
+    "rop": (_rop_model, ("demand_rate", "lead_time", "safety_stock"), ("rop",)),
+    "queue": (_queue_model, ("arrival_rate", "service_rate", "servers"),
+              ("utilization", "avg_queue_length", "avg_wait_time", "avg_system_time", "prob_wait")),
+    "production": (_production_model, ("kapasitas", "efisiensi", "periode", "biaya_setup"),
+                   ("total_profit", "total_waktu", "gap")),
+}
+
+
+def _output_path(directory, name):
+    return os.path.join(directory, f"{name}.npy")
+
+
+def _run_chunk(task):
+    """Worker: menghitung indeks datar [start, stop) lalu menulis/mengembalikan hasilnya."""
+    model, names, axes, fixed, start, stop, directory = task
+    func, _, outputs = MODELS[model]
+    shape = tuple(len(axis) for axis in axes)
+    index = np.unravel_index(np.arange(start, stop), shape)
+    params = {name: np.asarray(axis)[idx] for name, axis, idx in zip(names, axes, index)}
+    with np.errstate(all="ignore"):
+        result = func(**params, **fixed)
+    values = {key: np.broadcast_to(np.asarray(result[key], dtype=float), (stop - start,)) for key in outputs}
+    if directory is None:
+        return start, stop, values
+    for key, value in values.items():
+        cube = np.load(_output_path(directory, key), mmap_mode="r+")
+        cube.reshape(-1)[start:stop] = value
+        cube.flush()
+        del cube
+    return start, stop, None
+
+
+def run_sweep(model, grid, fixed=None, directory=None, chunk_size=262_144, workers=None, progress=None):
+    """Mengevaluasi ``model`` pada setiap titik grid kartesius.
+
+    ``grid`` adalah dict ``parameter -> nilai sumbu`` (urutan dict = urutan
+    dimensi); ``fixed`` berisi parameter lain yang sama untuk semua titik
+    (untuk ``"production"`` wajib memuat ``products`` dan ``bahan_baku``, dan
+    boleh memuat ``constraints`` seperti pada :func:`optimize_production_plan`).
+    Bila ``directory`` diberikan, kubus ditulis sebagai ``<metrik>.npy``
+    beserta ``axis_<parameter>.npy`` dan ``meta.json`` lalu dibuka kembali
+    sebagai memmap. ``progress(selesai, total)`` dipanggil setiap potongan.
+
+    Mengembalikan dict ``axes`` (parameter -> nilai), ``outputs`` (metrik ->
+    kubus) dan ``shape``.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Model '{model}' tidak dikenal; pilih salah satu dari {tuple(MODELS)}")
+    func, allowed, outputs = MODELS[model]
+    unknown = [name for name in grid if name not in allowed]
+    if unknown:
+        raise ValueError(f"Parameter sumbu tidak dikenal untuk model '{model}': {', '.join(unknown)}")
+    names = list(grid)
+    axes = [np.atleast_1d(np.asarray(grid[name], dtype=float)) for name in names]
+    shape = tuple(axis.size for axis in axes)
+    total = int(np.prod(shape, dtype=np.int64))
+    fixed = dict(fixed or {})
+    overlap = set(fixed) & set(names)
+    if overlap:
+        raise ValueError(f"Parameter sekaligus sumbu dan nilai tetap: {', '.join(sorted(overlap))}")
+    if model == "production":
+        chunk_size = min(chunk_size, 64)  # MILP per titik: potongan kecil agar beban merata
+
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+        for key in outputs:
+            np.lib.format.open_memmap(_output_path(directory, key), mode="w+", dtype=float, shape=shape).flush()
+        for name, axis in zip(names, axes):
+            np.save(os.path.join(directory, f"axis_{name}.npy"), axis)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as handle:
+            json.dump({"model": model, "axes": names, "outputs": list(outputs), "shape": list(shape),
+                       "fixed": {k: v for k, v in fixed.items() if isinstance(v, (int, float, str, bool))}},
+                      handle)
+        cubes = None
+    else:
+        cubes = {key: np.empty(shape) for key in outputs}
+
+    tasks = [(model, names, axes, fixed, start, min(start + chunk_size, total), directory)
+             for start in range(0, total, chunk_size)]
+    if workers is None:
+        large = total >= PARALLEL_THRESHOLD or model == "production"
+        workers = (os.cpu_count() or 1) if large else 1
+    workers = max(min(workers, len(tasks)), 1)
+
+    def collect(results):
+        done = 0
+        for start, stop, values in results:
+            if values is not None:
+                for key, value in values.items():
+                    cubes[key].reshape(-1)[start:stop] = value
+            done += stop - start
+            if progress is not None:
+                progress(done, total)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            collect(pool.map(_run_chunk, tasks))
+    else:
+        collect(map(_run_chunk, tasks))
+
+    if directory is not None:
+        return load_sweep(directory)
+    return {"axes": dict(zip(names, axes)), "outputs": cubes, "shape": shape}
+
+
+def load_sweep(directory, mmap_mode="r"):
+    """Membuka kubus hasil :func:`run_sweep` dari disk (memmap)."""
+    with open(os.path.join(directory, "meta.json"), encoding="utf-8") as handle:
+        meta = json.load(handle)
+    return {
+        "axes": {name: np.load(os.path.join(directory, f"axis_{name}.npy")) for name in meta["axes"]},
+        "outputs": {key: np.load(_output_path(directory, key), mmap_mode=mmap_mode) for key in meta["outputs"]},
+        "shape": tuple(meta["shape"]),
+    }
+
+
+def sweep_slice(result, output, rows, cols, **at):
+    """Irisan 2D (``rows`` x ``cols``) dari kubus untuk heatmap.
+
+    Sumbu lain dipilih pada nilai terdekat dengan ``at[parameter]`` (default:
+    titik tengah sumbu). Mengembalikan ``(nilai_rows, nilai_cols, matriks)``.
+    """
+    names = list(result["axes"])
+    index = []
+    for name in names:
+        axis = result["axes"][name]
+        if name in (rows, cols):
+            index.append(slice(None))
+        elif name in at:
+            index.append(int(np.abs(axis - at[name]).argmin()))
+        else:
+            index.append(axis.size // 2)
+    block = np.asarray(result["outputs"][output][tuple(index)])
+    if names.index(rows) > names.index(cols):
+        block = block.T
+    return result["axes"][rows], result["axes"][cols], block
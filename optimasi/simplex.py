@@ -0,0 +1,417 @@
+"""Simplex berbatas dan branch-and-bound murni NumPy untuk masalah produksi.
+
+Bentuk masalah yang didukung::
+
+    maksimalkan  c @ x - sum(f_j untuk x_j > 0)
+    dengan       A @ x <= b,  lower <= x <= upper,  x_j bulat bila integer[j]
+
+Biaya tetap ``f_j`` (biaya setup) dimodelkan dengan biner implisit: relaksasi
+LP-nya setara dengan mengurangi ``f_j / upper_j`` dari profit per unit, sehingga
+LP tidak perlu baris tambahan untuk setiap produk. Setiap simpul branch-and-bound
+melanjutkan tableau induknya (warm start) alih-alih menyelesaikan LP dari nol.
+"""
+
+import time
+
+import numpy as np
+
+TOL = 1e-9
+
+
+class _Tableau:
+    """Tableau simplex berbatas (maksimisasi) dengan batas variabel umum.
+
+    Variabel non-basis berada di batas bawah atau atas (``at_upper``);
+    ``beta`` menyimpan nilai variabel basis.
+    """
+
+    def __init__(self, tableau, beta, basis, cost, lo, up):
+        self.tableau = tableau
+        self.beta = beta
+        self.basis = basis
+        self.cost = cost
+        self.lo = lo
+        self.up = up
+        self.at_upper = np.zeros(cost.size, dtype=bool)
+        self.is_basic = np.zeros(cost.size, dtype=bool)
+        self.is_basic[basis] = True
+        self.reduced = None
+
+    def copy(self):
+        other = _Tableau.__new__(_Tableau)
+        for name in ("tableau", "beta", "basis", "cost", "lo", "up", "at_upper", "is_basic", "reduced"):
+            setattr(other, name, getattr(self, name).copy())
+        return other
+
+    def price(self):
+        self.reduced = self.cost - self.cost[self.basis] @ self.tableau
+
+    def nonbasic_values(self):
+        return np.where(self.at_upper, self.up, self.lo)
+
+    def values(self):
+        x = self.nonbasic_values()
+        x[self.basis] = self.beta
+        return x
+
+    def _pivot(self, r, j):
+        alpha = self.tableau[:, j]
+        pivot_row = self.tableau[r] / alpha[r]
+        rows = np.flatnonzero(alpha)
+        if rows.size * 4 < alpha.size:
+            # Kolom pivot jarang (BOM biasanya jarang): hanya perbarui baris yang terdampak
+            self.tableau[rows] -= np.outer(alpha[rows], pivot_row)
+        else:
+            self.tableau -= np.outer(alpha, pivot_row)
+        self.tableau[r] = pivot_row
+        self.reduced -= self.reduced[j] * pivot_row
+        leaving = self.basis[r]
+        self.is_basic[leaving] = False
+        self.is_basic[j] = True
+        self.at_upper[j] = False
+        self.basis[r] = j
+
+    def primal(self, max_iter):
+        """Simplex primal; mengembalikan ``"optimal"``, ``"unbounded"`` atau ``"iteration_limit"``.
+
+        Aturan Dantzig dipakai, dengan fallback ke aturan Bland setelah beberapa
+        langkah degenerate berturut-turut untuk mencegah cycling.
+        """
+        movable = self.up - self.lo > TOL
+        degenerate_steps = 0
+        for _ in range(max_iter):
+            # Kandidat: naik dari batas bawah (d > 0) atau turun dari batas atas (d < 0)
+            score = np.where(self.at_upper, -self.reduced, self.reduced)
+            score[self.is_basic | ~movable] = 0.0
+            if degenerate_steps > 50:
+                candidates = np.flatnonzero(score > TOL)
+                if candidates.size == 0:
+                    return "optimal"
+                j = candidates[0]
+            else:
+                j = int(np.argmax(score))
+                if score[j] <= TOL:
+                    return "optimal"
+
+            sigma = -1.0 if self.at_upper[j] else 1.0
+            alpha = self.tableau[:, j]
+            g = sigma * alpha
+            lo_b, up_b = self.lo[self.basis], self.up[self.basis]
+            ratios = np.full(alpha.size, np.inf)
+            dec = g > TOL
+            inc = g < -TOL
+            ratios[dec] = (self.beta[dec] - lo_b[dec]) / g[dec]
+            ratios[inc] = (up_b[inc] - self.beta[inc]) / -g[inc]
+            ratios = np.maximum(ratios, 0.0)
+            r = int(np.argmin(ratios)) if ratios.size else -1
+            t_pivot = ratios[r] if ratios.size else np.inf
+            span = self.up[j] - self.lo[j]
+            t = min(t_pivot, span)
+            if not np.isfinite(t):
+                return "unbounded"
+            degenerate_steps = degenerate_steps + 1 if t <= TOL else 0
+
+            entering_value = (self.up[j] if self.at_upper[j] else self.lo[j]) + sigma * t
+            self.beta -= sigma * t * alpha
+            if span <= t_pivot:
+                # Bound flip: variabel masuk langsung pindah ke batas lainnya
+                self.at_upper[j] = not self.at_upper[j]
+                continue
+
+            leaving = self.basis[r]
+            self._pivot(r, j)
+            self.at_upper[leaving] = g[r] < 0
+            self.beta[r] = entering_value
+        return "iteration_limit"
+
+    def dual(self, max_iter):
+        """Simplex dual dari basis yang optimal-dual tetapi melanggar batas.
+
+        Mengembalikan ``"optimal"``, ``"infeasible"`` atau ``"iteration_limit"``.
+        """
+        movable = self.up - self.lo > TOL
+        for _ in range(max_iter):
+            lo_b, up_b = self.lo[self.basis], self.up[self.basis]
+            below = lo_b - self.beta
+            above = self.beta - up_b
+            violation = np.maximum(below, above)
+            r = int(np.argmax(violation)) if violation.size else -1
+            if r < 0 or violation[r] <= 1e-9 * max(1.0, abs(self.beta[r])):
+                return "optimal"
+
+            to_lower = below[r] > 0
+            target = lo_b[r] if to_lower else up_b[r]
+            row = self.tableau[r]
+            # x_r = beta_r - row @ dx; cari arah non-basis yang menggeser x_r ke target
+            direction = np.where(self.at_upper, -1.0, 1.0)
+            eligible = movable & ~self.is_basic
+            if to_lower:
+                eligible &= row * direction < -TOL
+            else:
+                eligible &= row * direction > TOL
+            if not eligible.any():
+                return "infeasible"
+            candidates = np.flatnonzero(eligible)
+            ratios = np.abs(self.reduced[candidates] / row[candidates])
+            j = candidates[int(np.argmin(ratios))]
+
+            delta = (self.beta[r] - target) / row[j]
+            entering_value = self.nonbasic_values()[j] + delta
+            self.beta -= self.tableau[:, j] * delta
+            leaving = self.basis[r]
+            self._pivot(r, j)
+            self.at_upper[leaving] = not to_lower
+            self.beta[r] = entering_value
+        return "iteration_limit"
+
+    def set_cost(self, j, value):
+        delta = value - self.cost[j]
+        if delta == 0:
+            return
+        self.cost[j] = value
+        if self.is_basic[j]:
+            r = int(np.flatnonzero(self.basis == j)[0])
+            self.reduced -= delta * self.tableau[r]
+            self.reduced[j] = 0.0
+        else:
+            self.reduced[j] += delta
+
+    def set_bounds(self, j, lo, up):
+        if not self.is_basic[j]:
+            old = self.up[j] if self.at_upper[j] else self.lo[j]
+            self.lo[j], self.up[j] = lo, up
+            self.at_upper[j] = self.at_upper[j] and np.isfinite(up)
+            new = self.up[j] if self.at_upper[j] else self.lo[j]
+            if new != old:
+                self.beta -= self.tableau[:, j] * (new - old)
+        else:
+            self.lo[j], self.up[j] = lo, up
+
+
+def _build_tableau(c, A, b, lower, upper):
+    """Tableau awal dengan slack (dan artifisial untuk baris yang dilanggar)."""
+    n, m = c.size, b.size
+    rhs = b - A @ lower
+    negative = rhs < 0
+    sign = np.where(negative, -1.0, 1.0)
+    n_art = int(negative.sum())
+    n_cols = n + m + n_art
+
+    tableau = np.zeros((m, n_cols))
+    tableau[:, :n] = A * sign[:, None]
+    tableau[np.arange(m), n + np.arange(m)] = sign
+    art_rows = np.flatnonzero(negative)
+    tableau[art_rows, n + m + np.arange(n_art)] = 1.0
+    # Variabel struktural di batas bawah; nilai basis = slack atau artifisial
+    beta = np.abs(rhs)
+
+    basis = n + np.arange(m)
+    basis[art_rows] = n + m + np.arange(n_art)
+    lo = np.concatenate([lower, np.zeros(m + n_art)])
+    up = np.concatenate([upper, np.full(m + n_art, np.inf)])
+    cost = np.zeros(n_cols)
+    return _Tableau(tableau, beta, basis, cost, lo, up), n_art
+
+
+def _solve_tableau(c, A, b, lower, upper, max_iter):
+    n, m = c.size, b.size
+    if np.any(upper < lower - TOL):
+        return "infeasible", None
+    state, n_art = _build_tableau(c, A, b, lower, upper)
+
+    if n_art:
+        # Fase 1: minimalkan jumlah variabel artifisial
+        state.cost[n + m:] = -1.0
+        state.price()
+        status = state.primal(max_iter)
+        if status == "iteration_limit":
+            return status, None
+        infeasibility = -state.cost[state.basis] @ state.beta
+        if infeasibility > 1e-7 * max(1.0, np.abs(b).max()):
+            return "infeasible", None
+        # Artifisial dikunci di nol; yang masih basis tetap bernilai nol
+        state.up[n + m:] = 0.0
+        state.at_upper[n + m:] = False
+        state.cost[n + m:] = 0.0
+
+    state.cost[:n] = c
+    state.price()
+    return state.primal(max_iter), state
+
+
+def solve_lp(c, A, b, lower=None, upper=None, max_iter=None):
+    """Menyelesaikan LP ``max c@x`` dengan ``A@x <= b`` dan ``lower <= x <= upper``.
+
+    Simplex dua fase dengan batas variabel implisit. Mengembalikan dict berisi
+    ``status`` (``"optimal"``, ``"infeasible"``, ``"unbounded"`` atau
+    ``"iteration_limit"``), ``x`` dan ``objective``.
+    """
+    c = np.asarray(c, dtype=float)
+    n = c.size
+    A = np.atleast_2d(np.asarray(A, dtype=float)).reshape(-1, n)
+    b = np.asarray(b, dtype=float).reshape(-1)
+    lower = np.zeros(n) if lower is None else np.asarray(lower, dtype=float)
+    upper = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=float)
+    max_iter = max_iter or 50 * (n + b.size + 10)
+
+    status, state = _solve_tableau(c, A, b, lower, upper, max_iter)
+    if status != "optimal":
+        return {"status": status, "x": None, "objective": np.nan}
+    x = np.clip(state.values()[:n], lower, upper)
+    return {"status": "optimal", "x": x, "objective": float(c @ x)}
+
+
+def _true_objective(c, fixed_cost, x):
+    return float(c @ x - fixed_cost[x > TOL].sum())
+
+
+def _is_feasible(A, b, lower, upper, x):
+    slack = 1e-7 * max(1.0, np.abs(b).max()) if b.size else 1e-7
+    return bool(np.all(A @ x <= b + slack) and np.all(x >= lower - 1e-9) and np.all(x <= upper + 1e-9))
+
+
+def _round_down(c, A, b, lower, upper, integer, fixed_cost, x):
+    """Heuristik incumbent: bulatkan ke bawah lalu tutup produk yang tidak menutup biaya tetapnya."""
+    rounded = np.where(integer, np.maximum(np.floor(x + 1e-9), lower), x)
+    if not _is_feasible(A, b, lower, upper, rounded):
+        return None
+    losing = (rounded > TOL) & (lower <= 0) & (c * rounded < fixed_cost)
+    if losing.any():
+        trimmed = np.where(losing, 0.0, rounded)
+        if _is_feasible(A, b, lower, upper, trimmed):
+            return trimmed
+    return rounded
+
+
+def solve_milp(c, A, b, lower=None, upper=None, integer=None, fixed_cost=None,
+               time_limit=0.5, node_limit=20000, max_iter=None):
+    """Branch-and-bound depth-first dengan LP warm start.
+
+    ``integer`` menandai variabel bulat dan ``fixed_cost`` adalah biaya tetap
+    yang dibayar bila variabel bernilai positif (membutuhkan ``upper`` hingga).
+    Pencarian berhenti pada ``time_limit`` detik atau ``node_limit`` simpul dan
+    mengembalikan solusi terbaik (``x``, ``objective``) beserta batas atas
+    (``bound``), ``gap`` relatif dan jumlah simpul (``nodes``).
+    """
+    c = np.asarray(c, dtype=float)
+    n = c.size
+    A = np.atleast_2d(np.asarray(A, dtype=float)).reshape(-1, n)
+    b = np.asarray(b, dtype=float).reshape(-1)
+    lower = np.zeros(n) if lower is None else np.asarray(lower, dtype=float)
+    upper = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=float)
+    integer = np.zeros(n, dtype=bool) if integer is None else np.asarray(integer, dtype=bool)
+    fixed_cost = np.zeros(n) if fixed_cost is None else np.asarray(fixed_cost, dtype=float)
+    charged = fixed_cost > 0
+    if np.any(charged & ~np.isfinite(upper)):
+        raise ValueError("Variabel dengan biaya tetap membutuhkan batas atas yang hingga")
+    max_iter = max_iter or 50 * (n + b.size + 10)
+
+    lower = np.where(integer, np.ceil(lower - 1e-9), lower)
+    upper = np.where(integer, np.floor(upper + 1e-9), upper)
+
+    def node_cost(node_upper, node_open):
+        # Biner implisit yang belum diputuskan: y = x / upper pada relaksasi
+        undecided = charged & (node_open == -1)
+        safe_upper = np.where(node_upper > TOL, node_upper, 1.0)
+        return c - np.where(undecided, fixed_cost / safe_upper, 0.0)
+
+    def node_upper_bound(node_upper, node_open):
+        return np.where(node_open == 0, 0.0, node_upper)
+
+    def cold_solve(node_lower, node_upper, node_open):
+        return _solve_tableau(node_cost(node_upper, node_open), A, b, node_lower,
+                              node_upper_bound(node_upper, node_open), max_iter)
+
+    start = time.perf_counter()
+    # open: -1 belum diputuskan, 0 ditutup (x = 0), 1 dibuka (biaya tetap dibayar)
+    root_open = np.where(charged, np.where(lower > TOL, 1, -1), 1)
+    status, root_state = cold_solve(lower, upper, root_open)
+    if status != "optimal":
+        return {"status": status, "x": None, "objective": np.nan,
+                "bound": np.nan, "gap": np.nan, "nodes": 1}
+
+    best_x, best_value = None, -np.inf
+    root_bound = None
+    nodes = 0
+    status = "optimal"
+    # Entri tumpukan: (tableau induk, variabel yang diubah, lower, upper, open) simpul
+    stack = [(root_state, None, lower, upper, root_open)]
+
+    while stack:
+        # Simpul akar selalu diproses agar selalu ada incumbent dari pembulatan
+        if nodes and (nodes >= node_limit or time.perf_counter() - start > time_limit):
+            status = "time_limit"
+            break
+        parent, j, node_lower, node_upper, node_open = stack.pop()
+        nodes += 1
+
+        if j is None:
+            state, lp_status = parent, "optimal"
+        else:
+            state = parent.copy()
+            state.set_cost(j, node_cost(node_upper, node_open)[j])
+            lp_status = state.primal(max_iter)
+            if lp_status == "optimal":
+                state.set_bounds(j, node_lower[j], node_upper_bound(node_upper, node_open)[j])
+                lp_status = state.dual(max_iter)
+            if lp_status == "iteration_limit":
+                lp_status, state = cold_solve(node_lower, node_upper, node_open)
+        if lp_status != "optimal":
+            continue
+
+        x = np.clip(state.values()[:n], node_lower, node_upper_bound(node_upper, node_open))
+        constant = fixed_cost[charged & (node_open == 1)].sum()
+        bound = float(node_cost(node_upper, node_open) @ x) - constant
+        if root_bound is None:
+            root_bound = bound
+        if bound <= best_value + 1e-9 * max(1.0, abs(best_value)):
+            continue
+
+        candidate = _round_down(c, A, b, node_lower, node_upper, integer, fixed_cost, x)
+        if candidate is not None:
+            value = _true_objective(c, fixed_cost, candidate)
+            if value > best_value:
+                best_x, best_value = candidate, value
+
+        undecided = charged & (node_open == -1)
+        y = np.where(undecided, x / np.where(node_upper > TOL, node_upper, 1.0), 0.0)
+        frac_open = np.where(undecided & (x > TOL), np.minimum(y, 1 - y), 0.0)
+        frac_int = np.where(integer, np.abs(x - np.round(x)), 0.0)
+
+        if frac_open.max(initial=0.0) > 1e-6:
+            k = int(np.argmax(frac_open))
+            closed, opened = node_open.copy(), node_open.copy()
+            closed[k], opened[k] = 0, 1
+            children = [(state, k, node_lower, node_upper, closed),
+                        (state, k, node_lower, node_upper, opened)]
+            if y[k] >= 0.5:
+                children.reverse()
+        elif frac_int.max(initial=0.0) > 1e-6:
+            k = int(np.argmax(frac_int))
+            down_upper, up_lower = node_upper.copy(), node_lower.copy()
+            down_upper[k] = np.floor(x[k])
+            up_lower[k] = np.ceil(x[k])
+            up_open = node_open.copy()
+            if charged[k]:
+                up_open[k] = 1
+            children = [(state, k, node_lower, down_upper, node_open),
+                        (state, k, up_lower, node_upper, up_open)]
+            if x[k] - np.floor(x[k]) >= 0.5:
+                children.reverse()
+        else:
+            # Solusi LP sudah bulat dan biner implisitnya 0 atau 1: relaksasi eksak
+            value = _true_objective(c, fixed_cost, x)
+            if value > best_value:
+                best_x, best_value = x, value
+            continue
+        # Tumpukan LIFO: anak yang lebih menjanjikan (urutan pertama) diproses lebih dulu
+        stack.extend(reversed(children))
+
+    if best_x is None:
+        return {"status": "infeasible" if status == "optimal" else status, "x": None,
+                "objective": np.nan, "bound": root_bound, "gap": np.nan, "nodes": nodes}
+    # Bila pencarian terhenti, batas relaksasi akar tetap batas atas yang sah
+    bound = best_value if status == "optimal" else max(best_value, root_bound)
+    gap = (bound - best_value) / max(1.0, abs(best_value))
+    return {"status": status, "x": best_x, "objective": best_value,
+            "bound": bound, "gap": gap, "nodes": nodes}
@@ -0,0 +1,193 @@
+"""Simulasi kejadian diskrit antrian G/G/c (FCFS) untuk memvalidasi rumus analitik.
+
+Replikasi independen dijalankan serempak sebagai matriks (replikasi x job).
+Untuk satu server dipakai rekursi Lindley yang sepenuhnya tervektorisasi:
+``W = X - min(0, min_{k<=n} X_k)`` dengan ``X`` jumlah kumulatif (S - A).
+Untuk c server, setiap job diberikan ke server yang paling cepat kosong
+(setara FCFS G/G/c); langkah per job dijalankan sekaligus untuk semua replikasi
+dan untuk semua blok job (lihat ``_waits_multi_server``).
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+from .cache import memoize
+
+PATTERNS = ("Poisson", "Eksponensial", "Deterministik", "Erlang", "Empiris")
+CHUNK_JOBS = 1024
+MAX_PASSES = 4
+# Jumlah langkah job di antara dua panggilan ``progress`` (titik pembatalan)
+PROGRESS_STEPS = 256
+
+
+def sample_times(pattern, rate, size, rng, erlang_k=2, data=None):
+    """Membangkitkan waktu antar-kedatangan atau waktu layanan dengan rata-rata ``1 / rate``.
+
+    ``pattern``: ``"Poisson"``/``"Eksponensial"`` (eksponensial), ``"Deterministik"``,
+    ``"Erlang"`` (k fase, ``erlang_k``) atau ``"Empiris"`` (sampel ulang dari ``data``).
+    """
+    mean = 1.0 / rate
+    if pattern in ("Poisson", "Eksponensial"):
+        return rng.exponential(mean, size)
+    if pattern == "Deterministik":
+        return np.full(size, mean)
+    if pattern == "Erlang":
+        return rng.gamma(erlang_k, mean / erlang_k, size)
+    if pattern == "Empiris":
+        if data is None or len(data) == 0:
+            raise ValueError("Pola 'Empiris' membutuhkan data waktu pengamatan")
+        return rng.choice(np.asarray(data, dtype=float), size)
+    raise ValueError(f"Pola '{pattern}' tidak dikenal; pilih salah satu dari {PATTERNS}")
+
+
+def _waits_single_server(interarrival, service):
+    """Rekursi Lindley W_{n+1} = max(0, W_n + S_n - A_{n+1}) dalam bentuk tervektorisasi."""
+    step = np.zeros_like(service)
+    step[:, 1:] = service[:, :-1] - interarrival[:, 1:]
+    x = np.cumsum(step, axis=1)
+    return x - np.minimum(np.minimum.accumulate(x, axis=1), 0.0)
+
+
+def _run_servers(arrivals, service, free_at, progress=None):
+    """Rekursi FCFS c server untuk baris-baris independen mulai dari keadaan ``free_at``.
+
+    Mengembalikan waktu tunggu per job dan waktu kosong server di akhir baris.
+    ``progress(langkah, total)`` dipanggil setiap ``PROGRESS_STEPS`` langkah.
+    """
+    rows, n_jobs = arrivals.shape
+    servers = free_at.shape[1]
+    free_at = free_at.copy()
+    flat = free_at.reshape(-1)
+    offset = np.arange(rows) * servers
+    arrivals_t = np.ascontiguousarray(arrivals.T)
+    service_t = np.ascontiguousarray(service.T)
+    waits = np.empty_like(arrivals_t)
+    start = np.empty(rows)
+    for i in range(n_jobs):
+        if progress is not None and i % PROGRESS_STEPS == 0:
+            progress(i, n_jobs)
+        slot = free_at.argmin(axis=1)
+        slot += offset
+        np.maximum(arrivals_t[i], flat[slot], out=start)
+        np.subtract(start, arrivals_t[i], out=waits[i])
+        start += service_t[i]
+        flat[slot] = start
+    return waits.T, free_at
+
+
+def _same_state(a, b, next_arrival):
+    """Dua keadaan server setara bila waktu kosong efektifnya (terurut) sama persis."""
+    a = np.sort(np.maximum(a, next_arrival), axis=-1)
+    b = np.sort(np.maximum(b, next_arrival), axis=-1)
+    return (a == b).all(axis=(0, 2))
+
+
+def _waits_multi_server(arrivals, service, servers, progress=None):
+    """Waktu tunggu FCFS G/G/c dengan pemrosesan per blok job.
+
+    Deret job dipotong menjadi blok ``CHUNK_JOBS`` yang disimulasikan serempak
+    (tiap blok satu baris tambahan), awalnya dari sistem kosong. Keadaan akhir
+    blok k lalu menjadi keadaan awal blok k+1 dan blok yang awalnya berubah
+    diulang; karena sistem stabil "lupa" keadaan awalnya, biasanya 2-3 putaran
+    sudah konvergen (tidak ada keadaan awal yang berubah) dan hasilnya identik
+    dengan simulasi berurutan. Bila belum konvergen setelah ``MAX_PASSES``
+    putaran (antrian sangat padat), sisa blok disimulasikan berurutan dari
+    keadaan awal yang sudah pasti. Bila replikasi sudah lebih banyak daripada
+    blok, vektor per langkah sudah cukup lebar dan rekursi dijalankan langsung.
+    ``progress`` diteruskan ke setiap putaran (progres putaran yang berjalan).
+    """
+    replications, n_jobs = arrivals.shape
+    n_chunks = -(-n_jobs // CHUNK_JOBS)
+    if n_chunks < 3 or n_chunks <= replications:
+        return _run_servers(arrivals, service, np.zeros((replications, servers)), progress)[0]
+
+    # Job tambahan di akhir (datang bersama job terakhir, layanan nol) tidak
+    # memengaruhi job sebelumnya dalam FCFS.
+    pad = n_chunks * CHUNK_JOBS - n_jobs
+    shape = (replications, n_chunks, CHUNK_JOBS)
+    arrivals = np.concatenate([arrivals, np.repeat(arrivals[:, -1:], pad, axis=1)], axis=1).reshape(shape)
+    service = np.concatenate([service, np.zeros((replications, pad))], axis=1).reshape(shape)
+    waits = np.empty(shape)
+    starts = np.zeros((replications, n_chunks, servers))
+
+    first = 0  # blok sebelum indeks ini sudah pasti benar
+    for _ in range(MAX_PASSES):
+        block_waits, ends = _run_servers(
+            arrivals[:, first:].reshape(-1, CHUNK_JOBS),
+            service[:, first:].reshape(-1, CHUNK_JOBS),
+            starts[:, first:].reshape(-1, servers),
+            progress,
+        )
+        waits[:, first:] = block_waits.reshape(replications, -1, CHUNK_JOBS)
+        ends = ends.reshape(replications, -1, servers)[:, :-1]
+        same = _same_state(ends, starts[:, first + 1:], arrivals[:, first + 1:, :1])
+        starts[:, first + 1:] = ends
+        changed = np.flatnonzero(~same)
+        if changed.size == 0:
+            return waits.reshape(replications, -1)[:, :n_jobs]
+        first += 1 + changed[0]
+
+    tail_waits, _ = _run_servers(
+        arrivals[:, first:].reshape(replications, -1),
+        service[:, first:].reshape(replications, -1),
+        starts[:, first],
+        progress,
+    )
+    waits[:, first:] = tail_waits.reshape(replications, -1, CHUNK_JOBS)
+    return waits.reshape(replications, -1)[:, :n_jobs]
+
+
+def _mean_ci(per_replication, confidence):
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    mean = per_replication.mean()
+    n = per_replication.size
+    half = z * per_replication.std(ddof=1) / np.sqrt(n) if n > 1 else np.nan
+    return float(mean), float(mean - half), float(mean + half)
+
+
+@memoize(maxsize=64, random_arg="seed", persist=True, ignore=("progress",))
+def simulate_queue(arrival_rate, service_rate, servers=1, arrival_pattern="Poisson",
+                   service_pattern="Eksponensial", n_jobs=10_000, replications=50,
+                   warmup=0.1, erlang_k=2, arrival_data=None, service_data=None,
+                   confidence=0.95, seed=None, progress=None):
+    """Mensimulasikan antrian G/G/c dan mengembalikan metrik dengan selang kepercayaan.
+
+    Setiap metrik (``avg_wait_time``, ``avg_system_time``, ``avg_queue_length``,
+    ``avg_system_length``, ``utilization``, ``prob_wait``) dikembalikan sebagai
+    tuple ``(rata-rata, batas bawah, batas atas)`` antar replikasi. Fraksi
+    ``warmup`` job pertama tiap replikasi dibuang agar lepas dari kondisi awal
+    kosong. Panjang antrian dihitung dengan hukum Little. ``progress(selesai,
+    total)`` dipanggil berkala selama rekursi c server (titik pembatalan untuk
+    :class:`~optimasi.pekerjaan.JobManager`).
+    """
+    rng = np.random.default_rng(seed)
+    shape = (replications, n_jobs)
+    interarrival = sample_times(arrival_pattern, arrival_rate, shape, rng, erlang_k, arrival_data)
+    service = sample_times(service_pattern, service_rate, shape, rng, erlang_k, service_data)
+    arrivals = np.cumsum(interarrival, axis=1)
+
+    if servers == 1:
+        waits = _waits_single_server(interarrival, service)
+    else:
+        waits = _waits_multi_server(arrivals, service, servers, progress)
+
+    first = int(n_jobs * warmup)
+    kept_wait = waits[:, first:]
+    kept_service = service[:, first:]
+    span = arrivals[:, -1] - arrivals[:, first] if n_jobs - first > 1 else np.ones(replications)
+    observed_rate = (n_jobs - first - 1) / span
+
+    wq = kept_wait.mean(axis=1)
+    ws = wq + kept_service.mean(axis=1)
+    per_replication = {
+        "avg_wait_time": wq,
+        "avg_system_time": ws,
+        "avg_queue_length": observed_rate * wq,
+        "avg_system_length": observed_rate * ws,
+        "utilization": observed_rate * kept_service.mean(axis=1) / servers,
+        "prob_wait": (kept_wait > 1e-12).mean(axis=1),
+    }
+    result = {key: _mean_ci(values, confidence) for key, values in per_replication.items()}
+    result["jobs"] = replications * n_jobs
+    return result
@@ -0,0 +1,96 @@
+"""Matriks jarang format CSR minimal berbasis NumPy (tanpa ketergantungan SciPy).
+
+Dipakai untuk bill of materials (produk x bahan): perkalian matriks-vektor
+dan transposnya dihitung dengan ``np.add.reduceat`` per baris tanpa loop
+Python, dan bekerja untuk vektor 1D maupun matriks (mis. kolom = periode).
+"""
+
+import numpy as np
+
+# Jumlah elemen hasil-kali sementara per blok baris pada dot(); menjaga memori
+# sementara tetap kecil (dan di cache CPU) untuk vektor banyak-kolom
+_BLOCK_ELEMENTS = 1 << 18
+
+
+class CSRMatrix:
+    """Matriks jarang baris-terkompresi: ``indptr``, ``indices``, ``data`` dan ``shape``."""
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=float)
+        self.shape = (int(shape[0]), int(shape[1]))
+        if self.indptr.size != self.shape[0] + 1 or self.indices.size != self.data.size:
+            raise ValueError("Ukuran indptr/indices/data tidak konsisten dengan shape")
+        self._transpose = None
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        """Membangun CSR dari triplet (baris, kolom, nilai); duplikat dijumlahkan."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        n_rows, n_cols = int(shape[0]), int(shape[1])
+        if rows.size and (rows.min() < 0 or rows.max() >= n_rows or cols.min() < 0 or cols.max() >= n_cols):
+            raise ValueError("Indeks baris/kolom di luar shape")
+
+        flat = rows * n_cols + cols
+        order = np.argsort(flat, kind="stable")
+        flat = flat[order]
+        unique, start = np.unique(flat, return_index=True)
+        summed = np.add.reduceat(values[order], start) if unique.size else values[:0]
+        unique_rows = unique // n_cols
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(unique_rows, minlength=n_rows), out=indptr[1:])
+        return cls(indptr, unique % n_cols, summed, (n_rows, n_cols))
+
+    @property
+    def nnz(self):
+        return int(self.data.size)
+
+    def row_ids(self):
+        """Indeks baris untuk setiap elemen tersimpan (kebalikan dari ``indptr``)."""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def row(self, i):
+        """(indeks kolom, nilai) elemen tak-nol pada baris ``i``."""
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:stop], self.data[start:stop]
+
+    def dot(self, x):
+        """``A @ x`` untuk ``x`` berbentuk (kolom,) atau (kolom, k)."""
+        x = np.asarray(x, dtype=float)
+        if x.shape[0] != self.shape[1]:
+            raise ValueError(f"Dimensi tidak cocok: {self.shape} @ {x.shape}")
+        out = np.zeros((self.shape[0],) + x.shape[1:])
+        width = max(int(np.prod(x.shape[1:])), 1)
+        step = max(_BLOCK_ELEMENTS // width, 1)
+        # Batas blok selalu di batas baris: baris pertama yang memuat elemen ke-k*step
+        bounds = np.unique(np.concatenate([
+            [0], np.searchsorted(self.indptr, np.arange(step, self.nnz, step), side="right") - 1,
+            [self.shape[0]],
+        ]))
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            start, stop = self.indptr[first], self.indptr[last]
+            if start == stop:
+                continue
+            products = (self.data[start:stop].reshape((-1,) + (1,) * (x.ndim - 1))
+                        * x[self.indices[start:stop]])
+            row_starts = self.indptr[first:last] - start
+            nonempty = self.indptr[first:last] < self.indptr[first + 1:last + 1]
+            out[first:last][nonempty] = np.add.reduceat(products, row_starts[nonempty], axis=0)
+        return out
+
+    @property
+    def T(self):
+        """Transpos dalam format CSR (dihitung sekali lalu disimpan)."""
+        if self._transpose is None:
+            self._transpose = CSRMatrix.from_coo(self.indices, self.row_ids(), self.data,
+                                                 (self.shape[1], self.shape[0]))
+            self._transpose._transpose = self
+        return self._transpose
+
+    def toarray(self):
+        dense = np.zeros(self.shape)
+        dense[self.row_ids(), self.indices] = self.data
+        return dense
@@ -0,0 +1,238 @@
+"""Pipeline analisis terintegrasi: bahan baku, kapasitas, antrian order dan profit."""
+
+import numpy as np
+
+from .antrian import calculate_queue_metrics
+from .cache import memoize
+from .data import BAHAN_BAKU, DEFAULT_ORDER_COST, PRODUCTS
+from .graf import ComputeGraph
+from .katalog import build_catalog
+from .monte_carlo import optimize_safety_stock
+from .mrp import catalog_mrp
+from .persediaan import calculate_eoq_batch
+
+MATERIAL_COLUMNS = (
+    "Bahan Baku", "Kebutuhan Tahunan (kg)", "EOQ (kg)", "Safety Stock (kg)", "SS CI Bawah (kg)",
+    "SS CI Atas (kg)", "ROP (kg)", "Service Level SS 2 Hari", "Biaya Persediaan (Rp)",
+)
+
+HOURS_PER_SHIFT = 8  # jam kerja per hari untuk laju antrian order
+
+
+def material_requirements(catalog, product, annual_demand, service_level=0.95,
+                          demand_cv=0.0, lead_time_cv=0.0, order_cost=DEFAULT_ORDER_COST, seed=0):
+    """EOQ, safety stock (Monte Carlo) dan ROP untuk semua bahan baku satu produk.
+
+    ``catalog`` adalah :class:`~optimasi.katalog.MasterData`; bahan dan rasio
+    diambil dari baris BOM produk. Mengembalikan dict kolom (lihat
+    ``MATERIAL_COLUMNS``) berisi array per bahan.
+    """
+    material_idx, ratios = catalog.bom.row(int(catalog.product_index(product)))
+    bahan_list = catalog.materials["name"][material_idx]
+    bahan_demand = annual_demand * ratios
+    daily_bahan_demand = bahan_demand / 365
+    bahan_lead_time = catalog.materials["lead_time"][material_idx]
+
+    # Safety stock dari simulasi Monte Carlo permintaan & lead time untuk target service level
+    safety = optimize_safety_stock(
+        daily_bahan_demand, bahan_lead_time,
+        demand_std=daily_bahan_demand * demand_cv,
+        lead_time_std=bahan_lead_time * lead_time_cv,
+        service_level=service_level,
+        current_safety_stock=daily_bahan_demand * 2,  # kebijakan lama: 2 hari safety stock
+        seed=seed
+    )
+    material_metrics = calculate_eoq_batch(
+        bahan_demand,
+        order_cost,
+        catalog.materials["holding_cost"][material_idx],
+        catalog.materials["harga"][material_idx],
+        bahan_lead_time,
+        safety["safety_stock"],
+    )
+    empty = np.zeros(0)
+    return dict(zip(MATERIAL_COLUMNS, (
+        bahan_list.tolist(),
+        bahan_demand,
+        material_metrics["eoq"],
+        safety.get("safety_stock", empty),
+        safety.get("safety_stock_low", empty),
+        safety.get("safety_stock_high", empty),
+        material_metrics["rop"],
+        safety.get("current_service_level", empty),
+        material_metrics["total_cost"],
+    )))
+
+
+def strategic_recommendations(capacity_utilization, queue_metrics, total_inventory_cost,
+                              monthly_profit, overall_efficiency):
+    """Rekomendasi strategis berbasis ambang utilisasi, biaya dan efisiensi"""
+    recommendations = []
+
+    if capacity_utilization > 90:
+        recommendations.append("🚨 Kapasitas produksi hampir maksimal. Pertimbangkan ekspansi atau investasi mesin baru.")
+
+    if queue_metrics and queue_metrics['utilization'] > 0.8:
+        recommendations.append("⚠️ Tingkat antrian tinggi. Pertimbangkan optimasi proses atau penambahan shift.")
+
+    if total_inventory_cost > monthly_profit:
+        recommendations.append("💰 Biaya persediaan terlalu tinggi. Review kebijakan EOQ dan safety stock.")
+
+    if overall_efficiency < 70:
+        recommendations.append("📈 Efisiensi operasional rendah. Fokus pada perbaikan proses dan eliminasi waste.")
+
+    if not recommendations:
+        recommendations.append("✅ Sistem produksi berjalan dalam batas yang sehat.")
+
+    return recommendations
+
+
+def material_stage(catalog, product, monthly_demand, service_level=0.95, demand_cv=0.0,
+                   lead_time_cv=0.0, order_cost=DEFAULT_ORDER_COST, seed=0):
+    """Tahap bahan baku: tabel EOQ/safety stock/ROP dan total biaya persediaan."""
+    materials = material_requirements(catalog, product, monthly_demand * 12, service_level,
+                                      demand_cv, lead_time_cv, order_cost, seed)
+    return {"materials": materials,
+            "total_inventory_cost": float(np.nansum(materials["Biaya Persediaan (Rp)"]))}
+
+
+def capacity_stage(product_data, monthly_demand, production_capacity):
+    """Tahap bottleneck produksi: kebutuhan dan utilisasi kapasitas harian."""
+    daily_demand = monthly_demand / 30
+    production_time = product_data["waktu_produksi"]
+    required_capacity = daily_demand * production_time
+    return {
+        "daily_demand": daily_demand,
+        "required_capacity": required_capacity,
+        "capacity_utilization": (required_capacity / (production_capacity * production_time)) * 100,
+        "order_arrival_rate": daily_demand / HOURS_PER_SHIFT,  # order per jam
+        "order_service_rate": production_capacity / HOURS_PER_SHIFT,  # service rate per jam
+    }
+
+
+def queue_stage(capacity):
+    """Tahap antrian order processing (M/M/1); None bila tidak stabil."""
+    return calculate_queue_metrics(capacity["order_arrival_rate"], capacity["order_service_rate"], 1)
+
+
+def financial_stage(product_data, monthly_demand):
+    """Tahap finansial bulanan: revenue, biaya dan profit."""
+    return {
+        "monthly_revenue": monthly_demand * product_data["harga_jual"],
+        "monthly_cost": monthly_demand * product_data["biaya_produksi"],
+        "monthly_profit": monthly_demand * (product_data["harga_jual"] - product_data["biaya_produksi"]),
+    }
+
+
+def efficiency_stage(capacity, queue_metrics):
+    if queue_metrics:
+        return (capacity["capacity_utilization"] + queue_metrics['utilization'] * 100) / 2
+    return capacity["capacity_utilization"]
+
+
+def recommendation_stage(capacity, queue_metrics, material, financial, overall_efficiency):
+    return strategic_recommendations(capacity["capacity_utilization"], queue_metrics,
+                                     material["total_inventory_cost"], financial["monthly_profit"],
+                                     overall_efficiency)
+
+
+def _product_data(products, product):
+    return products[product]
+
+
+# Node graf analisis terintegrasi: nama -> (fungsi, nama input)
+INTEGRATED_NODES = {
+    "catalog": (build_catalog, ("products", "bahan_baku")),
+    "product_data": (_product_data, ("products", "product")),
+    "material": (material_stage, ("catalog", "product", "monthly_demand", "service_level", "demand_cv",
+                                  "lead_time_cv", "order_cost", "seed")),
+    "capacity": (capacity_stage, ("product_data", "monthly_demand", "production_capacity")),
+    "queue": (queue_stage, ("capacity",)),
+    "financial": (financial_stage, ("product_data", "monthly_demand")),
+    "efficiency": (efficiency_stage, ("capacity", "queue")),
+    "recommendations": (recommendation_stage, ("capacity", "queue", "material", "financial", "efficiency")),
+}
+
+
+def build_integrated_graph(graph=None):
+    """Mendaftarkan node analisis terintegrasi ke ``graph`` (baru bila None).
+
+    Input eksternal: ``product``, ``monthly_demand``, ``production_capacity``,
+    ``service_level``, ``demand_cv``, ``lead_time_cv``, ``products``,
+    ``bahan_baku``, ``order_cost`` dan ``seed``. Mengubah ``service_level``
+    hanya mengotori node ``material`` dan turunannya; mengubah
+    ``production_capacity`` tidak menyentuh ``material`` maupun ``financial``.
+    """
+    graph = ComputeGraph() if graph is None else graph
+    for name, (func, inputs) in INTEGRATED_NODES.items():
+        graph.add(name, func, inputs)
+    return graph
+
+
+@memoize(maxsize=64, persist=True)
+def integrated_analysis(product, monthly_demand, production_capacity, service_level=0.95,
+                        demand_cv=0.0, lead_time_cv=0.0, products=PRODUCTS, bahan_baku=BAHAN_BAKU,
+                        order_cost=DEFAULT_ORDER_COST, seed=0):
+    """Menjalankan seluruh analisis terintegrasi untuk satu produk dan satu skenario.
+
+    ``service_level``, ``demand_cv`` dan ``lead_time_cv`` berupa pecahan (0-1).
+    Mengembalikan dict berisi tabel ``materials``, metrik kapasitas, metrik
+    antrian order (``queue``, None bila tidak stabil), ringkasan finansial
+    bulanan, ``overall_efficiency`` dan ``recommendations``.
+    """
+    product_data = products[product]
+    material = material_stage(build_catalog(products, bahan_baku), product, monthly_demand,
+                              service_level, demand_cv, lead_time_cv, order_cost, seed)
+    capacity = capacity_stage(product_data, monthly_demand, production_capacity)
+    queue_metrics = queue_stage(capacity)
+    financial = financial_stage(product_data, monthly_demand)
+    overall_efficiency = efficiency_stage(capacity, queue_metrics)
+
+    return {
+        "product": product,
+        "annual_demand": monthly_demand * 12,
+        **material,
+        **capacity,
+        "queue": queue_metrics,
+        **financial,
+        "overall_efficiency": overall_efficiency,
+        "recommendations": recommendation_stage(capacity, queue_metrics, material, financial,
+                                                overall_efficiency),
+    }
+
+
+@memoize(maxsize=32, persist=True)
+def material_plan(monthly_demand, weeks=12, cover_days=14, products=PRODUCTS, bahan_baku=BAHAN_BAKU,
+                  order_cost=DEFAULT_ORDER_COST):
+    """Rencana pesanan mingguan semua bahan baku untuk permintaan semua produk (MRP).
+
+    ``monthly_demand`` adalah dict produk -> permintaan bulanan (produk yang
+    tidak disebut dianggap nol). Kebutuhan bahan yang dipakai beberapa produk
+    diagregasi, stok awal setara ``cover_days`` hari kebutuhan dan ukuran lot
+    = EOQ atas kebutuhan tahunan agregat. Mengembalikan dict kolom ringkasan
+    per bahan (``summary``), matriks ``planned_releases`` (bahan x minggu) dan
+    ``materials``.
+    """
+    catalog = build_catalog(products, bahan_baku)
+    demand = np.array([monthly_demand.get(name, 0.0) for name in catalog.products["name"]], dtype=float)
+    weekly = np.repeat((demand * 12 / 52)[:, None], weeks, axis=1)
+
+    annual_material = catalog.material_demand(demand * 12)
+    lot_size = calculate_eoq_batch(annual_material, order_cost, catalog.materials["holding_cost"],
+                                   catalog.materials["harga"])["eoq"]
+    plan = catalog_mrp(catalog, weekly,
+                       material_on_hand=annual_material / 365 * cover_days,
+                       material_lot_size=np.nan_to_num(lot_size))
+    users = np.diff(catalog.bom.T.indptr)  # jumlah produk yang memakai setiap bahan
+    summary = {
+        "Bahan Baku": catalog.materials["name"].tolist(),
+        "Dipakai Produk": users,
+        "Kebutuhan Tahunan (kg)": annual_material,
+        "Lot (EOQ, kg)": lot_size,
+        "Lead Time (minggu)": plan["lead_periods"],
+        "Total Pesanan (kg)": plan["planned_releases"].sum(axis=1),
+        "Minggu Ada Pesanan": (plan["planned_releases"] > 0).sum(axis=1),
+        "Terlambat (kg)": plan["past_due"],
+    }
+    return {"summary": summary, "planned_releases": plan["planned_releases"],
+            "materials": catalog.materials["name"].tolist()}
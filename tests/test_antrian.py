@@ -0,0 +1,17 @@
+import numpy as np
+
+from optimasi.antrian import calculate_queue_metrics_batch, optimal_servers
+
+
+def test_optimal_servers_matches_brute_force():
+    servers = np.arange(6, 60)
+    queue = calculate_queue_metrics_batch(5.0, 1.0, servers)["avg_queue_length"]
+    total = servers * 12.0 + 40.0 * queue
+    result = optimal_servers(5.0, 1.0, 12.0, 40.0)
+    assert result["servers"] == servers[total.argmin()]
+
+
+def test_free_servers_do_not_chase_rounding_noise():
+    result = optimal_servers(5.0, 1.0, 0.0, 10.0)
+    assert 6 <= result["servers"] < 40
+    assert result["avg_queue_length"] < 1e-6
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from optimasi.pengadaan import joint_replenishment
+
+
+def _instance(rng):
+    n = int(rng.integers(2, 12))
+    return (rng.uniform(10, 5000, n), rng.uniform(50, 500), rng.uniform(5, 100, n),
+            rng.uniform(0.1, 0.4, n), rng.uniform(1, 50, n), rng.integers(0, max(n // 2, 1), n))
+
+
+@pytest.mark.parametrize("limits", ["space", "budget", "both"])
+def test_joint_replenishment_respects_limits(limits):
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        args = _instance(rng)
+        free = joint_replenishment(*args)
+        kwargs = {}
+        if limits in ("space", "both"):
+            kwargs["space_limit"] = free["space_used"] * rng.uniform(0.2, 0.95)
+        if limits in ("budget", "both"):
+            kwargs["budget_limit"] = free["budget_used"] * rng.uniform(0.2, 0.95)
+        result = joint_replenishment(*args, **kwargs)
+        assert result["space_used"] <= kwargs.get("space_limit", np.inf)
+        assert result["budget_used"] <= kwargs.get("budget_limit", np.inf)
+
+
+def test_warehouse_limit_with_shared_supplier():
+    demand = np.array([4000.0, 2500.0, 900.0, 3000.0, 150.0])
+    supplier = [0, 0, 0, 1, 1]
+    args = (demand, 300.0, np.array([20.0, 35.0, 60.0, 15.0, 80.0]), 0.25,
+            np.array([12.0, 30.0, 8.0, 20.0, 45.0]), supplier)
+    free = joint_replenishment(*args)
+    for fraction in np.linspace(0.1, 0.95, 60):
+        limit = free["space_used"] * fraction
+        assert joint_replenishment(*args, space_limit=limit)["space_used"] <= limit
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from optimasi.peramalan import fit_forecast, holt_winters
+
+
+@pytest.mark.parametrize("season_length", [1, 4, 52])
+def test_holt_winters_exact_on_linear_series(season_length):
+    t = np.arange(104)
+    result = holt_winters(100 + 2 * t, 0.0, 0.0, 0.0, season_length=season_length, horizon=3)
+    np.testing.assert_allclose(result["forecast"][0], [308, 310, 312])
+    assert result["sse"][0] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_fit_forecast_exact_on_trend_and_season():
+    t = np.arange(104 + 12)
+    series = 100 + 2 * t + 30 * np.sin(2 * np.pi * t / 52)
+    result = fit_forecast(series[:104], horizon=12, season_length=52)
+    assert result["method"][0] == "holt-winters"
+    np.testing.assert_allclose(result["forecast"][0], series[104:], atol=1e-6)
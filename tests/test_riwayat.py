@@ -0,0 +1,31 @@
+import io
+
+import pandas as pd
+import pytest
+
+from optimasi.riwayat import OrderHistory
+
+
+def _log(bad_row=None):
+    frame = pd.DataFrame({
+        "order_time": pd.date_range("2024-01-01", periods=100, freq="h").astype(str),
+        "product": "Kopi",
+        "quantity": 5.0,
+    })
+    if bad_row is not None:
+        frame.loc[bad_row, "order_time"] = "bukan tanggal"
+    buffer = io.StringIO(frame.to_csv(index=False))
+    buffer.name = "order.csv"
+    return buffer
+
+
+def test_failed_ingest_leaves_aggregates_unchanged():
+    history = OrderHistory(window_days=None)
+    history.ingest(_log(), key="baik")
+    before = history.daily()["quantity"].sum()
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            history.ingest(_log(bad_row=80), chunksize=50, key="rusak")
+        assert history.daily()["quantity"].sum() == before
+    assert history.rows == 100
+    assert "rusak" not in history.files